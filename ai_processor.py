@@ -1,31 +1,165 @@
-import google.generativeai as genai
 import json
-import re
-from textblob import TextBlob
-import nltk
-from nltk.tokenize import word_tokenize
+import threading
+import time
 from config import Config
+from llm_client import create_backend
+from llm_cache import LLMCache
+from singleflight import SingleFlight
+from resilience import ResilientCaller
+from json_stream import JSONExtractor, Schema, NUMBER, extract_json
+from prompt_builder import PromptBuilder
+from disfluency import DisfluencyAnalyzer
+from local_scorer import LocalScorer
+from metrics import LLM_REQUEST_SECONDS, LLM_ERRORS, LLM_CACHE_HITS
+import tracing
 
-# Download NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+# Expected shape of each method's JSON response. Fields the routes index
+# directly are required; a response missing them falls back to defaults.
+RESUME_SCHEMA = Schema(dict, optional={
+    'name': None, 'skills': list, 'experience_years': None,
+    'education': list, 'projects': list, 'certifications': list
+})
+QUESTION_SCHEMA = Schema(dict, required={
+    'question_text': str, 'question_type': str, 'difficulty': str,
+    'category': str, 'time_allocated': NUMBER
+})
+QUESTIONS_SCHEMA = Schema(list, item=QUESTION_SCHEMA)
+ANALYSIS_SCHEMA = Schema(dict, required={
+    'grammar_score': NUMBER, 'relevance_score': NUMBER, 'star_score': NUMBER,
+    'detailed_feedback': str
+}, optional={
+    'suggested_better_answer': str, 'confidence_indicator': str,
+    'needs_cross_question': bool, 'cross_question': str
+})
+NARRATIVE_SCHEMA = Schema(dict, required={'detailed_feedback': str}, optional={
+    'suggested_better_answer': str, 'needs_cross_question': bool, 'cross_question': str
+})
+CODE_EVALUATION_SCHEMA = Schema(dict, required={
+    'logic_score': NUMBER, 'efficiency_score': NUMBER, 'clarity_score': NUMBER,
+    'test_cases_passed': NUMBER, 'total_test_cases': NUMBER
+}, optional={
+    'detailed_feedback': str, 'suggested_improvements': None,
+    'time_complexity': str, 'space_complexity': str
+})
+PROBLEM_SCHEMA = Schema(dict, required={'problem_statement': str}, optional={
+    'example_input': None, 'example_output': None, 'constraints': None, 'hints': None
+})
+REPORT_SCHEMA = Schema(dict, required={
+    'overall_score': NUMBER, 'strengths': list, 'weaknesses': list,
+    'communication_score': NUMBER, 'technical_score': NUMBER, 'confidence_score': NUMBER,
+    'final_verdict': str, 'detailed_analysis': str
+}, optional={'improvement_plan': list})
+
+# Confidence score weights (each part is on a 0-10 scale). rescore.py
+# applies the same formula to stored answers when these change.
+CONFIDENCE_WEIGHTS = {'relevance': 0.3, 'star': 0.3, 'sentiment': 0.2, 'fillers': 0.2}
+FILLER_PENALTY = 0.5  # points of the filler part lost per filler word
+
+# Fields of stored records that the prompts actually use
+RESUME_FIELDS = ('name', 'skills', 'experience_years', 'education', 'projects', 'certifications')
+REPORT_ANSWER_FIELDS = (
+    'question_text', 'answer_text', 'duration', 'grammar_score', 'relevance_score',
+    'confidence_score', 'star_score', 'filler_words_count', 'cross_question_asked'
+)
+REPORT_CODING_FIELDS = (
+    'problem_statement', 'test_cases_passed', 'total_test_cases', 'logic_score',
+    'efficiency_score', 'clarity_score', 'time_taken'
+)
 
 class AIProcessor:
     def __init__(self):
-        if not Config.GEMINI_API_KEY:
-            raise ValueError("GEMINI_API_KEY not set in environment variables")
-        
-        genai.configure(api_key=Config.GEMINI_API_KEY)
-        self.model = genai.GenerativeModel(Config.GEMINI_MODEL)
+        self._client = None
+        self._client_lock = threading.Lock()
+        self.cache = LLMCache()
+        self.single_flight = SingleFlight()
+        self.resilience = ResilientCaller()
+        self.disfluency = DisfluencyAnalyzer()
+        self.local_scorer = LocalScorer()
+
+    @property
+    def client(self):
+        """Backend chosen by Config.LLM_BACKEND, built on first use"""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = create_backend()
+        return self._client
+
+    def _generate(self, method, prompt, schema=None):
+        """Run a prompt on the shared async client and return the response.
+
+        With a ``schema`` the response is streamed through an incremental JSON
+        extractor, reading stops as soon as the schema is satisfied, and the
+        validated value is returned; without one the raw text is returned.
+
+        Methods listed in Config.LLM_CACHE_TTL are served from the response
+        cache when possible. Only responses that validate are cached, so
+        malformed output is retried on the next call. Concurrent identical
+        prompts share a single upstream request; each caller parses its own
+        copy of the text so results are never shared mutable objects.
+        
+        Upstream calls go through self.resilience, so a slow or failing model
+        raises quickly and callers fall back to their defaults.
+        """
+        ttl = Config.LLM_CACHE_TTL.get(method)
+        key = LLMCache.make_key(self.client.model, prompt)
+
+        with tracing.span(f'llm.{method}', prompt_chars=len(prompt)) as span:
+            if ttl:
+                cached = self.cache.get(key, method)
+                if cached is not None:
+                    LLM_CACHE_HITS.inc(method=method)
+                    if span is not None:
+                        span.set(cache='hit')
+                    return extract_json(cached, schema) if schema else cached
+
+            response_text, latency = self.single_flight.do(key, lambda: self._call_model(method, prompt, schema))
+            if span is not None:
+                span.set(cache='miss' if ttl else 'off', upstream_ms=round(latency * 1000, 1))
+
+            result = extract_json(response_text, schema) if schema else response_text
+            if ttl:
+                self.cache.set(key, method, response_text, latency, ttl)
+            return result
+
+    def _call_model(self, method, prompt, schema=None):
+        """Send one upstream request and return (text, latency in seconds).
+
+        The request runs under the method's adaptive deadline, may be hedged,
+        and fails fast with CircuitOpenError while the upstream is unhealthy.
+        """
+        try:
+            response_text, latency = self.resilience.call(
+                method, lambda: self.client.submit_coroutine(self._model_text(prompt, schema))
+            )
+        except Exception as e:
+            LLM_ERRORS.inc(method=method, error=type(e).__name__)
+            raise
+        LLM_REQUEST_SECONDS.observe(latency, method=method)
+        return response_text, latency
+
+    async def _model_text(self, prompt, schema=None):
+        """Response text; for schema calls, the compact JSON that was extracted"""
+        if schema is None:
+            return (await self.client.generate_async(prompt)).strip()
+
+        extractor = JSONExtractor(schema)
+        stream = self.client.stream_async(prompt)
+        try:
+            async for chunk in stream:
+                if extractor.feed(chunk):
+                    break
+        finally:
+            await stream.aclose()
+        return json.dumps(extractor.result(), separators=(',', ':'))
     
     def extract_text_from_resume(self, resume_text):
         """Extract key information from resume text"""
-        prompt = f"""
+        builder = PromptBuilder('extract_text_from_resume')
+        prompt = builder.build("""
         Extract the following information from this resume text:
         
-        {resume_text[:2000]}
+        {resume_text}
         
         Provide as JSON with these keys:
         - name: person's name (if available)
@@ -36,31 +170,25 @@ class AIProcessor:
         - certifications: list of certifications
         
         Return only JSON, no additional text.
-        """
+        """, resume_text=builder.text('resume_text', resume_text))
         
         try:
-            response = self.model.generate_content(prompt)
-            response_text = response.text.strip()
-            
-            # Extract JSON from response
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group())
-            return {}
+            return self._generate('extract_text_from_resume', prompt, schema=RESUME_SCHEMA)
         except Exception as e:
             print(f"Error extracting resume text: {e}")
             return {}
     
     def generate_questions(self, resume_data, job_description, domain, experience_level, count=10):
         """Generate interview questions based on resume and JD"""
-        prompt = f"""
+        builder = PromptBuilder('generate_questions')
+        prompt = builder.build("""
         You are an expert technical interviewer. Generate {count} interview questions for a {experience_level} level {domain} position.
         
         Resume Information:
-        {json.dumps(resume_data, indent=2)}
+        {resume_data}
         
         Job Description:
-        {job_description[:1000]}
+        {job_description}
         
         Generate a mix of questions:
         1. 3-4 Technical questions specific to {domain}
@@ -76,20 +204,17 @@ class AIProcessor:
         - time_allocated: Time in seconds (120 for easy, 180 for medium, 240 for hard)
         
         Return as a JSON list of questions.
-        """
+        """,
+            count=count,
+            experience_level=experience_level,
+            domain=domain,
+            resume_data=builder.json('resume_data', resume_data, fields=RESUME_FIELDS),
+            job_description=builder.text('job_description', job_description)
+        )
         
         try:
-            response = self.model.generate_content(prompt)
-            response_text = response.text.strip()
-            
-            # Extract JSON from response
-            json_match = re.search(r'\[.*\]', response_text, re.DOTALL)
-            if json_match:
-                questions = json.loads(json_match.group())
-                return questions[:count]
-            
-            # Fallback to some default questions
-            return self._get_default_questions(domain, experience_level, count)
+            questions = self._generate('generate_questions', prompt, schema=QUESTIONS_SCHEMA.limit(count))
+            return questions[:count]
         except Exception as e:
             print(f"Error generating questions: {e}")
             return self._get_default_questions(domain, experience_level, count)
@@ -121,17 +246,21 @@ class AIProcessor:
         ]
         return default_questions[:count]
     
-    def analyze_answer(self, question, answer, transcript):
-        """Analyze candidate's answer"""
-        filler_words = ['um', 'uh', 'ah', 'er', 'like', 'you know', 'so', 'well']
-        filler_count = sum(transcript.lower().count(word) for word in filler_words)
+    @tracing.traced('speech_metrics')
+    def _speech_metrics(self, transcript, duration=None):
+        """Disfluency metrics and sentiment polarity (-1 to 1) of a transcript"""
+        speech = self.disfluency.analyze(transcript, duration)
         
-        # Calculate sentiment using TextBlob
+        # Calculate sentiment using TextBlob (imported on first use; it pulls in NLTK)
+        from textblob import TextBlob
         blob = TextBlob(transcript)
         sentiment_score = blob.sentiment.polarity  # -1 to 1
-        
-        # Generate AI feedback
-        prompt = f"""
+        return speech, sentiment_score
+    
+    def _analyze_answer_prompt(self, question, answer):
+        """Prompt asking the model to score and critique an answer"""
+        builder = PromptBuilder('analyze_answer')
+        return builder.build("""
         Analyze this interview answer and provide personalized feedback:
 
         Question: {question}
@@ -167,55 +296,256 @@ class AIProcessor:
         - cross_question: A follow-up question to probe deeper
 
         Return only JSON, no additional text.
-        """
-        
-        try:
-            response = self.model.generate_content(prompt)
-            response_text = response.text.strip()
-            
-            # Extract JSON from response
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                analysis = json.loads(json_match.group())
-                
-                # Calculate confidence score (0-10)
-                confidence_score = (
-                    analysis.get('relevance_score', 5) * 0.3 +
-                    analysis.get('star_score', 5) * 0.3 +
-                    (1 + sentiment_score) * 5 * 0.2 +  # Convert -1 to 1 into 0-10
-                    max(0, 10 - (filler_count * 0.5)) * 0.2  # Penalize filler words
-                )
-                
-                return {
-                    'grammar_score': analysis.get('grammar_score', 5),
-                    'relevance_score': analysis.get('relevance_score', 5),
-                    'star_score': analysis.get('star_score', 5),
-                    'confidence_score': min(10, max(0, confidence_score)),
-                    'filler_words_count': filler_count,
-                    'feedback': analysis.get('detailed_feedback', 'No specific feedback available.'),
-                    'suggested_answer': analysis.get('suggested_better_answer', ''),
-                    'needs_cross_question': analysis.get('needs_cross_question', False),
-                    'cross_question': analysis.get('cross_question', '') if analysis.get('needs_cross_question') else ''
-                }
-        except Exception as e:
-            print(f"Error analyzing answer: {e}")
-        
-        # Fallback analysis
+        """,
+            question=builder.text('question', question),
+            answer=builder.text('answer', answer)
+        )
+    
+    def _narrate_answer_prompt(self, question, answer, local):
+        """Prompt asking the model only for feedback on an answer scored locally"""
+        missing = [part for part, found in local['star'].items() if not found]
+        builder = PromptBuilder('narrate_answer')
+        return builder.build("""
+        Write feedback on this interview answer:
+
+        Question: {question}
+        Candidate's Answer: {answer}
+
+        It has already been scored: grammar {grammar}/10, relevance {relevance}/10,
+        STAR method {star}/10 (missing: {missing}).
+
+        Provide JSON with these keys:
+        - detailed_feedback: Specific, actionable feedback based on their actual answer
+        - suggested_better_answer: Their answer improved with the STAR method, keeping their
+          content and core message; natural, not a generic template
+        - needs_cross_question: true if the answer is too short, vague or lacks depth
+        - cross_question: A follow-up question to probe deeper, if needed
+
+        Return only JSON, no additional text.
+        """,
+            question=builder.text('question', question),
+            answer=builder.text('answer', answer),
+            grammar=local['grammar_score'],
+            relevance=local['relevance_score'],
+            star=local['star_score'],
+            missing=', '.join(missing) or 'nothing'
+        )
+    
+    @staticmethod
+    def _confidence_score(analysis, filler_count, sentiment_score):
+        """Calculate confidence score (0-10)"""
+        weights = CONFIDENCE_WEIGHTS
+        confidence_score = (
+            analysis.get('relevance_score', 5) * weights['relevance'] +
+            analysis.get('star_score', 5) * weights['star'] +
+            (1 + sentiment_score) * 5 * weights['sentiment'] +  # Convert -1 to 1 into 0-10
+            max(0, 10 - (filler_count * FILLER_PENALTY)) * weights['fillers']  # Penalize filler words
+        )
+        return min(10, max(0, confidence_score))
+    
+    def _build_analysis(self, analysis, speech, sentiment_score):
+        """Shape the model's JSON into the analysis dict the routes use"""
+        return {
+            'grammar_score': analysis.get('grammar_score', 5),
+            'relevance_score': analysis.get('relevance_score', 5),
+            'star_score': analysis.get('star_score', 5),
+            'confidence_score': self._confidence_score(analysis, speech['filler_count'], sentiment_score),
+            'filler_words_count': speech['filler_count'],
+            'sentiment_score': sentiment_score,
+            'speech_metrics': speech,
+            'feedback': analysis.get('detailed_feedback', 'No specific feedback available.'),
+            'suggested_answer': analysis.get('suggested_better_answer', ''),
+            'needs_cross_question': analysis.get('needs_cross_question', False),
+            'cross_question': analysis.get('cross_question', '') if analysis.get('needs_cross_question') else '',
+            'scoring': 'llm'
+        }
+    
+    @staticmethod
+    def _fallback_analysis(answer, speech, sentiment_score):
+        """Basic analysis used when the model is unavailable"""
         return {
             'grammar_score': 6,
             'relevance_score': 6,
             'star_score': 5,
             'confidence_score': 6,
-            'filler_words_count': filler_count,
+            'filler_words_count': speech['filler_count'],
+            'sentiment_score': sentiment_score,
+            'speech_metrics': speech,
             'feedback': 'Basic analysis only. AI service unavailable.',
             'suggested_answer': 'Try to provide more specific examples and structure your answer using the STAR method.',
             'needs_cross_question': len(answer.split()) < 30,
-            'cross_question': 'Could you elaborate more on that point?' if len(answer.split()) < 30 else ''
+            'cross_question': 'Could you elaborate more on that point?' if len(answer.split()) < 30 else '',
+            'scoring': 'fallback'
+        }
+    
+    def placeholder_analysis(self, answer, transcript, duration=None):
+        """Fallback analysis an answer is saved with before its own is ready.
+        
+        Skips the sentiment, which the real analysis fills in.
+        """
+        return self._fallback_analysis(answer, self.disfluency.analyze(transcript, duration), None)
+    
+    def _local_analysis(self, local, answer, speech, sentiment_score, narrative=None):
+        """Analysis dict with local scores, plus the model's narrative feedback if there is one"""
+        if narrative is None:
+            needs_cross_question = local['word_count'] < 30
+            cross_question = 'Could you elaborate more on that point?' if needs_cross_question else ''
+        else:
+            needs_cross_question = narrative.get('needs_cross_question', False)
+            cross_question = narrative.get('cross_question', '') if needs_cross_question else ''
+        return {
+            'grammar_score': local['grammar_score'],
+            'relevance_score': local['relevance_score'],
+            'star_score': local['star_score'],
+            'confidence_score': self._confidence_score(local, speech['filler_count'], sentiment_score),
+            'filler_words_count': speech['filler_count'],
+            'sentiment_score': sentiment_score,
+            'speech_metrics': speech,
+            'feedback': (narrative or {}).get('detailed_feedback') or local['feedback'],
+            'suggested_answer': (narrative or {}).get('suggested_better_answer', ''),
+            'needs_cross_question': needs_cross_question,
+            'cross_question': cross_question,
+            'scoring': 'local' if narrative is None else 'tiered'
         }
     
+    @staticmethod
+    def scoring_mode(fast=False):
+        """'llm', 'tiered' or 'fast'; practice sessions always use 'fast'"""
+        return 'fast' if fast else Config.SCORING_MODE
+    
+    def analyze_answer(self, question, answer, transcript, duration=None, fast=False):
+        """Analyze candidate's answer (``duration`` in seconds, for speech rates).
+        
+        Outside 'llm' mode the scores come from the local scorer and are
+        returned at once, with the local tips as feedback. In 'tiered' mode
+        the model's written feedback comes from narrate_answer, which callers
+        run off the request; in 'fast' mode (or with ``fast``) the model isn't
+        called at all. See Config.SCORING_MODE.
+        """
+        speech, sentiment_score = self._speech_metrics(transcript, duration)
+        
+        if self.scoring_mode(fast) != 'llm':
+            local = self.local_scorer.score(question, answer, speech)
+            return self._local_analysis(local, answer, speech, sentiment_score)
+        
+        # Generate AI feedback
+        prompt = self._analyze_answer_prompt(question, answer)
+        
+        try:
+            analysis = self._generate('analyze_answer', prompt, schema=ANALYSIS_SCHEMA)
+            return self._build_analysis(analysis, speech, sentiment_score)
+        except Exception as e:
+            print(f"Error analyzing answer: {e}")
+        
+        # Fallback analysis
+        return self._fallback_analysis(answer, speech, sentiment_score)
+    
+    def narrate_answer(self, question, answer, transcript, duration=None):
+        """Locally scored analysis with the model's written feedback.
+        
+        Falls back to the local tips if the model fails, so the result is
+        never worse than what analyze_answer returned.
+        """
+        speech, sentiment_score = self._speech_metrics(transcript, duration)
+        local = self.local_scorer.score(question, answer, speech)
+        try:
+            narrative = self._generate('narrate_answer', self._narrate_answer_prompt(question, answer, local),
+                                       schema=NARRATIVE_SCHEMA)
+            return self._local_analysis(local, answer, speech, sentiment_score, narrative)
+        except Exception as e:
+            print(f"Error generating answer feedback: {e}")
+            return self._local_analysis(local, answer, speech, sentiment_score)
+    
+    def _stream_json(self, method, prompt, schema):
+        """Stream a prompt through a JSON extractor.
+        
+        Yields (fields parsed so far, None) per chunk, then (fields, result)
+        once the value is complete. The stream gets the method's adaptive
+        deadline but is not hedged. Latency, errors and breaker state are
+        recorded like _call_model does; errors are re-raised.
+        """
+        extractor = JSONExtractor(schema)
+        start = time.perf_counter()
+        try:
+            self.resilience.check()
+            for chunk in self.client.stream(prompt, self.resilience.deadline(method)):
+                done = extractor.feed(chunk)
+                yield extractor.fields, None
+                if done:
+                    break
+            result = extractor.result()
+        except Exception as e:
+            LLM_ERRORS.inc(method=method, error=type(e).__name__)
+            self.resilience.record(method, error=e)
+            tracing.record_span(f'llm.{method}', start, prompt_chars=len(prompt), error=type(e).__name__)
+            raise
+        latency = time.perf_counter() - start
+        self.resilience.record(method, latency)
+        LLM_REQUEST_SECONDS.observe(latency, method=method)
+        tracing.record_span(f'llm.{method}', start, prompt_chars=len(prompt))
+        yield extractor.fields, result
+    
+    def analyze_answer_stream(self, question, answer, transcript, duration=None, fast=False):
+        """Analyze candidate's answer while the model is still responding.
+        
+        Yields (event, data) pairs as soon as each part is known: 'scores',
+        then 'feedback', then 'suggested_answer', and finally 'done' with the
+        same dict analyze_answer returns. Outside 'llm' mode the scores are
+        local, so they are sent before the model is even called.
+        """
+        speech, sentiment_score = self._speech_metrics(transcript, duration)
+        filler_count = speech['filler_count']
+        mode = self.scoring_mode(fast)
+        
+        score_keys = ('grammar_score', 'relevance_score', 'star_score')
+        text_fields = (('feedback', 'detailed_feedback'), ('suggested_answer', 'suggested_better_answer'))
+        sent = set()
+        
+        if mode != 'llm':
+            local = self.local_scorer.score(question, answer, speech)
+            scores = {key: local[key] for key in score_keys}
+            scores['confidence_score'] = self._confidence_score(local, filler_count, sentiment_score)
+            scores['filler_words_count'] = filler_count
+            sent.add('scores')
+            yield 'scores', scores
+            if mode == 'fast':
+                yield 'done', self._local_analysis(local, answer, speech, sentiment_score)
+                return
+            method, prompt, schema = ('narrate_answer_stream',
+                                      self._narrate_answer_prompt(question, answer, local), NARRATIVE_SCHEMA)
+        else:
+            method, prompt, schema = 'analyze_answer_stream', self._analyze_answer_prompt(question, answer), ANALYSIS_SCHEMA
+        
+        try:
+            for fields, analysis in self._stream_json(method, prompt, schema):
+                if 'scores' not in sent and all(key in fields for key in score_keys):
+                    sent.add('scores')
+                    scores = {key: fields[key] for key in score_keys}
+                    scores['confidence_score'] = self._confidence_score(fields, filler_count, sentiment_score)
+                    scores['filler_words_count'] = filler_count
+                    yield 'scores', scores
+                
+                for event, key in text_fields:
+                    if event not in sent and 'scores' in sent and key in fields:
+                        sent.add(event)
+                        yield event, fields[key]
+        except Exception as e:
+            print(f"Error streaming answer analysis: {e}")
+            if mode == 'llm':
+                yield 'done', self._fallback_analysis(answer, speech, sentiment_score)
+            else:
+                yield 'done', self._local_analysis(local, answer, speech, sentiment_score)
+            return
+        
+        if mode == 'llm':
+            yield 'done', self._build_analysis(analysis, speech, sentiment_score)
+        else:
+            yield 'done', self._local_analysis(local, answer, speech, sentiment_score, analysis)
+    
     def generate_cross_question(self, question, answer):
         """Generate a cross-question when answer is insufficient"""
-        prompt = f"""
+        builder = PromptBuilder('generate_cross_question')
+        prompt = builder.build("""
         Based on this question and insufficient answer, generate a probing follow-up question:
         
         Original Question: {question}
@@ -227,17 +557,20 @@ class AIProcessor:
         3. Challenge the candidate constructively
         
         Return only the question text.
-        """
+        """,
+            question=builder.text('question', question),
+            answer=builder.text('answer', answer)
+        )
         
         try:
-            response = self.model.generate_content(prompt)
-            return response.text.strip()
+            return self._generate('generate_cross_question', prompt)
         except:
             return "Could you provide a more detailed example or elaborate on that point?"
     
     def evaluate_code(self, problem_statement, user_code, language='python'):
         """Evaluate submitted code"""
-        prompt = f"""
+        builder = PromptBuilder('evaluate_code')
+        prompt = builder.build("""
         Evaluate this coding solution:
         
         Problem: {problem_statement}
@@ -257,16 +590,14 @@ class AIProcessor:
         - space_complexity: Estimated space complexity
         
         Return only JSON.
-        """
+        """,
+            problem_statement=builder.text('problem_statement', problem_statement),
+            language=language,
+            user_code=builder.text('user_code', user_code)
+        )
         
         try:
-            response = self.model.generate_content(prompt)
-            response_text = response.text.strip()
-            
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                evaluation = json.loads(json_match.group())
-                return evaluation
+            return self._generate('evaluate_code', prompt, schema=CODE_EVALUATION_SCHEMA)
         except Exception as e:
             print(f"Error evaluating code: {e}")
         
@@ -285,7 +616,8 @@ class AIProcessor:
     
     def generate_problem_statement(self, domain, difficulty='medium'):
         """Generate a coding problem statement"""
-        prompt = f"""
+        builder = PromptBuilder('generate_problem_statement')
+        prompt = builder.build("""
         Generate a {difficulty} level coding problem for {domain} domain.
         The problem should be solvable in 10-15 minutes and test:
         1. Basic programming logic
@@ -300,15 +632,10 @@ class AIProcessor:
         - hints: 1-2 hints for solving
         
         Return only JSON.
-        """
+        """, difficulty=difficulty, domain=domain)
         
         try:
-            response = self.model.generate_content(prompt)
-            response_text = response.text.strip()
-            
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group())
+            return self._generate('generate_problem_statement', prompt, schema=PROBLEM_SCHEMA)
         except:
             pass
         
@@ -323,18 +650,19 @@ class AIProcessor:
     
     def generate_final_report(self, session_data, answers_data, coding_data):
         """Generate final performance report"""
-        prompt = f"""
+        builder = PromptBuilder('generate_final_report')
+        prompt = builder.build("""
         Generate a comprehensive interview performance report.
         
         Interview Session Details:
-        - Domain: {session_data.get('domain')}
-        - Experience Level: {session_data.get('experience_level')}
+        - Domain: {domain}
+        - Experience Level: {experience_level}
         
         Performance Analysis:
-        {json.dumps(answers_data, indent=2)}
+        {answers}
         
         Coding Test Results:
-        {json.dumps(coding_data, indent=2) if coding_data else 'No coding test'}
+        {coding}
         
         Provide a detailed report as JSON with:
         - overall_score: 0-100 overall performance
@@ -348,15 +676,16 @@ class AIProcessor:
         - detailed_analysis: Paragraph summarizing performance
         
         Return only JSON.
-        """
+        """,
+            domain=session_data.get('domain'),
+            experience_level=session_data.get('experience_level'),
+            answers=builder.records('answers', answers_data, REPORT_ANSWER_FIELDS,
+                                    text_fields=('question_text', 'answer_text')),
+            coding=builder.json('coding', coding_data, fields=REPORT_CODING_FIELDS) if coding_data else 'No coding test'
+        )
         
         try:
-            response = self.model.generate_content(prompt)
-            response_text = response.text.strip()
-            
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group())
+            return self._generate('generate_final_report', prompt, schema=REPORT_SCHEMA)
         except Exception as e:
             print(f"Error generating report: {e}")
         
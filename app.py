@@ -1,62 +1,215 @@
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for
+from flask import Flask, Blueprint, Response, render_template, request, jsonify, session, redirect, url_for, flash, send_file, g, abort
+from flask import before_render_template, template_rendered
 from flask_session import Session
+import io
 import os
 import json
+import tempfile
+import time
 from datetime import datetime
-from werkzeug.utils import secure_filename
-import PyPDF2
+from werkzeug.datastructures import FileStorage
 
 from config import Config
-from database import init_db, save_interview_session, save_question, save_answer, save_coding_test
+from database import (init_db, save_interview_session, save_question, save_answer, update_answer_analysis,
+                      save_coding_test, save_coding_problem, get_coding_problem, get_questions, get_answers,
+                      get_coding_test)
 from ai_processor import AIProcessor
+from llm_client import check_backend_config
 from code_sandbox import CodeSandbox
 from report_generator import ReportGenerator
+from speculative import SpeculativePipeline
+from jobs import JobQueue, input_hash, report_progress
+from metrics import REGISTRY, HTTP_REQUEST_SECONDS, instrument_session_store
+from text_extractor import TextExtractor
+from upload_store import UploadStore
+import tracing
+import profiler
+
+# Shared by every app this process creates. None of these touch the
+# network or load the NLP stack or LLM client until they are first used.
+ai_processor = AIProcessor()
 
-# Initialize Flask app
-app = Flask(__name__)
-app.config.from_object(Config)
+# Background preparation of interview data ahead of /start-interview
+speculative = SpeculativePipeline(ai_processor)
 
-# Initialize session
-Session(app)
+# Text of uploaded documents (large PDFs are read by a process pool)
+text_extractor = TextExtractor()
 
-# Initialize database
-init_db()
+# Worker pool for final report generation
+report_jobs = JobQueue()
 
-# Initialize AI processor
-ai_processor = AIProcessor()
+# Worker pool writing the model's feedback on answers scored locally ('tiered')
+feedback_jobs = JobQueue()
+
+# Worker pool extracting the text of uploads; the job id is the document id
+upload_jobs = JobQueue(max_workers=Config.UPLOAD_WORKERS)
+
+# Uploads stored by content hash, with their extracted text alongside
+resume_store = UploadStore('uploads/resumes')
+job_description_store = UploadStore('uploads/job_descriptions')
+
+# The session only holds ids: each uploaded text is read back from its
+# extraction job by document id, and the interview (questions, answers,
+# coding test) from the database by session_id
+UPLOAD_DOCUMENTS = {
+    'resume_text': 'resume_document_id',
+    'job_description': 'job_description_document_id',
+}
 
-# Create upload directories
-os.makedirs('uploads/resumes', exist_ok=True)
-os.makedirs('uploads/job_descriptions', exist_ok=True)
+bp = Blueprint('main', __name__)
+
+def create_app():
+    """Build the Flask app: sessions, database and upload directories.
+    
+    Import of this module stays cheap; the LLM backend is built and NLP
+    models are loaded on first use. Only the backend configuration is
+    checked here, so a missing API key still fails at startup.
+    """
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    
+    # Initialize session
+    Session(app)
+    instrument_session_store(app.session_interface)
+    
+    # Initialize database
+    init_db()
+    
+    check_backend_config()
+    
+    # Create upload directories
+    os.makedirs('uploads/resumes', exist_ok=True)
+    os.makedirs('uploads/job_descriptions', exist_ok=True)
+    
+    app.register_blueprint(bp)
+    before_render_template.connect(start_render_span, app)
+    template_rendered.connect(end_render_span, app)
+    return app
+
+@bp.before_app_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+    force = request.headers.get('X-Trace') == '1' or request.args.get('trace') == '1'
+    g.trace, g.trace_token = tracing.start_trace(f"{request.method} {request.path}", force=force)
+
+@bp.before_app_request
+def start_request_profile():
+    mode = request.args.get('profile') or request.headers.get('X-Profile')
+    g.profile = profiler.start(f"{request.method} {request.full_path.rstrip('?')}", mode)
+
+@bp.after_app_request
+def observe_request_latency(response):
+    """Record route latency (for streamed responses, up to the headers)"""
+    start = g.pop('request_start', None)
+    if start is not None:
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - start, route=route,
+                                     method=request.method, status=response.status_code)
+    trace = g.get('trace')
+    if trace is not None:
+        trace.root.set(status=response.status_code)
+        response.headers['X-Trace-Id'] = trace.trace_id
+    profile = g.get('profile')
+    if profile is not None:
+        response.headers['X-Profile-Id'] = profile.profile_id
+    return response
+
+@bp.teardown_app_request
+def finish_request_trace(error=None):
+    """Store the request's trace (streamed responses finish theirs later)"""
+    trace = g.pop('trace', None)
+    if trace is not None:
+        if error is not None:
+            trace.root.set(error=type(error).__name__)
+        tracing.finish_trace(trace, g.pop('trace_token', None))
+
+@bp.teardown_app_request
+def finish_request_profile(error=None):
+    """Write the request's profile (streamed bodies are not included)"""
+    profile = g.pop('profile', None)
+    if profile is not None:
+        profiler.stop(profile)
+
+def start_render_span(sender, template, context, **extra):
+    g.render_span = tracing.start_span(f"render {template.name}")
+
+def end_render_span(sender, template, context, **extra):
+    tracing.end_span(*g.pop('render_span', (None, None)))
 
 def allowed_file(filename):
     """Check if file extension is allowed"""
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in Config.ALLOWED_EXTENSIONS
 
-def extract_text_from_pdf(filepath):
-    """Extract text from PDF file"""
-    try:
-        with open(filepath, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text()
-            return text
-    except Exception as e:
-        print(f"Error extracting PDF text: {e}")
-        return ""
-
-@app.route('/')
+def process_upload(store, digest, filepath, speculation_id=None):
+    """Upload job: extract a document's text and stats.
+    
+    Text already extracted from the same content is reused. With a
+    speculation id the document is a resume, and structured resume
+    extraction is started on its text straight away.
+    """
+    result = store.get_extraction(digest)
+    if result is None:
+        result = text_extractor.extract(filepath, progress=report_progress)
+        if not result['text']:
+            # Failing the job keeps it from being reused, so the file is
+            # read again if it is uploaded again
+            raise ValueError('No text could be read from this document')
+        store.save_extraction(digest, result)
+        result['cached'] = False
+    else:
+        result['cached'] = True
+    if speculation_id:
+        speculative.start_resume_extraction(speculation_id, result['text'])
+    return result
+
+def submit_upload(text_key, store, file, speculation_id=None):
+    """Store an upload and queue extraction of its text; returns its document id.
+    
+    Uploads of known content that need no speculation reuse the earlier
+    job, so they are ready immediately.
+    """
+    digest, filepath = store.save(file)
+    document_id = upload_jobs.submit('extract_document', None, input_hash(digest, speculation_id),
+                                     process_upload, store, digest, filepath, speculation_id)
+    session[UPLOAD_DOCUMENTS[text_key]] = document_id
+    return document_id
+
+def uploaded_texts(timeout=None):
+    """Text of the session's uploads, keyed like UPLOAD_DOCUMENTS.
+    
+    Waits up to ``timeout`` seconds (or until done when None) for uploads
+    still being extracted. Returns None if any is not finished by then;
+    documents that could not be read count as empty.
+    """
+    texts = dict.fromkeys(UPLOAD_DOCUMENTS, '')
+    for text_key, id_key in UPLOAD_DOCUMENTS.items():
+        document_id = session.get(id_key)
+        if document_id is None:
+            continue
+        job = upload_jobs.wait(document_id, timeout)
+        if job is None or job['status'] == 'failed':
+            continue
+        if job['status'] != 'done':
+            return None
+        texts[text_key] = job['result']['text']
+    return texts
+
+def documents_not_ready():
+    """Send the candidate back to the setup page to watch their uploads finish"""
+    flash('Your documents are still being read. Please continue once they are ready.')
+    return redirect(url_for('.setup_interview'))
+
+@bp.route('/')
 def index():
     """Home page"""
     return render_template('index.html')
 
-@app.route('/mic-test')
+@bp.route('/mic-test')
 def mic_test():
     """Microphone test page"""
     return render_template('mic_test.html')
 
-@app.route('/upload', methods=['GET', 'POST'])
+@bp.route('/upload', methods=['GET', 'POST'])
 def upload():
     """Upload resume and job description"""
     if request.method == 'POST':
@@ -65,45 +218,35 @@ def upload():
         jd_file = request.files.get('job_description')
         jd_text = request.form.get('job_description_text', '')
         
-        resume_text = ""
-        jd_final_text = ""
+        for id_key in UPLOAD_DOCUMENTS.values():
+            session.pop(id_key, None)
+        speculation_id = SpeculativePipeline.new_id()
+        session['speculation_id'] = speculation_id
+        documents = {}
         
-        # Process resume
+        # Process resume. Its text is extracted in the background, followed
+        # by resume extraction, while the candidate fills in the setup form
         if resume_file and allowed_file(resume_file.filename):
-            filename = secure_filename(resume_file.filename)
-            filepath = os.path.join('uploads/resumes', filename)
-            resume_file.save(filepath)
-            
-            # Extract text from resume
-            if filename.endswith('.pdf'):
-                resume_text = extract_text_from_pdf(filepath)
-            else:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    resume_text = f.read()
-        
-        # Process job description
-        if jd_file and allowed_file(jd_file.filename):
-            filename = secure_filename(jd_file.filename)
-            filepath = os.path.join('uploads/job_descriptions', filename)
-            jd_file.save(filepath)
-            
-            if filename.endswith('.pdf'):
-                jd_final_text = extract_text_from_pdf(filepath)
-            else:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    jd_final_text = f.read()
+            documents['resume'] = submit_upload(
+                'resume_text', resume_store, resume_file, speculation_id)
         else:
-            jd_final_text = jd_text
+            speculative.start_resume_extraction(speculation_id, "")
         
-        # Store in session
-        session['resume_text'] = resume_text
-        session['job_description'] = jd_final_text
+        # Process job description; typed text is stored like an uploaded
+        # .txt file, so it stays out of the session too
+        if not (jd_file and allowed_file(jd_file.filename)) and jd_text.strip():
+            jd_file = FileStorage(io.BytesIO(jd_text.encode('utf-8')), filename='job_description.txt')
+        if jd_file and allowed_file(jd_file.filename):
+            documents['job_description'] = submit_upload(
+                'job_description', job_description_store, jd_file)
         
-        return redirect(url_for('setup_interview'))
+        if request.accept_mimetypes.best == 'application/json':
+            return jsonify({'status': 'success', 'documents': documents}), 202
+        return redirect(url_for('.setup_interview'))
     
     return render_template('upload.html')
 
-@app.route('/setup', methods=['GET', 'POST'])
+@bp.route('/setup', methods=['GET', 'POST'])
 def setup_interview():
     """Set up interview parameters"""
     if request.method == 'POST':
@@ -113,34 +256,97 @@ def setup_interview():
         # Store in session
         session['domain'] = domain
         session['experience_level'] = experience_level
+        # Practice sessions are scored locally, without waiting on the model
+        session['practice_mode'] = bool(request.form.get('practice_mode'))
+        
+        # Questions need the uploaded text, so finish extracting it first
+        texts = uploaded_texts(Config.UPLOAD_WAIT_TIMEOUT)
+        if texts is None:
+            return documents_not_ready()
+        
+        # Generate questions in the background while the interview page loads
+        speculation_id = session.get('speculation_id')
+        if not speculation_id:
+            speculation_id = SpeculativePipeline.new_id()
+            session['speculation_id'] = speculation_id
+        speculative.start_question_generation(
+            speculation_id,
+            resume_text=texts['resume_text'],
+            job_description=texts['job_description'],
+            domain=domain or 'Software Engineering',
+            experience_level=experience_level or 'Entry',
+            count=Config.INTERVIEW_QUESTION_COUNT
+        )
         
-        return redirect(url_for('start_interview'))
+        return redirect(url_for('.start_interview'))
     
-    return render_template('setup.html')
-
-@app.route('/start-interview')
+    # Progress is shown for uploads whose text isn't ready yet
+    documents = []
+    for label, id_key in (('Resume', 'resume_document_id'),
+                          ('Job description', 'job_description_document_id')):
+        job = upload_jobs.get(session[id_key]) if id_key in session else None
+        if job is not None and job['status'] != 'done':
+            documents.append((label, job['id']))
+    return render_template('setup.html', documents=documents)
+
+@bp.route('/api/document-status/<int:document_id>')
+def document_status(document_id):
+    """Extraction progress of an uploaded document"""
+    job = upload_jobs.get(document_id)
+    if not job or document_id not in [session.get(id_key) for id_key in UPLOAD_DOCUMENTS.values()]:
+        return jsonify({'status': 'error', 'message': 'Unknown document'}), 404
+    
+    response = {'status': job['status'], 'progress': job['progress'] or 0}
+    if job['status'] == 'done':
+        result = job['result']
+        response.update({key: result.get(key) for key in ('pages', 'pages_read', 'truncated', 'seconds', 'cached')})
+        response['characters'] = len(result['text'])
+    elif job['status'] == 'failed':
+        response['message'] = job['error']
+    return jsonify(response)
+
+@bp.route('/start-interview')
 def start_interview():
     """Start interview session"""
-    # Extract resume data
-    resume_text = session.get('resume_text', '')
-    resume_data = ai_processor.extract_text_from_resume(resume_text)
-    
-    # Generate questions
-    questions = ai_processor.generate_questions(
-        resume_data=resume_data,
-        job_description=session.get('job_description', ''),
-        domain=session.get('domain', 'Software Engineering'),
-        experience_level=session.get('experience_level', 'Entry'),
-        count=8
-    )
+    domain = session.get('domain') or 'Software Engineering'
+    experience_level = session.get('experience_level') or 'Entry'
+    count = Config.INTERVIEW_QUESTION_COUNT
+    
+    texts = uploaded_texts(Config.UPLOAD_WAIT_TIMEOUT)
+    if texts is None:
+        return documents_not_ready()
+    
+    # Use questions prepared in the background if they are ready
+    speculation_id = session.pop('speculation_id', None)
+    with tracing.span('speculative.collect') as span:
+        questions = speculative.collect(speculation_id, 'questions',
+                                        params=(domain, experience_level, count))
+        if span is not None:
+            span.set(hit=questions is not None)
+    
+    if questions is None:
+        # Extract resume data
+        resume_data = speculative.collect(speculation_id, 'resume')
+        if resume_data is None:
+            resume_data = ai_processor.extract_text_from_resume(texts['resume_text'])
+        
+        # Generate questions
+        questions = ai_processor.generate_questions(
+            resume_data=resume_data,
+            job_description=texts['job_description'],
+            domain=domain,
+            experience_level=experience_level,
+            count=count
+        )
+    speculative.discard(speculation_id)
     
     # Save session to database
     session_data = {
         'user_id': 1,  # Default user for demo
         'domain': session.get('domain'),
         'experience_level': session.get('experience_level'),
-        'resume_text': session.get('resume_text', ''),
-        'job_description': session.get('job_description', '')
+        'resume_text': texts['resume_text'],
+        'job_description': texts['job_description']
     }
     
     session_id = save_interview_session(session_data)
@@ -153,20 +359,18 @@ def start_interview():
         question_ids.append(q_id)
         q['id'] = q_id
     
-    session['questions'] = questions
     session['current_question_index'] = 0
-    session['answers'] = []
     
     return render_template('interview.html', 
                          questions=questions,
                          current_index=0,
                          session_id=session_id)
 
-@app.route('/api/next-question', methods=['POST'])
+@bp.route('/api/next-question', methods=['POST'])
 def next_question():
     """Get next question"""
     current_index = session.get('current_question_index', 0)
-    questions = session.get('questions', [])
+    questions = get_questions(session.get('session_id'))
 
     if current_index >= len(questions):
         return jsonify({
@@ -186,7 +390,75 @@ def next_question():
         'total_questions': len(questions)
     })
 
-@app.route('/api/analyze-answer', methods=['POST'])
+def answered_question_index(questions, question_id):
+    """Index of the question an answer is for.
+    
+    That is the question the client says it showed, since /api/next-question
+    has already moved the session on past it, or else the current one.
+    """
+    if question_id is not None:
+        for index, question in enumerate(questions):
+            if str(question['id']) == str(question_id):
+                return index
+    return session.get('current_question_index', 0)
+
+def answer_analysis(analysis):
+    """Answer columns that come from an analysis"""
+    return {
+        'grammar_score': analysis['grammar_score'],
+        'relevance_score': analysis['relevance_score'],
+        'confidence_score': analysis['confidence_score'],
+        'star_score': analysis['star_score'],
+        'filler_words_count': analysis['filler_words_count'],
+        'sentiment_score': analysis.get('sentiment_score'),
+        'feedback': analysis['feedback'],
+        'cross_question_asked': analysis['needs_cross_question']
+    }
+
+def save_analyzed_answer(session_id, question, question_id, answer_text, transcript, duration, analysis):
+    """Save an analyzed answer and return its record"""
+    answer_data = {
+        'question_id': question_id or question['id'],
+        'session_id': session_id,
+        'answer_text': answer_text,
+        'transcript': transcript,
+        'duration': duration
+    }
+    answer_data.update(answer_analysis(analysis))
+    
+    answer_data['id'] = save_answer(answer_data)
+    answer_data['question_text'] = question['question_text']
+    return answer_data
+
+def narrate_answer_job(answer_id, question_text, answer_text, transcript, duration):
+    """Feedback job: add the model's written feedback to a locally scored answer"""
+    analysis = ai_processor.narrate_answer(question_text, answer_text, transcript, duration)
+    update_answer_analysis(answer_id, answer_analysis(analysis))
+    return analysis
+
+def report_inputs(domain, experience_level, answers_data, coding_data):
+    """Inputs generate_final_report is called with"""
+    session_data = {
+        'domain': domain or 'Software Engineering',
+        'experience_level': experience_level or 'Entry Level'
+    }
+    return session_data, list(answers_data), coding_data or {}
+
+def submit_report_job(session_id, inputs):
+    """Start generating the final report in the background; returns the job id"""
+    return report_jobs.submit('final_report', session_id, input_hash(*inputs),
+                              ai_processor.generate_final_report, *inputs)
+
+def stored_report_inputs(session_id, domain, experience_level):
+    """Report inputs for an interview, from its answers and coding test in the database"""
+    return report_inputs(domain, experience_level, get_answers(session_id),
+                         get_coding_test(session_id) if session_id is not None else None)
+
+def session_report_inputs():
+    return stored_report_inputs(session.get('session_id'), session.get('domain'),
+                                session.get('experience_level'))
+
+@bp.route('/api/analyze-answer', methods=['POST'])
 def analyze_answer():
     """Analyze candidate's answer"""
     data = request.json
@@ -196,51 +468,50 @@ def analyze_answer():
     duration = data.get('duration', 0)
     
     # Get current question
-    current_index = session.get('current_question_index', 0)
-    questions = session.get('questions', [])
+    questions = get_questions(session.get('session_id'))
+    current_index = answered_question_index(questions, question_id)
     
     if current_index < len(questions):
         current_question = questions[current_index]
         
         # Analyze answer
+        practice_mode = session.get('practice_mode', False)
         analysis = ai_processor.analyze_answer(
             question=current_question['question_text'],
             answer=answer_text,
-            transcript=transcript
+            transcript=transcript,
+            duration=duration,
+            fast=practice_mode
         )
         
         # Save answer
-        answer_data = {
-            'question_id': question_id,
-            'session_id': session.get('session_id'),
-            'answer_text': answer_text,
-            'transcript': transcript,
-            'duration': duration,
-            'grammar_score': analysis['grammar_score'],
-            'relevance_score': analysis['relevance_score'],
-            'confidence_score': analysis['confidence_score'],
-            'star_score': analysis['star_score'],
-            'filler_words_count': analysis['filler_words_count'],
-            'feedback': analysis['feedback'],
-            'cross_question_asked': analysis['needs_cross_question']
-        }
-        
-        answer_id = save_answer(answer_data)
-        
-        # Store in session
-        answer_data['id'] = answer_id
-        answer_data['question_text'] = current_question['question_text']
-        session['answers'].append(answer_data)
+        session_id = session.get('session_id')
+        answer_data = save_analyzed_answer(
+            session_id, current_question, question_id,
+            answer_text, transcript, duration, analysis
+        )
         
         # Update question index
         session['current_question_index'] = current_index + 1
+        last_answer = current_index + 1 >= len(questions)
         
         response = {
             'status': 'success',
             'analysis': analysis,
-            'next_question_available': (current_index + 1) < len(questions)
+            'next_question_available': not last_answer
         }
         
+        if ai_processor.scoring_mode(practice_mode) == 'tiered':
+            # Local scores are returned now; the written feedback follows
+            response['feedback_job'] = feedback_jobs.submit(
+                'answer_feedback', session_id, input_hash(answer_data['id']), narrate_answer_job,
+                answer_data['id'], current_question['question_text'], answer_text, transcript, duration)
+        elif last_answer:
+            # Start on the report as soon as the last answer is in. Feedback
+            # jobs may still change the answers, so tiered sessions leave it
+            # to the coding test submission
+            submit_report_job(session_id, session_report_inputs())
+        
         if analysis['needs_cross_question']:
             response['cross_question'] = analysis['cross_question']
         
@@ -248,25 +519,102 @@ def analyze_answer():
     
     return jsonify({'status': 'error', 'message': 'No more questions'})
 
-@app.route('/coding-test')
+def sse_event(event, data):
+    """Format one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@bp.route('/api/analyze-answer/stream', methods=['POST'])
+def analyze_answer_stream():
+    """Analyze candidate's answer, pushing each part as server-sent events"""
+    data = request.json
+    question_id = data.get('question_id')
+    answer_text = data.get('answer_text', '')
+    transcript = data.get('transcript', '')
+    duration = data.get('duration', 0)
+    
+    session_id = session.get('session_id')
+    questions = get_questions(session_id)
+    current_index = answered_question_index(questions, question_id)
+    
+    if current_index >= len(questions):
+        return jsonify({'status': 'error', 'message': 'No more questions'})
+    
+    current_question = questions[current_index]
+    next_question_available = (current_index + 1) < len(questions)
+    domain = session.get('domain')
+    experience_level = session.get('experience_level')
+    practice_mode = session.get('practice_mode', False)
+    
+    # The session is saved before the body streams, so update it now
+    session['current_question_index'] = current_index + 1
+    
+    # Likewise the answer, so it is kept even if the stream never runs; the
+    # stream only fills in its analysis
+    answer_id = save_analyzed_answer(
+        session_id, current_question, question_id, answer_text, transcript, duration,
+        ai_processor.placeholder_analysis(answer_text, transcript, duration)
+    )['id']
+    
+    def save(analysis):
+        update_answer_analysis(answer_id, answer_analysis(analysis))
+        
+        if not next_question_available:
+            submit_report_job(session_id, stored_report_inputs(session_id, domain, experience_level))
+    
+    def generate():
+        events = ai_processor.analyze_answer_stream(
+            question=current_question['question_text'],
+            answer=answer_text,
+            transcript=transcript,
+            duration=duration,
+            fast=practice_mode)
+        saved = False
+        try:
+            for event, payload in events:
+                if event != 'done':
+                    yield sse_event(event, payload)
+                    continue
+                
+                saved = True
+                save(payload)
+                yield sse_event('done', {
+                    'status': 'success',
+                    'analysis': payload,
+                    'next_question_available': next_question_available
+                })
+        finally:
+            # The candidate has already moved past this question, so if the
+            # client disconnects mid-stream the analysis is finished anyway
+            if not saved:
+                for event, payload in events:
+                    if event == 'done':
+                        save(payload)
+    
+    return Response(tracing.defer(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@bp.route('/coding-test')
 def coding_test():
     """Coding test page"""
     # Generate coding problem
     domain = session.get('domain', 'Software Engineering')
     problem = ai_processor.generate_problem_statement(domain)
     
-    session['coding_problem'] = problem
+    if session.get('session_id') is not None:
+        save_coding_problem(session['session_id'], problem)
     
     return render_template('coding.html', problem=problem)
 
-@app.route('/api/evaluate-code', methods=['POST'])
+@bp.route('/api/evaluate-code', methods=['POST'])
 def evaluate_code():
     """Evaluate submitted code"""
     data = request.json
     user_code = data.get('code', '')
     time_taken = data.get('time_taken', 0)
     
-    problem = session.get('coding_problem', {})
+    problem = {}
+    if session.get('session_id') is not None:
+        problem = get_coding_problem(session['session_id']) or {}
     
     # Basic safety check
     if not CodeSandbox.is_code_safe(user_code):
@@ -300,7 +648,9 @@ def evaluate_code():
     }
     
     test_id = save_coding_test(test_data)
-    session['coding_test'] = test_data
+    
+    # The coding test is the last step, so the report can start now
+    submit_report_job(session.get('session_id'), session_report_inputs())
     
     return jsonify({
         'status': 'success',
@@ -312,10 +662,10 @@ def evaluate_code():
         }
     })
 
-@app.route('/feedback')
+@bp.route('/feedback')
 def feedback():
     """Show feedback page"""
-    answers = session.get('answers', [])
+    answers = get_answers(session.get('session_id'))
 
     # Calculate averages
     if answers:
@@ -332,35 +682,119 @@ def feedback():
                          answers=answers,
                          avg_scores=avg_scores)
 
-@app.route('/generate-report')
+@bp.route('/generate-report')
 def generate_report():
-    """Generate and display final report"""
-    # Get session data
-    session_data = {
-        'domain': session.get('domain', 'Software Engineering'),
-        'experience_level': session.get('experience_level', 'Entry Level')
-    }
-
-    # Get answers data
-    answers_data = session.get('answers', [])
+    """Display the final report, or a page that waits for it"""
+    inputs = session_report_inputs()
+    session_data, answers_data, coding_data = inputs
 
-    # Get coding test data
-    coding_data = session.get('coding_test', {})
+    # Usually already started when the last answer or code was submitted
+    job_id = submit_report_job(session.get('session_id'), inputs)
+    job = report_jobs.get(job_id)
 
-    # Generate final report using AI
-    report = ai_processor.generate_final_report(session_data, answers_data, coding_data)
+    if job['status'] != 'done':
+        return render_template('report.html', report=None, job_id=job_id)
 
-    # Store report in session for potential download
-    session['final_report'] = report
+    report = job['result']
 
     return render_template('report.html',
                          report=report,
                          answers=answers_data,
                          coding_test=coding_data if coding_data else None)
 
-
-
-@app.route('/api/speech-status', methods=['POST'])
+@bp.route('/api/report-status/<int:job_id>')
+def report_status(job_id):
+    """Status of a background report job"""
+    job = report_jobs.get(job_id)
+    if not job or job['session_id'] != session.get('session_id'):
+        return jsonify({'status': 'error', 'message': 'Unknown report job'}), 404
+
+    response = {'status': job['status']}
+    if job['status'] == 'done':
+        response['report'] = job['result']
+    elif job['status'] == 'failed':
+        response['message'] = job['error']
+    return jsonify(response)
+
+@bp.route('/api/answer-feedback/<int:job_id>')
+def answer_feedback(job_id):
+    """Status of the written feedback for a locally scored answer"""
+    job = feedback_jobs.get(job_id)
+    if not job or job['session_id'] != session.get('session_id'):
+        return jsonify({'status': 'error', 'message': 'Unknown feedback job'}), 404
+
+    response = {'status': job['status']}
+    if job['status'] == 'done':
+        response['analysis'] = job['result']
+    elif job['status'] == 'failed':
+        response['message'] = job['error']
+    return jsonify(response)
+
+@bp.route('/download-report')
+def download_report():
+    """Download the final report as PDF (HTML if wkhtmltopdf is unavailable)"""
+    inputs = session_report_inputs()
+    job = report_jobs.find('final_report', session.get('session_id'), input_hash(*inputs))
+    if not job or job['status'] != 'done':
+        return redirect(url_for('.generate_report'))
+
+    report = job['result']
+    session_data, answers_data, coding_data = inputs
+    html = ReportGenerator.generate_html_report(session_data, report, answers_data, coding_data)
+    output_path = os.path.join(tempfile.gettempdir(), f"interview_report_{session.get('session_id')}.pdf")
+    report_path = ReportGenerator.generate_pdf(html, output_path)
+    if not report_path:
+        return jsonify({'status': 'error', 'message': 'Could not generate report file'}), 500
+
+    return send_file(report_path, as_attachment=True,
+                     download_name=os.path.basename(report_path))
+
+@bp.route('/api/llm-cache/stats')
+def llm_cache_stats():
+    """Report LLM response cache hits, misses and latency saved"""
+    stats = ai_processor.cache.stats()
+    stats['single_flight'] = ai_processor.single_flight.stats()
+    stats['resilience'] = ai_processor.resilience.stats()
+    return jsonify(stats)
+
+@bp.route('/metrics')
+def metrics():
+    """Prometheus metrics for this process"""
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
+@bp.route('/debug/traces')
+def debug_traces():
+    """Most recent request traces, newest first"""
+    if not Config.TRACE_DEBUG_ENDPOINT:
+        abort(404)
+    limit = request.args.get('limit', 50, type=int)
+    return jsonify({'sample_rate': Config.TRACE_SAMPLE_RATE, 'traces': tracing.store.recent(limit)})
+
+@bp.route('/debug/traces/<trace_id>')
+def debug_trace(trace_id):
+    """One request trace with its full span tree"""
+    trace = tracing.store.get(trace_id) if Config.TRACE_DEBUG_ENDPOINT else None
+    if trace is None:
+        abort(404)
+    return jsonify(trace)
+
+@bp.route('/debug/profiles')
+def debug_profiles():
+    """Stored request profiles, newest first"""
+    if not Config.PROFILE_ENABLED:
+        abort(404)
+    return jsonify({'sample_rate': Config.PROFILE_SAMPLE_RATE, 'profiles': profiler.list_profiles()})
+
+@bp.route('/debug/profiles/<profile_id>')
+def debug_profile(profile_id):
+    """Download a profile report, or with ?format=pstats the raw cProfile stats"""
+    raw = request.args.get('format') == 'pstats'
+    path = profiler.profile_path(profile_id, raw) if Config.PROFILE_ENABLED else None
+    if path is None:
+        abort(404)
+    return send_file(os.path.abspath(path), as_attachment=True, download_name=os.path.basename(path))
+
+@bp.route('/api/speech-status', methods=['POST'])
 def speech_status():
     """Update speech recognition status"""
     data = request.json
@@ -368,4 +802,4 @@ def speech_status():
     return jsonify({'status': 'success'})
 
 if __name__ == '__main__':
-    app.run(debug=True, port=5000)
\ No newline at end of file
+    create_app().run(debug=True, port=5000)
\ No newline at end of file
@@ -0,0 +1,317 @@
+"""Micro-benchmarks for the CPU-bound work done outside the LLM.
+
+Times text extraction on the resumes in uploads/resumes and on long PDF
+and DOCX files, filler-word and sentiment scoring of long transcripts,
+batch disfluency analysis, the sandbox safety check and run, and HTML
+report rendering for large answer sets.
+
+    python benchmarks/hot_paths.py --save          # record a baseline
+    python benchmarks/hot_paths.py                 # compare, exit 1 on regression
+    python benchmarks/hot_paths.py --threshold 10 --filter pdf
+
+Baselines are specific to the machine they were recorded on, so record one
+before making a change and compare on the same box.
+"""
+import argparse
+import gc
+import glob
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DEFAULT_BASELINE = os.path.join(ROOT, 'benchmarks', 'results', 'hot_paths_baseline.json')
+RESUMES = sorted(glob.glob(os.path.join(ROOT, 'uploads', 'resumes', '*.pdf')))
+
+FILLERS = ['um', 'uh', 'like', 'you know', 'so', 'well', 'basically', 'I mean']
+SENTENCES = [
+    "I was responsible for migrating the billing service to a new database",
+    "the main challenge was keeping downtime under five minutes",
+    "we wrote a dual-write layer and backfilled historical records overnight",
+    "I think the result was good because errors dropped by forty percent",
+    "looking back I would add better monitoring before the cutover",
+    "my manager asked me to document the rollback plan for the team",
+]
+
+BENCHMARKS = []
+
+
+def benchmark(name, number=None):
+    """Register a fixture factory returning the zero-argument call to time.
+
+    ``number`` fixes the calls per round; by default it is calibrated so
+    a round takes at least --min-time seconds.
+    """
+    def register(setup):
+        BENCHMARKS.append((name, setup, number))
+        return setup
+    return register
+
+
+def make_transcript(words, seed=0):
+    """A spoken-style transcript with fillers, roughly ``words`` long"""
+    rng = random.Random(seed)
+    parts = []
+    count = 0
+    while count < words:
+        sentence = rng.choice(SENTENCES)
+        if rng.random() < 0.6:
+            sentence = rng.choice(FILLERS) + ' ' + sentence
+        parts.append(sentence)
+        count += len(sentence.split())
+    return '. '.join(parts) + '.'
+
+
+def make_answers(count, seed=0):
+    rng = random.Random(seed)
+    return [{
+        'question_text': f"Question {i}: tell me about a time you improved a system's reliability.",
+        'answer_text': make_transcript(150, seed + i),
+        'grammar_score': rng.randint(3, 10),
+        'relevance_score': rng.randint(3, 10),
+        'confidence_score': round(rng.uniform(3, 10), 1),
+        'star_score': rng.randint(3, 10),
+        'feedback': 'Add concrete metrics and say what you personally did. ' * 3,
+        'filler_words_count': rng.randint(0, 20)
+    } for i in range(count)]
+
+
+_app = None
+
+
+def app_module():
+    """Import app.py once, offline and away from the real database"""
+    global _app
+    if _app is None:
+        from config import Config
+        Config.LLM_BACKEND = 'stub'
+        Config.LLM_CASSETTE_MODE = ''
+        os.chdir(tempfile.mkdtemp(prefix='hot_paths_'))
+        import app
+        _app = app
+    return _app
+
+
+def make_long_pdf(pages):
+    """A PDF of ``pages`` pages made by repeating the sample resumes"""
+    import PyPDF2
+    writer = PyPDF2.PdfWriter()
+    readers = [PyPDF2.PdfReader(path) for path in RESUMES]
+    while len(writer.pages) < pages:
+        for reader in readers:
+            for page in reader.pages[:pages - len(writer.pages)]:
+                writer.add_page(page)
+    path = os.path.join(tempfile.mkdtemp(prefix='hot_paths_pdf_'), 'long.pdf')
+    with open(path, 'wb') as f:
+        writer.write(f)
+    return path
+
+
+def make_long_docx(paragraphs):
+    """A DOCX file of ``paragraphs`` transcript-like paragraphs"""
+    import zipfile
+    from xml.sax.saxutils import escape
+    body = ''.join(f'<w:p><w:r><w:t>{escape(make_transcript(40, seed))}</w:t></w:r></w:p>'
+                   for seed in range(paragraphs))
+    xml = ('<?xml version="1.0" encoding="UTF-8"?><w:document xmlns:w='
+           '"http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+           f'<w:body>{body}</w:body></w:document>')
+    path = os.path.join(tempfile.mkdtemp(prefix='hot_paths_docx_'), 'long.docx')
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('word/document.xml', xml)
+    return path
+
+
+@benchmark('extract_text_from_pdf[resumes]')
+def bench_pdf():
+    extract = app_module().text_extractor.extract_pdf
+    return lambda: [extract(path) for path in RESUMES]
+
+
+@benchmark('extract_text_from_pdf[40 pages]', number=1)
+def bench_pdf_long_capped():
+    from text_extractor import TextExtractor
+    extractor = TextExtractor()
+    path = make_long_pdf(40)
+    return lambda: extractor.extract_pdf(path)
+
+
+@benchmark('extract_text_from_pdf[40 pages, 4 processes, uncapped]', number=1)
+def bench_pdf_long():
+    from text_extractor import TextExtractor
+    extractor = TextExtractor(max_chars=10 ** 9, workers=4)
+    path = make_long_pdf(40)
+    extractor.extract_pdf(path)  # start the worker processes outside the timing
+    return lambda: extractor.extract_pdf(path)
+
+
+@benchmark('extract_text_from_pdf[40 pages, serial, uncapped]', number=1)
+def bench_pdf_long_serial():
+    from text_extractor import TextExtractor
+    extractor = TextExtractor(max_chars=10 ** 9, workers=1)
+    path = make_long_pdf(40)
+    return lambda: extractor.extract_pdf(path)
+
+
+@benchmark('extract_docx[5000 paragraphs, uncapped]', number=1)
+def bench_docx_long():
+    from text_extractor import TextExtractor
+    extractor = TextExtractor(max_chars=10 ** 9)
+    path = make_long_docx(5000)
+    return lambda: extractor.extract_docx(path)
+
+
+@benchmark('speech_metrics[300 words]')
+def bench_speech_short():
+    processor = app_module().ai_processor
+    transcript = make_transcript(300)
+    return lambda: processor._speech_metrics(transcript)
+
+
+@benchmark('speech_metrics[5000 words]')
+def bench_speech_long():
+    processor = app_module().ai_processor
+    transcript = make_transcript(5000)
+    return lambda: processor._speech_metrics(transcript)
+
+
+@benchmark('disfluency.analyze_many[100 x 300 words]')
+def bench_disfluency_batch():
+    from disfluency import DisfluencyAnalyzer
+    analyzer = DisfluencyAnalyzer()
+    transcripts = [make_transcript(300, seed) for seed in range(100)]
+    durations = [120] * len(transcripts)
+    return lambda: analyzer.analyze_many(transcripts, durations)
+
+
+@benchmark('is_code_safe[400 lines]')
+def bench_code_safe():
+    from code_sandbox import CodeSandbox
+    code = '\n'.join(f"def f{i}(values):\n    return sorted(v * {i} for v in values)\n" for i in range(200))
+    return lambda: CodeSandbox.is_code_safe(code)
+
+
+@benchmark('execute_python_code[small]', number=1)
+def bench_execute():
+    from code_sandbox import CodeSandbox
+    code = "print(sum(i * i for i in range(10000)))"
+    return lambda: CodeSandbox.execute_python_code(code)
+
+
+@benchmark('generate_html_report[200 answers]')
+def bench_report():
+    from report_generator import ReportGenerator
+    session_data = {'domain': 'Python', 'experience_level': 'Mid'}
+    performance = {
+        'overall_score': 72, 'communication_score': 7, 'technical_score': 6, 'confidence_score': 7,
+        'strengths': ['Clear structure'] * 5, 'weaknesses': ['Few metrics'] * 5,
+        'improvement_plan': ['Practice STAR answers'] * 7, 'final_verdict': 'Needs Improvement',
+        'detailed_analysis': 'Solid fundamentals. ' * 50
+    }
+    answers = make_answers(200)
+    coding = {'problem_statement': 'Longest run', 'test_cases_passed': 4, 'total_test_cases': 5,
+              'logic_score': 7, 'efficiency_score': 6, 'clarity_score': 8, 'time_taken': 300}
+    return lambda: ReportGenerator.generate_html_report(session_data, performance, answers, coding)
+
+
+def measure(fn, number, repeat, min_time):
+    """Seconds per call for each of ``repeat`` rounds (GC off, like timeit)"""
+    fn()
+    if number is None:
+        number = 1
+        while True:
+            start = time.perf_counter()
+            for _ in range(number):
+                fn()
+            if time.perf_counter() - start >= min_time or number >= 1_000_000:
+                break
+            number *= 10
+    rounds = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                fn()
+            rounds.append((time.perf_counter() - start) / number)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return rounds, number
+
+
+def format_time(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e3), ('us', 1e6)):
+        if seconds * scale >= 1:
+            return f"{seconds * scale:.3f}{unit}"
+    return f"{seconds * 1e9:.0f}ns"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark CPU-bound hot paths')
+    parser.add_argument('--repeat', type=int, default=5, help='timed rounds per benchmark')
+    parser.add_argument('--min-time', type=float, default=0.2, help='minimum seconds per round')
+    parser.add_argument('--filter', default='', help='only run benchmarks whose name contains this')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='baseline JSON file')
+    parser.add_argument('--save', action='store_true', help='save results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=15.0,
+                        help='percent slowdown of the best round that counts as a regression')
+    args = parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f).get('benchmarks', {})
+
+    results = {}
+    regressions = []
+    print(f"{'benchmark':<36} {'median':>10} {'min':>10} {'base min':>10} {'change':>8}")
+    for name, setup, number in BENCHMARKS:
+        if args.filter not in name:
+            continue
+        rounds, number = measure(setup(), number, args.repeat, args.min_time)
+        median = statistics.median(rounds)
+        results[name] = {'median': median, 'min': min(rounds), 'number': number, 'repeat': args.repeat}
+
+        # The best round is the least affected by other load on the machine
+        change = ''
+        previous = None if args.save else baseline.get(name)
+        if previous:
+            percent = (min(rounds) / previous['min'] - 1) * 100
+            change = f"{percent:+.1f}%"
+            if percent > args.threshold:
+                regressions.append((name, percent))
+                change += ' !'
+        print(f"{name:<36} {format_time(median):>10} {format_time(min(rounds)):>10} "
+              f"{format_time(previous['min']) if previous else '-':>10} {change:>8}")
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            json.dump({
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'machine': platform.platform(),
+                # A filtered run only replaces the benchmarks it ran
+                'benchmarks': dict(baseline, **results)
+            }, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+    elif not baseline:
+        print(f"No baseline at {args.baseline}; run with --save to record one")
+
+    if regressions:
+        for name, percent in regressions:
+            print(f"REGRESSION: {name} is {percent:.1f}% slower than the baseline (threshold {args.threshold}%)")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""Micro-benchmark: JSON extraction from model responses.
+
+Compares the greedy regex approach AIProcessor used to use with
+json_stream.extract_json (whole response) and JSONExtractor (fed in
+streaming-sized chunks), on synthetic responses of increasing size.
+
+    python benchmarks/json_extraction.py --repeat 20
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from json_stream import JSONExtractor, extract_json
+
+
+def make_response(answers, trailing_braces=False):
+    """A report-style response wrapped in the prose models like to add"""
+    payload = {
+        'overall_score': 72,
+        'strengths': ['Clear communication'] * 5,
+        'answers': [{
+            'question_text': f'Question {i}: describe a time you handled a production incident.',
+            'transcript': 'So I was on call and the service started failing {badly}. ' * 20,
+            'scores': {'grammar': 7, 'relevance': 8, 'star': 6},
+            'feedback': 'Good structure, add measurable results. "Quoted" \\ escapes too.'
+        } for i in range(answers)],
+        'detailed_analysis': 'Solid performance overall.'
+    }
+    text = 'Here is the report you asked for:\n```json\n' + json.dumps(payload, indent=2) + '\n```\n'
+    if trailing_braces:
+        text += 'Let me know if you want me to adjust {anything} or add {more} detail.'
+    return text
+
+
+def regex_extract(text):
+    match = re.search(r'\{.*\}', text, re.DOTALL)
+    if not match:
+        raise ValueError("No JSON object")
+    return json.loads(match.group())
+
+
+def streaming_extract(text, chunk_size=64):
+    extractor = JSONExtractor()
+    for i in range(0, len(text), chunk_size):
+        if extractor.feed(text[i:i + chunk_size]):
+            break
+    return extractor.result()
+
+
+def first_field_offset(text, chunk_size=64):
+    """Characters received before the first top-level field is usable"""
+    extractor = JSONExtractor()
+    for i in range(0, len(text), chunk_size):
+        extractor.feed(text[i:i + chunk_size])
+        if extractor.fields:
+            return i + chunk_size
+    return len(text)
+
+
+def timed(fn, text, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            fn(text)
+            ok = True
+        except ValueError:
+            ok = False
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[8, 80, 800, 4000],
+                        help='number of answers embedded in each synthetic response')
+    args = parser.parse_args()
+
+    methods = [
+        ('regex', regex_extract),
+        ('extract_json', extract_json),
+        ('streaming/64', streaming_extract),
+    ]
+
+    print(f"{'size':>10} {'trailing':>8} " + ' '.join(f"{name:>16}" for name, _ in methods) + f" {'first field':>12}")
+    for answers in args.sizes:
+        for trailing in (False, True):
+            text = make_response(answers, trailing)
+            cells = []
+            for name, fn in methods:
+                best, ok = timed(fn, text, args.repeat)
+                cells.append(f"{best * 1000:>13.3f}ms" if ok else f"{'FAILED':>16}")
+            offset = first_field_offset(text)
+            print(f"{len(text):>10} {str(trailing):>8} " + ' '.join(cells) + f" {offset / len(text):>11.1%}")
+
+
+if __name__ == '__main__':
+    main()
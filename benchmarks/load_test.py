@@ -0,0 +1,354 @@
+"""End-to-end load test: virtual candidates running the whole interview flow.
+
+Each candidate uploads a resume, sets up the interview, answers every
+question, takes the coding test and waits for the final report:
+
+    /upload -> /setup -> /start-interview -> /api/analyze-answer,
+    (/api/next-question, /api/analyze-answer) x N-1 -> /coding-test ->
+    /api/evaluate-code -> /generate-report (polling /api/report-status/<id>)
+
+By default the app runs in-process behind the Flask test client with the
+stub LLM backend, in a scratch working directory so the real database and
+uploads are untouched. Use --target to load a running server over HTTP
+instead (start it with LLM_BACKEND=stub or a replay cassette).
+
+    python benchmarks/load_test.py --candidates 50 --concurrency 10
+    python benchmarks/load_test.py --target http://127.0.0.1:5000 --candidates 20
+
+Throughput and per-route latency percentiles and error rates are written
+as JSON and CSV to --output.
+"""
+import argparse
+import csv
+import http.cookiejar
+import io
+import json
+import math
+import os
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DEFAULT_RESUME = os.path.join(ROOT, 'uploads', 'resumes', 'Afroz_Sheikh_Resume.pdf')
+ANSWER_TEXT = (
+    "In my last role our checkout service was timing out under load. I was asked to fix it "
+    "before a sale. I profiled the slow endpoint, added an index and a small cache, and "
+    "load tested the change. Latency dropped from two seconds to 200 milliseconds."
+)
+TRANSCRIPT = "um so in my last role " + ANSWER_TEXT.lower() + " you know"
+CODE = "def longest_run(nums):\n    best = run = 0\n    prev = None\n    for n in nums:\n        run = run + 1 if n == prev else 1\n        best = max(best, run)\n        prev = n\n    return best\n"
+JOB_ID = re.compile(r'data-job-id="(\d+)"')
+
+
+def percentile(samples, p):
+    """Nearest-rank percentile of a sorted list"""
+    if not samples:
+        return None
+    return samples[max(1, math.ceil(p / 100 * len(samples))) - 1]
+
+
+class Response:
+    def __init__(self, status, body):
+        self.status = status
+        self.body = body
+
+    def json(self):
+        """The JSON body, or the data of the last server-sent event"""
+        if self.body.startswith('event:'):
+            return json.loads(self.body.rstrip().rsplit('\ndata: ', 1)[1])
+        return json.loads(self.body)
+
+    @property
+    def app_error(self):
+        """True for a 200 response whose JSON reports an error"""
+        try:
+            return self.json().get('status') == 'error'
+        except (ValueError, IndexError, AttributeError):
+            return False
+
+
+class FlaskClientTransport:
+    """Requests through the Flask test client (one per candidate, for cookies)"""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, form=None, files=None, json_body=None):
+        data = dict(form or {})
+        for name, (filename, content) in (files or {}).items():
+            data[name] = (io.BytesIO(content), filename)
+        response = self.client.open(path, method=method, data=data or None, json=json_body)
+        return Response(response.status_code, response.get_data(as_text=True))
+
+
+class HTTPTransport:
+    """Requests to a running server over HTTP, with a per-candidate cookie jar"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar())
+        )
+
+    def request(self, method, path, form=None, files=None, json_body=None):
+        headers = {}
+        data = None
+        if files:
+            boundary = uuid.uuid4().hex
+            data = self._multipart(boundary, form or {}, files)
+            headers['Content-Type'] = f'multipart/form-data; boundary={boundary}'
+        elif form is not None:
+            data = urllib.parse.urlencode(form).encode('utf-8')
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        elif json_body is not None:
+            data = json.dumps(json_body).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+
+        req = urllib.request.Request(self.base_url + path, data=data, headers=headers, method=method)
+        try:
+            with self.opener.open(req, timeout=300) as response:
+                return Response(response.status, response.read().decode('utf-8', 'replace'))
+        except urllib.error.HTTPError as e:
+            return Response(e.code, e.read().decode('utf-8', 'replace'))
+
+    @staticmethod
+    def _multipart(boundary, form, files):
+        parts = []
+        for name, value in form.items():
+            parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode('utf-8'))
+        for name, (filename, content) in files.items():
+            parts.append(
+                f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+                f'Content-Type: application/octet-stream\r\n\r\n'.encode('utf-8') + content + b'\r\n'
+            )
+        parts.append(f'--{boundary}--\r\n'.encode('utf-8'))
+        return b''.join(parts)
+
+
+class Recorder:
+    """Thread-safe latency and error samples per route"""
+
+    def __init__(self):
+        self.samples = {}
+        self.errors = {}
+        self._lock = threading.Lock()
+
+    def add(self, route, seconds, ok):
+        with self._lock:
+            self.samples.setdefault(route, []).append(seconds)
+            self.errors[route] = self.errors.get(route, 0) + (0 if ok else 1)
+
+    def summary(self):
+        routes = {}
+        with self._lock:
+            for route, samples in self.samples.items():
+                samples = sorted(samples)
+                routes[route] = {
+                    'count': len(samples),
+                    'errors': self.errors[route],
+                    'error_rate': round(self.errors[route] / len(samples), 4),
+                    'mean': round(sum(samples) / len(samples), 4),
+                    'p50': round(percentile(samples, 50), 4),
+                    'p95': round(percentile(samples, 95), 4),
+                    'p99': round(percentile(samples, 99), 4),
+                    'max': round(samples[-1], 4)
+                }
+        return routes
+
+
+class Candidate:
+    """One virtual candidate going through the interview.
+
+    ``resume`` is a (filename, content) pair; each candidate uploads it
+    under its own name, as real candidates would.
+    """
+
+    def __init__(self, transport, recorder, resume, answers, stream=False, report_timeout=120):
+        self.transport = transport
+        self.recorder = recorder
+        self.resume = resume
+        self.answers = answers
+        self.stream = stream
+        self.report_timeout = report_timeout
+
+    def call(self, route, method, path, expect=(200, 302), **kwargs):
+        start = time.perf_counter()
+        try:
+            response = self.transport.request(method, path, **kwargs)
+        except Exception:
+            self.recorder.add(route, time.perf_counter() - start, False)
+            raise
+        ok = response.status in expect and not response.app_error
+        self.recorder.add(route, time.perf_counter() - start, ok)
+        if not ok:
+            raise RuntimeError(f"{route} returned {response.status}: {response.body[:100]}")
+        return response
+
+    def run(self):
+        self.call('/upload', 'POST', '/upload',
+                  form={'job_description_text': 'Backend Python developer, Flask and SQL.'},
+                  files={'resume': (f"{uuid.uuid4().hex[:8]}_{self.resume[0]}", self.resume[1])})
+        self.call('/setup', 'POST', '/setup', form={'domain': 'Python', 'experience_level': 'Mid'})
+        self.call('/start-interview', 'GET', '/start-interview')
+
+        analyze = '/api/analyze-answer/stream' if self.stream else '/api/analyze-answer'
+        # The interview starts on its first question, so answer it straight
+        # away; after that fetch each next question until the server says
+        # there are no more
+        question_id = None
+        for index in range(self.answers):
+            if index:
+                next_question = self.call('/api/next-question', 'POST', '/api/next-question', json_body={}).json()
+                if next_question.get('status') != 'success':
+                    break
+                question_id = next_question['question'].get('id')
+            result = self.call(analyze, 'POST', analyze, json_body={
+                'question_id': question_id,
+                'answer_text': ANSWER_TEXT,
+                'transcript': TRANSCRIPT,
+                'duration': 60
+            }).json()
+            if not result.get('next_question_available', True):
+                break
+
+        self.call('/coding-test', 'GET', '/coding-test')
+        self.call('/api/evaluate-code', 'POST', '/api/evaluate-code', json_body={'code': CODE, 'time_taken': 300})
+
+        page = self.call('/generate-report', 'GET', '/generate-report')
+        job = JOB_ID.search(page.body)
+        if job:
+            deadline = time.monotonic() + self.report_timeout
+            while True:
+                status = self.call('/api/report-status/<id>', 'GET', f'/api/report-status/{job.group(1)}').json()
+                if status.get('status') == 'done':
+                    break
+                if status.get('status') == 'failed' or time.monotonic() > deadline:
+                    raise RuntimeError(f"Report job {job.group(1)} did not finish")
+                time.sleep(0.25)
+            self.call('/generate-report', 'GET', '/generate-report')
+
+
+def load_app(args, workdir):
+    """Create the app in-process inside a scratch directory"""
+    from config import Config
+    Config.LLM_BACKEND = args.backend
+    Config.LLM_STUB_LATENCY = args.stub_latency
+    if Config.LLM_CASSETTE_PATH:
+        Config.LLM_CASSETTE_PATH = os.path.abspath(Config.LLM_CASSETTE_PATH)
+    os.chdir(workdir)
+    import app as app_module
+    return app_module.create_app()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the interview flow')
+    parser.add_argument('--candidates', type=int, default=20, help='virtual candidates in total')
+    parser.add_argument('--concurrency', type=int, default=5, help='candidates running at once')
+    parser.add_argument('--answers', type=int, default=None, help='most answers per candidate (default: question count)')
+    parser.add_argument('--ramp-up', type=float, default=0.0, help='seconds over which candidates start')
+    parser.add_argument('--stream', action='store_true', help='use the streaming analyze-answer endpoint')
+    parser.add_argument('--target', help='base URL of a running server (default: in-process test client)')
+    parser.add_argument('--backend', default='stub', help='LLM backend for the in-process app')
+    parser.add_argument('--stub-latency', type=float, default=0.5, help='stub backend seconds per call')
+    parser.add_argument('--resume', default=DEFAULT_RESUME, help='resume file to upload')
+    parser.add_argument('--report-timeout', type=float, default=120)
+    parser.add_argument('--output', default=os.path.join(ROOT, 'benchmarks', 'results'),
+                        help='directory for the JSON and CSV results')
+    args = parser.parse_args()
+
+    from config import Config
+    answers = args.answers if args.answers is not None else Config.INTERVIEW_QUESTION_COUNT
+    with open(args.resume, 'rb') as f:
+        resume = (os.path.basename(args.resume), f.read())
+    output = os.path.abspath(args.output)
+
+    workdir = None
+    if args.target:
+        make_transport = lambda: HTTPTransport(args.target)
+    else:
+        workdir = tempfile.mkdtemp(prefix='load_test_')
+        app = load_app(args, workdir)
+        make_transport = lambda: FlaskClientTransport(app)
+
+    recorder = Recorder()
+    failures = []
+    failures_lock = threading.Lock()
+
+    def run_candidate(index):
+        if args.ramp_up and args.candidates > 1:
+            time.sleep(args.ramp_up * index / (args.candidates - 1))
+        start = time.perf_counter()
+        try:
+            Candidate(make_transport(), recorder, resume, answers, args.stream, args.report_timeout).run()
+        except Exception as e:
+            with failures_lock:
+                failures.append(str(e))
+            return
+        recorder.add('interview (total)', time.perf_counter() - start, True)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(run_candidate, range(args.candidates)))
+    elapsed = time.perf_counter() - started
+
+    routes = recorder.summary()
+    total = routes.pop('interview (total)', None)
+    requests = sum(route['count'] for route in routes.values())
+    errors = sum(route['errors'] for route in routes.values())
+    results = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'settings': {
+            'candidates': args.candidates, 'concurrency': args.concurrency, 'answers': answers,
+            'stream': args.stream, 'target': args.target or 'in-process',
+            'backend': None if args.target else Config.LLM_BACKEND,
+            'stub_latency': None if args.target else Config.LLM_STUB_LATENCY
+        },
+        'elapsed_seconds': round(elapsed, 3),
+        'completed_candidates': args.candidates - len(failures),
+        'failed_candidates': len(failures),
+        'requests': requests,
+        'errors': errors,
+        'error_rate': round(errors / requests, 4) if requests else 0,
+        'requests_per_second': round(requests / elapsed, 2),
+        'candidates_per_minute': round((args.candidates - len(failures)) / elapsed * 60, 2),
+        'interview_seconds': total,
+        'routes': routes,
+        'failures': failures[:20]
+    }
+
+    os.makedirs(output, exist_ok=True)
+    name = 'load_test-' + time.strftime('%Y%m%d-%H%M%S')
+    with open(os.path.join(output, name + '.json'), 'w') as f:
+        json.dump(results, f, indent=2)
+    with open(os.path.join(output, name + '.csv'), 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['route', 'count', 'errors', 'error_rate', 'mean', 'p50', 'p95', 'p99', 'max'])
+        for route, stats in sorted(routes.items()):
+            writer.writerow([route] + [stats[key] for key in ('count', 'errors', 'error_rate', 'mean', 'p50', 'p95', 'p99', 'max')])
+
+    print(f"{results['completed_candidates']}/{args.candidates} candidates in {elapsed:.1f}s, "
+          f"{results['requests_per_second']} req/s, error rate {results['error_rate']:.2%}")
+    print(f"{'route':<30} {'count':>6} {'err%':>6} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for route, stats in sorted(routes.items()):
+        print(f"{route:<30} {stats['count']:>6} {stats['error_rate']:>6.1%} "
+              f"{stats['p50']:>8.3f} {stats['p95']:>8.3f} {stats['p99']:>8.3f}")
+    print(f"Results written to {os.path.join(output, name)}.json/.csv")
+
+    if workdir:
+        os.chdir(ROOT)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""Cold start report for app.py.
+
+Imports app and calls create_app() in a fresh interpreter under
+``python -X importtime``, then prints where the time went: the slowest
+packages and the repo's own modules, and any module that should only be
+loaded on first use.
+
+    python benchmarks/startup.py                  # exit 1 over budget
+    python benchmarks/startup.py --budget 300 --top 15
+
+The best of --repeat runs is reported, since disk cache and other load
+on the machine make single cold starts noisy.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Slow to import and not needed until a request uses them
+LAZY_MODULES = ('textblob', 'nltk', 'aiohttp', 'PyPDF2', 'numpy')
+
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+app.create_app()
+created = time.perf_counter()
+print(json.dumps({'import': imported - start, 'create_app': created - imported,
+                  'modules': sorted(sys.modules)}))
+"""
+
+
+def parse_importtime(stderr):
+    """(module, self seconds, cumulative seconds) for each line of -X importtime"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        rows.append((name.strip(), int(own) / 1e6, int(cumulative) / 1e6))
+    return rows
+
+
+def run_once(backend):
+    env = dict(os.environ, PYTHONPATH=ROOT, LLM_BACKEND=backend, PYTHONDONTWRITEBYTECODE='1')
+    # A scratch directory keeps the database and uploads out of the repo
+    with tempfile.TemporaryDirectory(prefix='startup_') as workdir:
+        proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', CHILD], cwd=workdir,
+                              env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        sys.exit(f"App failed to start:\n{proc.stderr[-2000:]}")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result['imports'] = parse_importtime(proc.stderr)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report app.py cold start time')
+    parser.add_argument('--budget', type=float, default=300, help='milliseconds allowed for import + create_app')
+    parser.add_argument('--repeat', type=int, default=3, help='cold starts to run; the fastest is reported')
+    parser.add_argument('--top', type=int, default=10, help='packages to list')
+    parser.add_argument('--backend', default='stub', help='LLM_BACKEND for the child process')
+    args = parser.parse_args()
+
+    runs = [run_once(args.backend) for _ in range(args.repeat)]
+    best = min(runs, key=lambda run: run['import'] + run['create_app'])
+    total_ms = (best['import'] + best['create_app']) * 1000
+
+    packages = defaultdict(float)
+    local = []
+    for name, own, cumulative in best['imports']:
+        root = name.split('.')[0]
+        packages[root] += own
+        if os.path.exists(os.path.join(ROOT, root + '.py')):
+            local.append((name, own, cumulative))
+
+    print(f"import app   {best['import'] * 1000:8.1f} ms")
+    print(f"create_app() {best['create_app'] * 1000:8.1f} ms")
+    print(f"total        {total_ms:8.1f} ms (budget {args.budget:.0f} ms)\n")
+
+    print(f"{'package':<32} {'self ms':>9}")
+    for name, own in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{name:<32} {own * 1000:9.1f}")
+
+    print(f"\n{'repo module':<32} {'self ms':>9} {'cumul ms':>9}")
+    for name, own, cumulative in sorted(local, key=lambda row: -row[2]):
+        print(f"{name:<32} {own * 1000:9.1f} {cumulative * 1000:9.1f}")
+
+    eager = [name for name in LAZY_MODULES if name in best['modules']]
+    failed = False
+    if eager:
+        print(f"\nLoaded at startup but should be lazy: {', '.join(eager)}")
+        failed = True
+    if total_ms > args.budget:
+        print(f"\nOVER BUDGET: cold start took {total_ms:.1f} ms (budget {args.budget:.0f} ms)")
+        failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
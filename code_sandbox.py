@@ -2,6 +2,13 @@ import subprocess
 import tempfile
 import os
 import sys
+import threading
+from config import Config
+from metrics import SANDBOX_QUEUE_SECONDS, SANDBOX_RUN_SECONDS
+import tracing
+
+# Limits how many submissions run at once; the rest wait for a slot
+_slots = threading.BoundedSemaphore(Config.SANDBOX_MAX_CONCURRENT)
 
 class CodeSandbox:
     """Basic secure code execution sandbox (Python only)"""
@@ -12,6 +19,20 @@ class CodeSandbox:
         Execute Python code in a restricted environment
         Returns: (output, error, success)
         """
+        with tracing.span('sandbox.queue'), SANDBOX_QUEUE_SECONDS.time():
+            _slots.acquire()
+        try:
+            with tracing.span('sandbox.run') as span, SANDBOX_RUN_SECONDS.time():
+                output, error, success = CodeSandbox._run_python_code(code, timeout)
+                if span is not None:
+                    span.set(success=success)
+                return output, error, success
+        finally:
+            _slots.release()
+    
+    @staticmethod
+    def _run_python_code(code, timeout):
+        """Run code in a subprocess; see execute_python_code"""
         # Create a temporary file
         with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
             f.write(code)
@@ -5,7 +5,7 @@ load_dotenv()
 
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-key-123-change-in-production'
-    GEMINI_API_KEY = ""
+    GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY', "")
     UPLOAD_FOLDER = 'uploads'
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
     SESSION_TYPE = 'filesystem'
@@ -13,12 +13,105 @@ class Config:
     # Allowed file extensions
     ALLOWED_EXTENSIONS = {'pdf', 'txt', 'docx'}
     
+    # Text extraction from uploads. Prompts keep far less than DOCUMENT_MAX_CHARS
+    # (see PROMPT_BUDGETS), so extraction stops once that much text is read
+    DOCUMENT_MAX_CHARS = 20000
+    DOCUMENT_MAX_PAGES = 50
+    PDF_PARALLEL_MIN_PAGES = 12  # PDFs this long are read by a process pool
+    PDF_PAGES_PER_TASK = 4
+    PDF_WORKERS = min(4, os.cpu_count() or 1)  # 1 reads every PDF on its upload worker
+    UPLOAD_WORKERS = 2  # uploads extracted at once, in the background
+    UPLOAD_WAIT_TIMEOUT = 60  # seconds /setup waits for an unfinished extraction
+    
     # Interview settings
     QUESTION_TIME_LIMIT = 120  # seconds
     CODING_TIME_LIMIT = 600  # seconds
+    INTERVIEW_QUESTION_COUNT = 8
+
+    # Answer scoring: 'llm' (model scores and feedback), 'tiered' (local scores
+    # at once, model writes only the feedback, in the background) or 'fast'
+    # (local only; also used for practice sessions). Tiered scores differ from
+    # the model's, so it is opt-in
+    SCORING_MODE = os.environ.get('SCORING_MODE', 'llm')
+    
+    # Filler words and phrases counted in spoken answers (whole words only)
+    FILLER_WORDS = ['um', 'uh', 'ah', 'er', 'like', 'you know', 'so', 'well']
+    
+    # Speculative preparation started at /upload and /setup
+    SPECULATIVE_WORKERS = 8
+    SPECULATIVE_TTL = 30 * 60  # seconds before unused results are dropped
     
+    # Background jobs (final report generation)
+    JOB_WORKERS = 4
+    JOB_TIMEOUT = 10 * 60  # seconds before an unfinished job is considered lost
+
+    # Code sandbox
+    SANDBOX_MAX_CONCURRENT = 4  # submissions run at once; others wait for a slot
+
+    # Request tracing (?trace=1 or an "X-Trace: 1" header always traces)
+    TRACE_SAMPLE_RATE = float(os.environ.get('TRACE_SAMPLE_RATE', 0.01))  # fraction of requests traced
+    TRACE_BUFFER_SIZE = 200  # recent traces kept for /debug/traces
+    TRACE_FILE = os.environ.get('TRACE_FILE', '')  # also append traces here as JSON lines
+    TRACE_DEBUG_ENDPOINT = os.environ.get('TRACE_DEBUG_ENDPOINT', '0') != '0'  # unauthenticated; development only
+
+    # Request profiling (?profile=cpu|memory or an "X-Profile" header profiles one request)
+    PROFILE_ENABLED = os.environ.get('PROFILE_ENABLED', '0') != '0'  # unauthenticated; development only
+    PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 0.01))  # fraction profiled at random
+    PROFILE_SAMPLE_MODE = 'cpu'  # 'cpu' (cProfile) or 'memory' (tracemalloc diff) for sampled requests
+    PROFILE_DIR = 'profiles'
+    PROFILE_KEEP = 50  # newest profiles kept on disk
+    PROFILE_TOP = 40  # functions or allocation sites listed per report
+    PROFILE_TRACEMALLOC_FRAMES = 1
+
     # Database
     DATABASE = 'database.sqlite'
     
     # Gemini model
-    GEMINI_MODEL = 'gemini-2.5-flash'  # Using the latest flash model
\ No newline at end of file
+    GEMINI_MODEL = 'gemini-2.5-flash'  # Using the latest flash model
+    
+    # LLM backend: 'gemini', or 'stub' to run offline (no API key needed)
+    LLM_BACKEND = os.environ.get('LLM_BACKEND', 'gemini')
+    LLM_STUB_LATENCY = float(os.environ.get('LLM_STUB_LATENCY', 0.5))  # seconds per call
+    LLM_STUB_JITTER = float(os.environ.get('LLM_STUB_JITTER', 0.2))  # +/- fraction of the latency
+    LLM_STUB_CHUNK_SIZE = 64  # characters per streamed chunk
+    
+    # Record/replay of model traffic: '', 'record' or 'replay'
+    LLM_CASSETTE_MODE = os.environ.get('LLM_CASSETTE_MODE', '')
+    LLM_CASSETTE_PATH = os.environ.get('LLM_CASSETTE_PATH') or os.path.join('cassettes', 'llm.jsonl.gz')
+    # Replay with the recorded latency, or instantly when off
+    LLM_CASSETTE_REALTIME = os.environ.get('LLM_CASSETTE_REALTIME', '1') != '0'
+    
+    # LLM client
+    GEMINI_API_BASE = os.environ.get('GEMINI_API_BASE') or 'https://generativelanguage.googleapis.com/v1beta'
+    LLM_MAX_CONCURRENCY = 32  # in-flight model requests per process
+    LLM_POOL_SIZE = 16  # pooled HTTP connections
+    LLM_TIMEOUT = 60  # seconds
+    
+    # LLM deadlines, hedging and circuit breaker
+    LLM_LATENCY_WINDOW = 200  # recent calls per method used for percentiles
+    LLM_LATENCY_MIN_SAMPLES = 20  # calls before deadlines and hedging adapt
+    LLM_DEADLINE_FACTOR = 2.0  # deadline = p99 latency * factor
+    LLM_MIN_DEADLINE = 5  # seconds
+    LLM_HEDGE = True  # duplicate calls slower than p95 (or failing early) once
+    LLM_BREAKER_FAILURES = 5  # consecutive failures that open the circuit
+    LLM_BREAKER_RESET = 30  # seconds before a probe call is let through
+    
+    # LLM response cache (stored next to DATABASE)
+    LLM_CACHE_DATABASE = os.path.join(os.path.dirname(DATABASE), 'llm_cache.sqlite')
+    LLM_CACHE_MAX_ENTRIES = 5000
+    # Only methods listed here are cached, with their TTL in seconds
+    LLM_CACHE_TTL = {
+        'extract_text_from_resume': 7 * 24 * 3600,
+        'generate_problem_statement': 24 * 3600,
+    }
+
+    # Prompt size budgets per method and field, in estimated tokens
+    PROMPT_BUDGETS = {
+        'extract_text_from_resume': {'resume_text': 500},
+        'generate_questions': {'resume_data': 600, 'job_description': 250},
+        'analyze_answer': {'question': 200, 'answer': 1500},
+        'narrate_answer': {'question': 200, 'answer': 1500},
+        'generate_cross_question': {'question': 200, 'answer': 1000},
+        'evaluate_code': {'problem_statement': 400, 'user_code': 2000},
+        'generate_final_report': {'answers': 2500, 'coding': 600},
+    }
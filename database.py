@@ -2,6 +2,8 @@ import sqlite3
 import json
 from datetime import datetime
 from config import Config
+from metrics import SQLITE_WRITE_SECONDS, timed
+from tracing import traced
 
 def get_db():
     """Get database connection"""
@@ -113,9 +115,48 @@ def init_db():
         )
     ''')
     
+    # Background jobs table
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT,
+            session_id INTEGER,
+            input_hash TEXT,
+            status TEXT DEFAULT 'queued',
+            result TEXT,
+            error TEXT,
+            created_at TIMESTAMP,
+            started_at TIMESTAMP,
+            finished_at TIMESTAMP,
+            FOREIGN KEY (session_id) REFERENCES interview_sessions (id)
+        )
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_jobs_lookup
+        ON jobs (kind, session_id, input_hash)
+    ''')
+    
+    # Interview data is read back per request by session
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_questions_session ON questions (session_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_answers_session ON answers (session_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_coding_tests_session ON coding_tests (session_id)')
+    
+    # Columns added after the first release
+    _add_column(cursor, 'answers', 'sentiment_score', 'REAL')
+    _add_column(cursor, 'jobs', 'progress', 'REAL')
+    _add_column(cursor, 'interview_sessions', 'coding_problem', 'TEXT')
+    
     conn.commit()
     conn.close()
 
+def _add_column(cursor, table, column, definition):
+    """Add a column to an existing table unless it is already there"""
+    columns = {row['name'] for row in cursor.execute(f'PRAGMA table_info({table})')}
+    if column not in columns:
+        cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+
+@traced('db.save_interview_session')
+@timed(SQLITE_WRITE_SECONDS, operation='save_interview_session')
 def save_interview_session(session_data):
     """Save interview session data"""
     conn = get_db()
@@ -140,6 +181,8 @@ def save_interview_session(session_data):
     
     return session_id
 
+@traced('db.save_question')
+@timed(SQLITE_WRITE_SECONDS, operation='save_question')
 def save_question(session_id, question_data):
     """Save generated question"""
     conn = get_db()
@@ -164,6 +207,8 @@ def save_question(session_id, question_data):
     
     return question_id
 
+@traced('db.save_answer')
+@timed(SQLITE_WRITE_SECONDS, operation='save_answer')
 def save_answer(answer_data):
     """Save answer with analysis"""
     conn = get_db()
@@ -173,8 +218,8 @@ def save_answer(answer_data):
         INSERT INTO answers 
         (question_id, session_id, answer_text, transcript, duration, 
          grammar_score, relevance_score, confidence_score, star_score, 
-         filler_words_count, feedback, cross_question_asked)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+         filler_words_count, sentiment_score, feedback, cross_question_asked)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
     ''', (
         answer_data['question_id'],
         answer_data['session_id'],
@@ -186,6 +231,7 @@ def save_answer(answer_data):
         answer_data['confidence_score'],
         answer_data['star_score'],
         answer_data['filler_words_count'],
+        answer_data.get('sentiment_score'),
         answer_data['feedback'],
         answer_data.get('cross_question_asked', False)
     ))
@@ -196,6 +242,32 @@ def save_answer(answer_data):
     
     return answer_id
 
+@traced('db.update_answer_analysis')
+@timed(SQLITE_WRITE_SECONDS, operation='update_answer_analysis')
+def update_answer_analysis(answer_id, answer_data):
+    """Replace the scores and feedback of a saved answer"""
+    conn = get_db()
+    conn.execute('''
+        UPDATE answers
+        SET grammar_score = ?, relevance_score = ?, confidence_score = ?, star_score = ?,
+            filler_words_count = ?, sentiment_score = ?, feedback = ?, cross_question_asked = ?
+        WHERE id = ?
+    ''', (
+        answer_data['grammar_score'],
+        answer_data['relevance_score'],
+        answer_data['confidence_score'],
+        answer_data['star_score'],
+        answer_data['filler_words_count'],
+        answer_data.get('sentiment_score'),
+        answer_data['feedback'],
+        answer_data.get('cross_question_asked', False),
+        answer_id
+    ))
+    conn.commit()
+    conn.close()
+
+@traced('db.save_coding_test')
+@timed(SQLITE_WRITE_SECONDS, operation='save_coding_test')
 def save_coding_test(test_data):
     """Save coding test results"""
     conn = get_db()
@@ -227,6 +299,68 @@ def save_coding_test(test_data):
     
     return test_id
 
+@traced('db.save_coding_problem')
+@timed(SQLITE_WRITE_SECONDS, operation='save_coding_problem')
+def save_coding_problem(session_id, problem):
+    """Store the coding problem given in an interview session"""
+    conn = get_db()
+    conn.execute('UPDATE interview_sessions SET coding_problem = ? WHERE id = ?',
+                 (json.dumps(problem), session_id))
+    conn.commit()
+    conn.close()
+
+@traced('db.get_coding_problem')
+def get_coding_problem(session_id):
+    """Get the coding problem given in an interview session, or None"""
+    conn = get_db()
+    row = conn.execute('SELECT coding_problem FROM interview_sessions WHERE id = ?',
+                       (session_id,)).fetchone()
+    conn.close()
+    return json.loads(row['coding_problem']) if row and row['coding_problem'] else None
+
+@traced('db.get_questions')
+def get_questions(session_id):
+    """Get a session's questions in the order they are asked"""
+    conn = get_db()
+    cursor = conn.cursor()
+    
+    cursor.execute('''
+        SELECT * FROM questions WHERE session_id = ? ORDER BY id
+    ''', (session_id,))
+    
+    questions = [dict(row) for row in cursor.fetchall()]
+    
+    conn.close()
+    return questions
+
+@traced('db.get_answers')
+def get_answers(session_id):
+    """Get a session's answers in the order they were given, with their question text"""
+    conn = get_db()
+    cursor = conn.cursor()
+    
+    cursor.execute('''
+        SELECT a.*, q.question_text
+        FROM answers a LEFT JOIN questions q ON q.id = a.question_id
+        WHERE a.session_id = ?
+        ORDER BY a.id
+    ''', (session_id,))
+    
+    answers = [dict(row) for row in cursor.fetchall()]
+    
+    conn.close()
+    return answers
+
+@traced('db.get_coding_test')
+def get_coding_test(session_id):
+    """Get a session's latest coding test result, or None"""
+    conn = get_db()
+    row = conn.execute('SELECT * FROM coding_tests WHERE session_id = ? ORDER BY id DESC LIMIT 1',
+                       (session_id,)).fetchone()
+    conn.close()
+    return dict(row) if row else None
+
+@traced('db.get_session_performance')
 def get_session_performance(session_id):
     """Get performance data for a session"""
     conn = get_db()
@@ -265,6 +399,7 @@ def get_session_performance(session_id):
         'coding_tests': coding_tests
     }
 
+@traced('db.get_user_history')
 def get_user_history(user_id):
     """Get user's performance history"""
     conn = get_db()
@@ -281,4 +416,96 @@ def get_user_history(user_id):
     history = [dict(row) for row in cursor.fetchall()]
     
     conn.close()
-    return history
\ No newline at end of file
+    return history
+
+@traced('db.create_job')
+@timed(SQLITE_WRITE_SECONDS, operation='create_job')
+def create_job(kind, session_id, input_hash):
+    """Record a queued background job"""
+    conn = get_db()
+    cursor = conn.cursor()
+    
+    cursor.execute('''
+        INSERT INTO jobs (kind, session_id, input_hash, status, created_at)
+        VALUES (?, ?, ?, 'queued', ?)
+    ''', (kind, session_id, input_hash, datetime.now()))
+    
+    job_id = cursor.lastrowid
+    conn.commit()
+    conn.close()
+    
+    return job_id
+
+@traced('db.update_job')
+@timed(SQLITE_WRITE_SECONDS, operation='update_job')
+def update_job(job_id, status, result=None, error=None):
+    """Move a job to running, done or failed"""
+    conn = get_db()
+    cursor = conn.cursor()
+    
+    if status == 'running':
+        cursor.execute('''
+            UPDATE jobs SET status = ?, started_at = ?, progress = 0 WHERE id = ?
+        ''', (status, datetime.now(), job_id))
+    else:
+        cursor.execute('''
+            UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?,
+                            progress = CASE WHEN ? = 'done' THEN 1 ELSE progress END
+            WHERE id = ?
+        ''', (
+            status,
+            json.dumps(result) if result is not None else None,
+            error,
+            datetime.now(),
+            status,
+            job_id
+        ))
+    
+    conn.commit()
+    conn.close()
+
+@timed(SQLITE_WRITE_SECONDS, operation='update_job_progress')
+def update_job_progress(job_id, progress):
+    """Record the fraction (0-1) of a running job's work that is done"""
+    conn = get_db()
+    conn.execute('UPDATE jobs SET progress = ? WHERE id = ?', (progress, job_id))
+    conn.commit()
+    conn.close()
+
+def _job_from_row(row):
+    job = dict(row)
+    job['result'] = json.loads(job['result']) if job['result'] else None
+    return job
+
+@traced('db.get_job')
+def get_job(job_id):
+    """Get a job with its decoded result"""
+    conn = get_db()
+    cursor = conn.cursor()
+    
+    cursor.execute('SELECT * FROM jobs WHERE id = ?', (job_id,))
+    row = cursor.fetchone()
+    
+    conn.close()
+    return _job_from_row(row) if row else None
+
+@traced('db.find_job')
+def find_job(kind, session_id, input_hash, stale_before):
+    """Get the newest usable job of a kind that was run on the same inputs.
+    
+    Jobs still queued or running from before ``stale_before`` are ignored,
+    since the process running them may have gone away.
+    """
+    conn = get_db()
+    cursor = conn.cursor()
+    
+    cursor.execute('''
+        SELECT * FROM jobs
+        WHERE kind = ? AND session_id IS ? AND input_hash = ?
+          AND (status = 'done' OR (status != 'failed' AND created_at > ?))
+        ORDER BY id DESC LIMIT 1
+    ''', (kind, session_id, input_hash, stale_before))
+    row = cursor.fetchone()
+    
+    conn.close()
+    return _job_from_row(row) if row else None
@@ -0,0 +1,77 @@
+import re
+from collections import Counter
+from config import Config
+
+# Pause markers a transcription source may leave in the text
+PAUSE_PATTERN = r"\.{3,}|…|\[(?:pause|silence)\]|\((?:pause|silence)\)"
+
+
+class DisfluencyAnalyzer:
+    """Filler words and other disfluencies in a spoken answer.
+
+    The lexicon is compiled into one regular expression, so a transcript is
+    scanned once for fillers, words and pause markers together. Fillers only
+    match whole words ("so" is not counted in "also") and may be phrases
+    ("you know", spread over any whitespace).
+    """
+
+    def __init__(self, fillers=None):
+        self.fillers = fillers if fillers is not None else Config.FILLER_WORDS
+        phrases = sorted({' '.join(filler.lower().split()) for filler in self.fillers if filler.strip()},
+                         key=len, reverse=True)
+        # Longest first, so "you know" wins over a plain "you" filler
+        alternatives = '|'.join(r'\s+'.join(map(re.escape, phrase.split())) for phrase in phrases) or '(?!)'
+        self.pattern = re.compile(
+            rf"(?P<pause>{PAUSE_PATTERN})|(?P<filler>\b(?:{alternatives})\b)|(?P<word>[\w']+)",
+            re.IGNORECASE
+        )
+
+    def analyze(self, transcript, duration=None):
+        """Disfluency metrics for one transcript.
+
+        ``duration`` is the answer length in seconds; the per-minute rates
+        are None without it.
+        """
+        fillers = Counter()
+        words = repeated = pauses = 0
+        previous = None
+
+        for match in self.pattern.finditer(transcript or ''):
+            kind = match.lastgroup
+            if kind == 'word':
+                word = match.group().lower()
+                words += 1
+                if word == previous:
+                    repeated += 1
+                previous = word
+            elif kind == 'filler':
+                phrase = ' '.join(match.group().lower().split())
+                fillers[phrase] += 1
+                words += phrase.count(' ') + 1
+                previous = None
+            else:
+                pauses += 1
+                previous = None
+
+        filler_count = sum(fillers.values())
+        try:
+            minutes = float(duration) / 60 if duration and float(duration) > 0 else None
+        except (TypeError, ValueError):
+            minutes = None
+        return {
+            'filler_count': filler_count,
+            'fillers': dict(fillers.most_common()),
+            'word_count': words,
+            'filler_ratio': round(filler_count / words, 3) if words else 0.0,
+            'fillers_per_minute': round(filler_count / minutes, 1) if minutes else None,
+            'words_per_minute': round(words / minutes, 1) if minutes else None,
+            'repeated_words': repeated,
+            'pause_count': pauses
+        }
+
+    def analyze_many(self, transcripts, durations=None):
+        """analyze() for each transcript, with durations given in the same order"""
+        if durations is None:
+            durations = [None] * len(transcripts)
+        analyze = self.analyze
+        return [analyze(transcript, duration) for transcript, duration in zip(transcripts, durations)]
@@ -0,0 +1,173 @@
+"""Local stand-in for the Gemini generate-content API.
+
+Useful for exercising AsyncLLMClient and AIProcessor without network access:
+
+    python fake_gemini.py --port 8765 --delay 0.5
+    GEMINI_API_BASE=http://127.0.0.1:8765/v1beta GEMINI_API_KEY=test python app.py
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+GENERATE_PATH = re.compile(
+    r'^/v1beta/models/(?P<model>[^/:]+):(?P<action>generateContent|streamGenerateContent)$'
+)
+
+
+def default_responder(prompt):
+    """Return a minimal JSON answer matching the kind of prompt"""
+    if 'Return as a JSON list of questions' in prompt:
+        return json.dumps([{
+            'question_text': 'Tell me about a project you are proud of.',
+            'question_type': 'behavioral',
+            'difficulty': 'easy',
+            'category': 'General',
+            'time_allocated': 120
+        }])
+    return json.dumps({'echo': prompt[:50]})
+
+
+class FakeGeminiServer:
+    """Threaded HTTP server that mimics models/{model}:generateContent.
+
+    streamGenerateContent?alt=sse is supported too; the response text is
+    split into ``chunk_size`` pieces sent ``chunk_delay`` seconds apart.
+    Every request waits ``delay`` seconds; a ``slow_rate`` fraction of them
+    waits ``slow_delay`` more, and an ``error_rate`` fraction fails with 503.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, delay=0.0, error_rate=0.0,
+                 responder=None, chunk_size=16, chunk_delay=0.0, slow_rate=0.0, slow_delay=0.0):
+        self.delay = delay
+        self.slow_rate = slow_rate
+        self.slow_delay = slow_delay
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self.error_rate = error_rate
+        self.responder = responder or default_responder
+        self.requests = []
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1beta"
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                match = GENERATE_PATH.match(self.path.split('?', 1)[0])
+                length = int(self.headers.get('Content-Length', 0))
+                body = json.loads(self.rfile.read(length) or b'{}')
+
+                if not match:
+                    return self._send(404, {'error': {'code': 404, 'message': 'Not found'}})
+                if not self.headers.get('x-goog-api-key'):
+                    return self._send(403, {'error': {'code': 403, 'message': 'API key missing'}})
+
+                prompt = ''.join(
+                    part.get('text', '')
+                    for content in body.get('contents', [])
+                    for part in content.get('parts', [])
+                )
+                with server._lock:
+                    server.requests.append({'model': match.group('model'), 'prompt': prompt})
+
+                if server.delay:
+                    time.sleep(server.delay)
+                if server.slow_rate and random.random() < server.slow_rate:
+                    time.sleep(server.slow_delay)
+                if server.error_rate and random.random() < server.error_rate:
+                    return self._send(503, {'error': {'code': 503, 'message': 'Injected failure'}})
+
+                text = server.responder(prompt)
+                if match.group('action') == 'streamGenerateContent':
+                    return self._stream(text)
+                self._send(200, self._candidate(text))
+
+            @staticmethod
+            def _candidate(text, finish_reason='STOP'):
+                candidate = {'content': {'role': 'model', 'parts': [{'text': text}]}}
+                if finish_reason:
+                    candidate['finishReason'] = finish_reason
+                return {'candidates': [candidate]}
+
+            def _stream(self, text):
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+
+                pieces = [text[i:i + server.chunk_size] for i in range(0, len(text), server.chunk_size)]
+                try:
+                    for index, piece in enumerate(pieces):
+                        if index and server.chunk_delay:
+                            time.sleep(server.chunk_delay)
+                        finish = 'STOP' if index == len(pieces) - 1 else None
+                        event = f"data: {json.dumps(self._candidate(piece, finish))}\r\n\r\n".encode('utf-8')
+                        self.wfile.write(f"{len(event):X}\r\n".encode('ascii') + event + b'\r\n')
+                        self.wfile.flush()
+                    self.wfile.write(b'0\r\n\r\n')
+                except (BrokenPipeError, ConnectionResetError):
+                    # Clients stop reading once they have what they need
+                    self.close_connection = True
+
+            def _send(self, status, payload):
+                data = json.dumps(payload).encode('utf-8')
+                try:
+                    self.send_response(status)
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('Content-Length', str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    # Hedged or cancelled requests hang up without reading
+                    self.close_connection = True
+
+        return Handler
+
+    def start(self):
+        """Serve in a background thread"""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._httpd.serve_forever()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run a local stand-in for the Gemini API')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--delay', type=float, default=0.0, help='seconds to wait per request')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests that fail with 503')
+    parser.add_argument('--slow-rate', type=float, default=0.0, help='fraction of requests that are slow')
+    parser.add_argument('--slow-delay', type=float, default=0.0, help='extra seconds for slow requests')
+    args = parser.parse_args()
+
+    fake = FakeGeminiServer(args.host, args.port, args.delay, args.error_rate,
+                            slow_rate=args.slow_rate, slow_delay=args.slow_delay)
+    print(f"Fake Gemini API listening on {fake.base_url}")
+    try:
+        fake.serve_forever()
+    except KeyboardInterrupt:
+        fake.stop()
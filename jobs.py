@@ -0,0 +1,112 @@
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+from config import Config
+from database import create_job, update_job, update_job_progress, get_job, find_job
+
+# Job run by the current worker thread, for report_progress()
+_current = threading.local()
+PROGRESS_INTERVAL = 0.25  # seconds between progress writes
+POLL_INTERVAL = 0.25  # seconds between checks on a job run by another process
+FINISHED = ('done', 'failed')
+
+
+def report_progress(done, total):
+    """Record how far the job running on this thread has got.
+
+    Writes are throttled, so this can be called for every unit of work.
+    Does nothing outside a JobQueue worker.
+    """
+    job_id = getattr(_current, 'job_id', None)
+    if job_id is None or not total:
+        return
+    now = time.monotonic()
+    if done < total and now - _current.progress_at < PROGRESS_INTERVAL:
+        return
+    _current.progress_at = now
+    update_job_progress(job_id, min(1.0, done / total))
+
+
+def input_hash(*inputs):
+    """Stable hash of a job's JSON-serializable inputs"""
+    data = json.dumps(inputs, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+class JobQueue:
+    """Local worker pool whose jobs are tracked in the SQLite jobs table.
+
+    Jobs are deduplicated on (kind, session, input hash): submitting the same
+    inputs again returns the existing job instead of starting another one.
+    """
+
+    def __init__(self, max_workers=None, timeout=None):
+        self.timeout = timeout or Config.JOB_TIMEOUT
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or Config.JOB_WORKERS,
+            thread_name_prefix='jobs'
+        )
+        self._lock = threading.Lock()
+        self._futures = {}
+
+    def find(self, kind, session_id, inputs_hash):
+        stale_before = datetime.now() - timedelta(seconds=self.timeout)
+        return find_job(kind, session_id, inputs_hash, stale_before)
+
+    def submit(self, kind, session_id, inputs_hash, fn, *args):
+        """Queue fn(*args) unless a job for the same inputs exists; returns the job id"""
+        with self._lock:
+            existing = self.find(kind, session_id, inputs_hash)
+            if existing:
+                return existing['id']
+            job_id = create_job(kind, session_id, inputs_hash)
+
+        future = self.executor.submit(self._run, job_id, fn, args)
+        with self._lock:
+            self._futures[job_id] = future
+        future.add_done_callback(lambda _: self._futures.pop(job_id, None))
+        return job_id
+
+    @staticmethod
+    def _run(job_id, fn, args):
+        update_job(job_id, 'running')
+        _current.job_id, _current.progress_at = job_id, 0
+        try:
+            result = fn(*args)
+        except Exception as e:
+            print(f"Error running job {job_id}: {e}")
+            update_job(job_id, 'failed', error=str(e))
+        else:
+            update_job(job_id, 'done', result=result)
+        finally:
+            _current.job_id = None
+
+    @staticmethod
+    def get(job_id):
+        return get_job(job_id)
+
+    def wait(self, job_id, timeout=None):
+        """Get a job once it has finished, or as it is after ``timeout`` seconds.
+
+        Jobs submitted by another process are polled for in the jobs table.
+        """
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is not None:
+            wait([future], timeout)
+            return get_job(job_id)
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = get_job(job_id)
+            if job is None or job['status'] in FINISHED:
+                return job
+            delay = POLL_INTERVAL
+            if deadline is not None:
+                delay = min(delay, deadline - time.monotonic())
+                if delay <= 0:
+                    return job
+            time.sleep(delay)
@@ -0,0 +1,283 @@
+import json
+import math
+import re
+
+# Characters that change the scanner state outside and inside strings
+_STRUCTURAL = re.compile(r'["{}\[\],]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+_OPENERS = {dict: re.compile(r'\{'), list: re.compile(r'\['), None: re.compile(r'[{\[]')}
+
+NUMBER = (int, float)
+# Strings and numbers models use for booleans
+_BOOLEANS = {'true': True, 'yes': True, '1': True, 'false': False, 'no': False, '0': False}
+
+_decoder = json.JSONDecoder()
+
+
+def _coerce(value, expected):
+    """value converted to the expected type where that is lossless, else unchanged"""
+    types = expected if isinstance(expected, tuple) else (expected,)
+    if bool in types:
+        if isinstance(value, str):
+            return _BOOLEANS.get(value.strip().lower(), value)
+        if isinstance(value, (int, float)) and value in (0, 1):
+            return bool(value)
+    elif isinstance(value, str) and (int in types or float in types):
+        text = value.strip()
+        try:
+            return int(text)
+        except ValueError:
+            pass
+        try:
+            number = float(text)
+        except ValueError:
+            return value
+        return number if math.isfinite(number) else value
+    return value
+
+
+class SchemaError(ValueError):
+    """Raised when extracted JSON does not match the expected shape"""
+
+
+class Schema:
+    """Expected shape of a model response.
+
+    ``required`` and ``optional`` map top-level keys of an object to the
+    accepted Python type(s). Arrays use ``item`` to check each element and
+    ``max_items`` to say how many elements the caller will actually use.
+    Models often quote scalars, so numeric strings ("7") are accepted for
+    number fields and "true"/"yes"/1 style values for bool fields, and are
+    converted to the expected type.
+    """
+
+    def __init__(self, root=dict, required=None, optional=None, item=None, max_items=None):
+        self.root = root
+        self.required = required or {}
+        self.optional = optional or {}
+        self.item = item
+        self.max_items = max_items
+
+    def limit(self, max_items):
+        """Copy of an array schema that is satisfied after max_items elements"""
+        return Schema(self.root, self.required, self.optional, self.item, max_items)
+
+    def check_field(self, key, value):
+        """Return the field's value as the expected type, or raise SchemaError"""
+        expected = self.required.get(key) or self.optional.get(key)
+        if expected and not isinstance(value, expected):
+            value = _coerce(value, expected)
+            if not isinstance(value, expected):
+                raise SchemaError(f"Field '{key}' has unexpected type {type(value).__name__}")
+        return value
+
+    def validate(self, value):
+        """Return value with its fields coerced; raise SchemaError unless it matches the schema"""
+        if not isinstance(value, self.root):
+            raise SchemaError(f"Expected JSON {self.root.__name__}, got {type(value).__name__}")
+        if self.root is dict:
+            missing = [key for key in self.required if key not in value]
+            if missing:
+                raise SchemaError(f"Missing required fields: {', '.join(missing)}")
+            return {key: self.check_field(key, field) for key, field in value.items()}
+        if self.item is not None:
+            return [self.item.validate(element) for element in value]
+        return value
+
+
+class JSONExtractor:
+    """Pull the first balanced JSON object or array out of a growing buffer.
+
+    Text around the value is ignored, and candidates that balance but don't
+    parse, such as ``{this}`` in surrounding prose, are skipped. Top-level
+    object members and array elements are parsed as soon as they close, so
+    callers can use ``fields``/``items`` while the response is still
+    arriving and stop reading once ``feed`` reports the schema is satisfied.
+    Parsed members are dropped from the buffer, so memory stays bounded by
+    the largest single member rather than the whole response. An opener in
+    prose that never closes is searched past by ``result``, so the same
+    text gives the same value as extract_json.
+    """
+
+    def __init__(self, schema=None):
+        self.schema = schema
+        # Only look for the kind of value the schema expects
+        self._opening = _OPENERS[schema.root if schema is not None else None]
+        self.fields = {}
+        self.items = []
+        self.complete = False
+
+        self._root = None
+        self._stack = []
+        self._parts = []
+        self._in_string = False
+        self._escape = False
+
+    @property
+    def ready(self):
+        """True once the caller has everything it needs from the response"""
+        if self.complete:
+            return True
+        if self.schema is None or self._root is None:
+            return False
+        if self.schema.root is list:
+            return self.schema.max_items is not None and len(self.items) >= self.schema.max_items
+        # An open object is ready once every key the caller knows about has arrived
+        declared = set(self.schema.required) | set(self.schema.optional)
+        return bool(declared) and declared <= set(self.fields)
+
+    def feed(self, chunk):
+        """Add response text; returns True when the caller can stop reading"""
+        if not self.complete:
+            self._scan(chunk)
+        return self.ready
+
+    def _scan(self, text):
+        """Advance the scanner over text, which continues the previous chunk"""
+        pos = 0
+        # Start in text of the current (unfinished) member or array element
+        segment = 0
+
+        while not self.complete:
+            if self._in_string:
+                if self._escape:
+                    if pos >= len(text):
+                        break
+                    self._escape = False
+                    pos += 1
+                    continue
+                match = _STRING_SPECIAL.search(text, pos)
+                if match is None:
+                    break
+                if match.group() == '\\':
+                    self._escape = True
+                else:
+                    self._in_string = False
+                pos = match.end()
+                continue
+
+            if self._root is None:
+                match = self._opening.search(text, pos)
+                if match is None:
+                    # Nothing seen so far can start a value any more
+                    return
+                self._root = match.group()
+                self._stack = [self._root]
+                pos = segment = match.end()
+                continue
+
+            match = _STRUCTURAL.search(text, pos)
+            if match is None:
+                break
+            char = match.group()
+            pos = match.end()
+
+            if char == '"':
+                self._in_string = True
+            elif char in '{[':
+                self._stack.append(char)
+            elif char == ',' and len(self._stack) > 1:
+                continue
+            elif char == ',' or len(self._stack) == 1:
+                closes = char != ','
+                if closes and (self._root == '{') != (char == '}'):
+                    text, pos = self._reset(text, segment)
+                    segment = 0
+                    continue
+                piece = ''.join(self._parts) + text[segment:match.start()]
+                self._parts = []
+                if not self._add_member(piece, closes):
+                    # Not JSON after all; rescan from the start of this member
+                    text, pos = self._reset(piece + text[match.start():], 0)
+                    segment = 0
+                    continue
+                segment = pos
+                if closes:
+                    self.complete = True
+            else:
+                opener = self._stack.pop()
+                if (opener == '{') != (char == '}'):
+                    text, pos = self._reset(text, segment)
+                    segment = 0
+
+        if self._root is not None and not self.complete:
+            self._parts.append(text[segment:])
+
+    def _reset(self, text, segment):
+        """Abandon the current candidate; return (text, pos) to keep scanning from.
+
+        Scanning resumes just after the opening bracket. Members that already
+        parsed have been dropped from the buffer, so they are re-encoded.
+        """
+        rest = self._members() + ''.join(self._parts) + text[segment:]
+        self._root = None
+        self._stack = []
+        self._parts = []
+        self._in_string = False
+        self._escape = False
+        self.fields = {}
+        self.items = []
+        return rest, 0
+
+    def _add_member(self, piece, closes):
+        """Parse one top-level member or array element; False if it isn't JSON"""
+        if not piece.strip():
+            # Only an empty value may close straight after its opener
+            return closes and not self.fields and not self.items
+        try:
+            if self._root == '{':
+                member = json.loads('{' + piece + '}')
+                for key, value in member.items():
+                    if self.schema is not None:
+                        value = self.schema.check_field(key, value)
+                    self.fields[key] = value
+            else:
+                self.items.append(json.loads(piece))
+        except SchemaError:
+            raise
+        except ValueError:
+            return False
+        return True
+
+    def _members(self):
+        """JSON text of the members parsed so far, each followed by a comma"""
+        if self._root == '{':
+            members = [json.dumps(key) + ':' + json.dumps(value) for key, value in self.fields.items()]
+        else:
+            members = [json.dumps(item) for item in self.items]
+        return ''.join(member + ',' for member in members)
+
+    def result(self):
+        """Return the extracted (and validated) value.
+
+        A truncated value that already satisfies the schema is returned as
+        the members parsed so far. Raises ValueError if no usable JSON value
+        has been found.
+        """
+        if not self.ready:
+            if self._root is not None:
+                # An opener in prose that never closed, as in '{oops {"a": 1}',
+                # hides the value after it, so search what was read like
+                # extract_json would
+                return extract_json(self._root + self._members() + ''.join(self._parts), self.schema)
+            raise ValueError("No JSON value in model response")
+        value = dict(self.fields) if self._root == '{' else list(self.items)
+        if self.schema is not None:
+            value = self.schema.validate(value)
+        return value
+
+
+def extract_json(text, schema=None):
+    """Extract and validate the first JSON object or array in a complete response.
+
+    Uses json's C decoder from each candidate opening bracket, which is both
+    faster than a greedy regex and immune to braces in trailing prose.
+    """
+    opening = _OPENERS[schema.root if schema is not None else None]
+    for match in opening.finditer(text):
+        try:
+            value, _ = _decoder.raw_decode(text, match.start())
+        except ValueError:
+            continue
+        return schema.validate(value) if schema is not None else value
+    raise ValueError("No JSON value in model response")
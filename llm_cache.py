@@ -0,0 +1,137 @@
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from config import Config
+
+
+class LLMCache:
+    """Persistent cache of model responses keyed on model name + normalized prompt.
+
+    Entries live in a small SQLite database next to the main one, expire after
+    a per-method TTL and are evicted least-recently-used once the table grows
+    past ``max_entries``. Hit/miss counters are kept per process. The
+    database is created on first use, so constructing a cache is free.
+    """
+
+    def __init__(self, path=None, max_entries=None):
+        self.path = path or Config.LLM_CACHE_DATABASE
+        self.max_entries = max_entries or Config.LLM_CACHE_MAX_ENTRIES
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._ready = False
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        if not self._ready:
+            with self._lock:
+                if not self._ready:
+                    self._init_db(conn)
+                    self._ready = True
+        return conn
+
+    @staticmethod
+    def _init_db(conn):
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                method TEXT,
+                response TEXT,
+                latency REAL,
+                created_at REAL,
+                expires_at REAL,
+                last_accessed REAL,
+                hit_count INTEGER DEFAULT 0
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_llm_cache_lru ON llm_cache (last_accessed)')
+        conn.commit()
+
+    @staticmethod
+    def normalize_prompt(prompt):
+        """Collapse whitespace so indentation changes don't defeat the cache"""
+        return re.sub(r'\s+', ' ', prompt).strip()
+
+    @classmethod
+    def make_key(cls, model, prompt):
+        """Content address for a prompt sent to a model"""
+        digest = hashlib.sha256()
+        digest.update(model.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(cls.normalize_prompt(prompt).encode('utf-8'))
+        return digest.hexdigest()
+
+    def _record(self, method, hit, latency=0.0):
+        with self._lock:
+            stats = self._stats.setdefault(method, {'hits': 0, 'misses': 0, 'saved_seconds': 0.0})
+            if hit:
+                stats['hits'] += 1
+                stats['saved_seconds'] += latency
+            else:
+                stats['misses'] += 1
+
+    def get(self, key, method):
+        """Return the cached response text, or None on a miss"""
+        now = time.time()
+        conn = self._connect()
+        row = conn.execute(
+            'SELECT response, latency FROM llm_cache WHERE key = ? AND expires_at > ?',
+            (key, now)
+        ).fetchone()
+        if row:
+            conn.execute(
+                'UPDATE llm_cache SET last_accessed = ?, hit_count = hit_count + 1 WHERE key = ?',
+                (now, key)
+            )
+            conn.commit()
+        conn.close()
+
+        if row is None:
+            self._record(method, hit=False)
+            return None
+        self._record(method, hit=True, latency=row['latency'] or 0.0)
+        return row['response']
+
+    def set(self, key, method, response, latency, ttl):
+        """Store a response and evict expired or least-recently-used entries"""
+        now = time.time()
+        conn = self._connect()
+        conn.execute('''
+            INSERT OR REPLACE INTO llm_cache
+            (key, method, response, latency, created_at, expires_at, last_accessed)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', (key, method, response, latency, now, now + ttl, now))
+        conn.execute('DELETE FROM llm_cache WHERE expires_at <= ?', (now,))
+        conn.execute('''
+            DELETE FROM llm_cache WHERE key IN (
+                SELECT key FROM llm_cache ORDER BY last_accessed DESC LIMIT -1 OFFSET ?
+            )
+        ''', (self.max_entries,))
+        conn.commit()
+        conn.close()
+
+    def clear(self):
+        conn = self._connect()
+        conn.execute('DELETE FROM llm_cache')
+        conn.commit()
+        conn.close()
+
+    def stats(self):
+        """Per-method hit/miss counts and the latency saved by hits"""
+        with self._lock:
+            methods = {method: dict(stats) for method, stats in self._stats.items()}
+
+        conn = self._connect()
+        entries = conn.execute('SELECT COUNT(*) FROM llm_cache').fetchone()[0]
+        conn.close()
+
+        return {
+            'entries': entries,
+            'max_entries': self.max_entries,
+            'hits': sum(s['hits'] for s in methods.values()),
+            'misses': sum(s['misses'] for s in methods.values()),
+            'saved_seconds': round(sum(s['saved_seconds'] for s in methods.values()), 3),
+            'methods': methods
+        }
@@ -0,0 +1,226 @@
+"""Record model traffic to a cassette file and replay it later.
+
+A cassette is gzipped JSON lines: a header with the model name, then one
+compact record per call holding the prompt hash, the response (or its
+streamed chunks with their arrival offsets) and the measured latency.
+Prompts themselves are not stored.
+
+    LLM_CASSETTE_MODE=record python app.py    # talk to the real backend, save traffic
+    LLM_CASSETTE_MODE=replay python app.py    # serve the saved responses, no network
+"""
+import asyncio
+import gzip
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from config import Config
+from llm_cache import LLMCache
+from llm_client import LLMBackend, LLMError
+
+CASSETTE_VERSION = 2
+# Before version 2, streams the caller closed early were recorded truncated
+COMPLETE_STREAMS_SINCE = 2
+
+
+class CassetteMiss(LLMError):
+    """Raised in replay mode for a prompt that was never recorded"""
+
+    def __init__(self, message):
+        super().__init__(message, status=404)
+
+
+class Cassette:
+    """The records in one cassette file, keyed by prompt hash.
+
+    A prompt recorded several times is replayed in recorded order, wrapping
+    around once every recording has been served. Each recording session
+    starts with a header line, and stream records under an older header
+    than COMPLETE_STREAMS_SINCE are skipped, since they may be truncated.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.model = None
+        self._records = defaultdict(list)
+        self._positions = defaultdict(int)
+        self._file = None
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            self._load()
+
+    def _load(self):
+        version = None
+        with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                record = json.loads(line)
+                if 'v' in record:
+                    version = record['v']
+                    self.model = self.model or record.get('model')
+                elif 'c' not in record or (version or 0) >= COMPLETE_STREAMS_SINCE:
+                    self._records[record['k']].append(record)
+
+    def __len__(self):
+        return sum(len(records) for records in self._records.values())
+
+    def count(self, key):
+        """How many records a prompt hash has"""
+        with self._lock:
+            return len(self._records.get(key, ()))
+
+    def next(self, key):
+        """The next recorded response for a prompt hash, or None"""
+        with self._lock:
+            records = self._records.get(key)
+            if not records:
+                return None
+            position = self._positions[key]
+            self._positions[key] = position + 1
+            return records[position % len(records)]
+
+    def append(self, record, model, seen=None):
+        """Add a record to memory and to the end of the file.
+
+        ``seen`` is the count() of the record's key when its call started.
+        If a record for the key has been added since, a concurrent duplicate
+        (such as a hedged call) got there first, so this one is dropped.
+        Returns whether the record was added.
+        """
+        line = json.dumps(record, separators=(',', ':'), ensure_ascii=False)
+        with self._lock:
+            if seen is not None and len(self._records.get(record['k'], ())) > seen:
+                return False
+            if self._file is None:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                self.model = self.model or model
+                self._file = gzip.open(self.path, 'at', encoding='utf-8')
+                header = {'v': CASSETTE_VERSION, 'model': model, 'created': time.time()}
+                self._file.write(json.dumps(header, separators=(',', ':')) + '\n')
+            self._file.write(line + '\n')
+            self._file.flush()
+            self._records[record['k']].append(record)
+            return True
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class CassetteBackend(LLMBackend):
+    """Backend that records another backend's traffic, or replays a cassette.
+
+    In replay mode responses are served with their recorded latency (and
+    chunk timing, for streams) when ``realtime`` is on, or immediately when
+    it is off. Calls that fail or are cancelled are not recorded. A stream
+    the caller closes early, such as once the JSON it wanted has arrived,
+    is read to its end in the background and recorded whole, so replay
+    never serves a truncated response. Of concurrent calls for the same
+    prompt only the first to finish is recorded.
+    """
+
+    name = 'cassette'
+
+    def __init__(self, mode, inner=None, path=None, realtime=None):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        if mode == 'record' and inner is None:
+            raise ValueError("Recording needs a backend to record from")
+
+        self.mode = mode
+        self.inner = inner
+        self.cassette = Cassette(path or Config.LLM_CASSETTE_PATH)
+        self.realtime = Config.LLM_CASSETTE_REALTIME if realtime is None else realtime
+        self._pending = set()  # streams still being read to the end for recording
+        model = inner.model if inner is not None else self.cassette.model
+        super().__init__(model or Config.GEMINI_MODEL, inner.timeout if inner is not None else None)
+
+    def _key(self, prompt):
+        return LLMCache.make_key(self.model, prompt)
+
+    def _replay_record(self, prompt):
+        record = self.cassette.next(self._key(prompt))
+        if record is None:
+            raise CassetteMiss("Prompt not found in cassette")
+        return record
+
+    async def generate_async(self, prompt):
+        if self.mode == 'replay':
+            record = self._replay_record(prompt)
+            if self.realtime:
+                await asyncio.sleep(record['l'])
+            return record['t'] if 't' in record else ''.join(piece for _, piece in record['c'])
+
+        key = self._key(prompt)
+        seen = self.cassette.count(key)
+        start = time.perf_counter()
+        text = await self.inner.generate_async(prompt)
+        self.cassette.append({
+            'k': key,
+            'l': round(time.perf_counter() - start, 4),
+            't': text
+        }, self.model, seen)
+        return text
+
+    async def stream_async(self, prompt):
+        if self.mode == 'replay':
+            record = self._replay_record(prompt)
+            chunks = record.get('c') or [[record['l'], record['t']]]
+            previous = 0.0
+            for offset, piece in chunks:
+                if self.realtime and offset > previous:
+                    await asyncio.sleep(offset - previous)
+                previous = offset
+                yield piece
+            return
+
+        key = self._key(prompt)
+        seen = self.cassette.count(key)
+        start = time.perf_counter()
+        chunks = []
+        stream = self.inner.stream_async(prompt)
+        reading_on = False
+        try:
+            async for piece in stream:
+                chunks.append([round(time.perf_counter() - start, 4), piece])
+                yield piece
+        except GeneratorExit:
+            # The caller has what it needs; read the rest of the response in
+            # the background so the whole of it is recorded
+            reading_on = True
+            task = asyncio.get_running_loop().create_task(self._record_rest(stream, key, seen, start, chunks))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+            raise
+        finally:
+            if not reading_on:
+                await stream.aclose()
+        self._record_stream(key, seen, start, chunks)
+
+    async def _record_rest(self, stream, key, seen, start, chunks):
+        """Finish reading a stream its caller closed, and record it if it ends normally"""
+        try:
+            async for piece in stream:
+                chunks.append([round(time.perf_counter() - start, 4), piece])
+        except Exception as e:
+            print(f"Error reading the rest of a recorded stream: {e}")
+            return
+        finally:
+            await stream.aclose()
+        self._record_stream(key, seen, start, chunks)
+
+    def _record_stream(self, key, seen, start, chunks):
+        self.cassette.append({
+            'k': key,
+            'l': round(time.perf_counter() - start, 4),
+            'c': chunks
+        }, self.model, seen)
+
+    async def aclose(self):
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        if self.inner is not None:
+            await self.inner.aclose()
+        self.cassette.close()
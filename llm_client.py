@@ -0,0 +1,251 @@
+import asyncio
+import json
+import queue
+import threading
+import time
+from config import Config
+
+
+class LLMError(Exception):
+    """Raised when the model API returns an error or an unusable response"""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+class LLMBackend:
+    """Interface the AI processor uses to talk to a language model.
+
+    Subclasses implement ``generate_async`` and ``stream_async``. This base
+    runs them on a dedicated event loop thread, which synchronous callers
+    such as Flask request handlers reach through ``submit_coroutine`` and
+    the blocking ``stream`` iterator.
+    """
+
+    name = None
+
+    def __init__(self, model, timeout=None):
+        self.model = model
+        self.timeout = timeout or Config.LLM_TIMEOUT
+
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self):
+        """Start the background event loop on first use"""
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name='llm-client-loop',
+                    daemon=True
+                )
+                self._thread.start()
+        return self._loop
+
+    async def generate_async(self, prompt):
+        """Send a prompt and return the response text"""
+        raise NotImplementedError
+
+    async def stream_async(self, prompt):
+        """Send a prompt and yield response text chunks as they arrive"""
+        raise NotImplementedError
+
+    async def aclose(self):
+        """Release resources held on the client loop"""
+
+    def submit_coroutine(self, coro):
+        """Schedule a coroutine on the client loop and return a concurrent future.
+
+        Cancelling the future cancels the coroutine, aborting its request.
+        """
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(coro, loop)
+
+    def stream(self, prompt, deadline=None):
+        """Blocking iterator over response text chunks for callers outside the loop.
+
+        Raises LLMError if no chunk arrives for ``timeout`` seconds, or if
+        the whole response takes longer than ``deadline`` seconds.
+        """
+        loop = self._ensure_loop()
+        give_up = None if deadline is None else time.monotonic() + deadline
+        chunks = queue.Queue()
+        finished = object()
+
+        async def pump():
+            try:
+                async for chunk in self.stream_async(prompt):
+                    chunks.put(chunk)
+            except Exception as e:
+                chunks.put(e)
+            finally:
+                chunks.put(finished)
+
+        future = asyncio.run_coroutine_threadsafe(pump(), loop)
+        try:
+            while True:
+                wait_for = self.timeout
+                if give_up is not None:
+                    wait_for = min(wait_for, give_up - time.monotonic())
+                try:
+                    item = chunks.get(timeout=max(0, wait_for))
+                except queue.Empty:
+                    if give_up is not None and time.monotonic() >= give_up:
+                        raise LLMError(f"Model stream exceeded its {deadline:.1f}s deadline")
+                    raise LLMError(f"Model stream sent nothing for {self.timeout}s")
+                if item is finished:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # Stops the upstream request if the consumer goes away early
+            future.cancel()
+
+    def close(self):
+        """Release backend resources and stop the loop thread"""
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.aclose(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._loop.close()
+        self._loop = None
+
+
+class AsyncLLMClient(LLMBackend):
+    """Async client for the Gemini generate-content API.
+
+    All requests share one aiohttp session (and so one keep-alive connection
+    pool) on the backend's event loop thread, so many interviews can have
+    calls in flight without each holding its own socket.
+    """
+
+    name = 'gemini'
+
+    def __init__(self, api_key, model, base_url=None, max_concurrency=None,
+                 pool_size=None, timeout=None):
+        super().__init__(model, timeout)
+        self.api_key = api_key
+        self.base_url = (base_url or Config.GEMINI_API_BASE).rstrip('/')
+        self.max_concurrency = max_concurrency or Config.LLM_MAX_CONCURRENCY
+        self.pool_size = pool_size or Config.LLM_POOL_SIZE
+
+        self._session = None
+        self._semaphore = None
+
+    @property
+    def endpoint(self):
+        return f"{self.base_url}/models/{self.model}:generateContent"
+
+    @property
+    def stream_endpoint(self):
+        return f"{self.base_url}/models/{self.model}:streamGenerateContent?alt=sse"
+
+    async def _get_session(self):
+        """Create the pooled HTTP session lazily on the client loop"""
+        if self._session is None or self._session.closed:
+            import aiohttp  # slow to import, so only loaded once Gemini is called
+            connector = aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={'x-goog-api-key': self.api_key}
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    async def generate_async(self, prompt):
+        """Send a prompt and return the response text"""
+        session = await self._get_session()
+
+        async with self._semaphore:
+            async with session.post(self.endpoint, json=self._payload(prompt)) as response:
+                if response.status != 200:
+                    body = await response.text()
+                    raise LLMError(f"Model API returned {response.status}: {body[:200]}",
+                                   status=response.status)
+                data = await response.json()
+
+        return self._response_text(data)
+
+    async def stream_async(self, prompt):
+        """Send a prompt and yield response text chunks as they arrive (SSE)"""
+        session = await self._get_session()
+
+        async with self._semaphore:
+            async with session.post(self.stream_endpoint, json=self._payload(prompt)) as response:
+                if response.status != 200:
+                    body = await response.text()
+                    raise LLMError(f"Model API returned {response.status}: {body[:200]}",
+                                   status=response.status)
+                async for line in response.content:
+                    line = line.strip()
+                    if not line.startswith(b'data:'):
+                        continue
+                    text = self._response_text(json.loads(line[5:]))
+                    if text:
+                        yield text
+
+    @staticmethod
+    def _payload(prompt):
+        return {'contents': [{'role': 'user', 'parts': [{'text': prompt}]}]}
+
+    @staticmethod
+    def _response_text(data):
+        """Join the text parts of the first candidate"""
+        try:
+            parts = data['candidates'][0]['content']['parts']
+        except (KeyError, IndexError, TypeError):
+            raise LLMError("Model API response has no candidates")
+        return ''.join(part.get('text', '') for part in parts)
+
+    async def aclose(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+def check_backend_config(name=None):
+    """Raise ValueError if the configured backend can't be built.
+
+    Cheap and offline, so the app can fail at startup while the backend
+    itself is only built on first use.
+    """
+    if Config.LLM_CASSETTE_MODE == 'replay':
+        return
+    name = name or Config.LLM_BACKEND
+    if name not in ('gemini', 'stub'):
+        raise ValueError(f"Unknown LLM backend: {name}")
+    if name == 'gemini' and not Config.GEMINI_API_KEY:
+        raise ValueError("GEMINI_API_KEY not set in environment variables")
+
+
+def create_backend(name=None):
+    """Build the LLM backend selected by Config.LLM_BACKEND.
+
+    With Config.LLM_CASSETTE_MODE set to 'record' the backend's traffic is
+    saved to a cassette; with 'replay' the cassette is served instead and no
+    backend (or API key) is needed.
+    """
+    mode = Config.LLM_CASSETTE_MODE
+    if mode == 'replay':
+        from llm_cassette import CassetteBackend
+        return CassetteBackend('replay')
+
+    name = name or Config.LLM_BACKEND
+    check_backend_config(name)
+    if name == 'gemini':
+        backend = AsyncLLMClient(Config.GEMINI_API_KEY, Config.GEMINI_MODEL)
+    else:
+        from llm_stub import StubBackend
+        backend = StubBackend()
+
+    if mode == 'record':
+        from llm_cassette import CassetteBackend
+        return CassetteBackend('record', inner=backend)
+    return backend
@@ -0,0 +1,157 @@
+import asyncio
+import hashlib
+import json
+import random
+import re
+from config import Config
+from llm_client import LLMBackend
+
+QUESTION_TYPES = ('technical', 'behavioral', 'situational', 'advanced')
+
+
+def _rng(prompt):
+    """Random generator seeded by the prompt, so responses are repeatable"""
+    return random.Random(hashlib.sha256(prompt.encode('utf-8')).digest())
+
+
+def _resume(rng, prompt):
+    return {
+        'name': 'Stub Candidate',
+        'skills': rng.sample(['Python', 'Flask', 'SQL', 'Docker', 'AWS', 'React', 'Git', 'Linux'], 4),
+        'experience_years': float(rng.randint(0, 8)),
+        'education': ['B.Tech in Computer Science'],
+        'projects': ['Interview platform', 'Inventory tracker'],
+        'certifications': []
+    }
+
+
+def _questions(rng, prompt):
+    match = re.search(r'Generate (\d+) interview questions for an? (.+?) level (.+?) position', prompt)
+    count, level, domain = (int(match.group(1)), match.group(2), match.group(3)) if match else (8, 'Mid', 'Software')
+    return [{
+        'question_text': f"Question {i + 1} ({domain}, {level}): walk me through problem {rng.randint(100, 999)}.",
+        'question_type': QUESTION_TYPES[i % len(QUESTION_TYPES)],
+        'difficulty': rng.choice(['easy', 'medium', 'hard']),
+        'category': domain,
+        'time_allocated': rng.choice([90, 120, 180])
+    } for i in range(count)]
+
+
+def _analysis(rng, prompt):
+    needs_cross_question = rng.random() < 0.2
+    return {
+        'grammar_score': rng.randint(5, 9),
+        'relevance_score': rng.randint(4, 9),
+        'star_score': rng.randint(3, 9),
+        'detailed_feedback': 'The answer covers the main point; add a concrete example and its result.',
+        'suggested_better_answer': 'In my last project I was asked to speed up a slow report. '
+                                   'I profiled it, cached the expensive query, and cut load time by half.',
+        'confidence_indicator': rng.choice(['low', 'medium', 'high']),
+        'needs_cross_question': needs_cross_question,
+        'cross_question': 'Can you walk me through a specific example?' if needs_cross_question else ''
+    }
+
+
+def _narrative(rng, prompt):
+    analysis = _analysis(rng, prompt)
+    return {key: analysis[key] for key in
+            ('detailed_feedback', 'suggested_better_answer', 'needs_cross_question', 'cross_question')}
+
+
+def _code_evaluation(rng, prompt):
+    return {
+        'logic_score': rng.randint(4, 9),
+        'efficiency_score': rng.randint(4, 9),
+        'clarity_score': rng.randint(4, 9),
+        'test_cases_passed': rng.randint(2, 5),
+        'total_test_cases': 5,
+        'detailed_feedback': 'Correct for the common case; handle empty input.',
+        'suggested_improvements': 'Add input validation and a docstring.',
+        'time_complexity': 'O(n)',
+        'space_complexity': 'O(1)'
+    }
+
+
+def _problem(rng, prompt):
+    return {
+        'problem_statement': 'Given a list of integers, return the length of the longest run of equal values.',
+        'example_input': '[1, 2, 2, 2, 3, 3]',
+        'example_output': '3',
+        'constraints': '0 <= len(nums) <= 10^5',
+        'hints': ['Track the current run length as you iterate.']
+    }
+
+
+def _report(rng, prompt):
+    overall = rng.randint(45, 90)
+    return {
+        'overall_score': overall,
+        'strengths': ['Clear communication', 'Solid fundamentals', 'Structured answers'],
+        'weaknesses': ['Few concrete metrics', 'Limited system design depth', 'Short answers'],
+        'communication_score': rng.randint(5, 9),
+        'technical_score': rng.randint(5, 9),
+        'confidence_score': rng.randint(5, 9),
+        'improvement_plan': ['Practice STAR answers', 'Quantify results', 'Review system design',
+                             'Do timed coding drills', 'Prepare project deep dives'],
+        'final_verdict': 'Strong Candidate' if overall >= 75 else 'Needs Improvement',
+        'detailed_analysis': 'The candidate answered consistently and solved the coding task.'
+    }
+
+
+# (marker in the prompt, response builder); the first match wins
+RESPONSES = (
+    ('from this resume text', _resume),
+    ('JSON list of questions', _questions),
+    ('Analyze this interview answer', _analysis),
+    ('Write feedback on this interview answer', _narrative),
+    ('Evaluate this coding solution', _code_evaluation),
+    ('coding problem for', _problem),
+    ('interview performance report', _report),
+)
+
+
+def respond(prompt):
+    """Deterministic, schema-valid response text for an AIProcessor prompt"""
+    rng = _rng(prompt)
+    for marker, build in RESPONSES:
+        if marker in prompt:
+            return json.dumps(build(rng, prompt))
+    if 'follow-up question' in prompt:
+        return 'Can you give a specific example, and what was the measurable outcome?'
+    return 'OK'
+
+
+class StubBackend(LLMBackend):
+    """Offline backend that answers every prompt type without the network.
+
+    Responses are repeatable for a given prompt. Each call takes
+    Config.LLM_STUB_LATENCY seconds, varied by up to LLM_STUB_JITTER of that
+    (also seeded by the prompt); streamed responses send the first chunk
+    after a third of it and spread the rest over the remainder.
+    """
+
+    name = 'stub'
+
+    def __init__(self, latency=None, jitter=None, chunk_size=None, timeout=None):
+        super().__init__('stub', timeout)
+        self.latency = Config.LLM_STUB_LATENCY if latency is None else latency
+        self.jitter = Config.LLM_STUB_JITTER if jitter is None else jitter
+        self.chunk_size = chunk_size or Config.LLM_STUB_CHUNK_SIZE
+
+    def _delay(self, prompt):
+        spread = self.latency * self.jitter
+        return max(0.0, self.latency + _rng(prompt).uniform(-spread, spread))
+
+    async def generate_async(self, prompt):
+        await asyncio.sleep(self._delay(prompt))
+        return respond(prompt)
+
+    async def stream_async(self, prompt):
+        text = respond(prompt)
+        pieces = [text[i:i + self.chunk_size] for i in range(0, len(text), self.chunk_size)]
+        delay = self._delay(prompt)
+        await asyncio.sleep(delay / 3)
+        for index, piece in enumerate(pieces):
+            if index:
+                await asyncio.sleep(delay * 2 / 3 / (len(pieces) - 1))
+            yield piece
@@ -0,0 +1,146 @@
+import re
+
+STOPWORDS = frozenset("""
+a about above after again all also am an and any are as at be because been before being below
+between both but by can could did do does doing down during each few for from further had has
+have having he her here hers him his how i if in into is it its itself just me more most my no
+nor not now of off on once only or other our out over own same she should so some such than that
+the their them then there these they this those through to too under until up very was we were
+what when where which while who whom why will with would you your yours tell describe explain
+give example time walk through talk share please
+""".split())
+
+WORD = re.compile(r"[a-z0-9']+")
+SENTENCE_END = re.compile(r"[.!?]+(?:\s+|$)")
+METRIC = re.compile(r"\d+(?:\.\d+)?\s*(?:%|percent|x\b|times|ms|seconds|minutes|hours|days|weeks|months)|\$\s?\d")
+
+# Phrases that signal each part of a STAR answer
+STAR_CUES = {
+    'situation': re.compile(
+        r"\b(?:when i was|at my (?:previous|last|current|first)|in my (?:previous|last|current|first) "
+        r"(?:role|job|team|company|project|internship)|the situation|we were facing|there was a|"
+        r"our (?:team|company|client) (?:was|had)|during (?:my|a|the|our))\b"),
+    'task': re.compile(
+        r"\b(?:i was (?:responsible|asked|tasked|assigned)|my (?:task|goal|role|job|responsibility) was|"
+        r"(?:i|we) needed to|(?:i|we) had to|the (?:goal|challenge|problem|requirement) was|in charge of)\b"),
+    'action': re.compile(
+        r"\b(?:i|we) (?:then |first |quickly )?(?:built|created|designed|implemented|led|wrote|decided|"
+        r"introduced|set up|organized|analy[sz]ed|refactored|migrated|developed|proposed|automated|"
+        r"reached out|worked with|talked to|started|investigated|added|tested|fixed|profiled|rewrote)\b"),
+    'result': re.compile(
+        r"\b(?:as a result|resulted in|which (?:led|reduced|increased|improved|saved|cut)|in the end|"
+        r"ultimately|the outcome|(?:we|i|this|it) (?:reduced|increased|improved|saved|delivered|shipped|"
+        r"cut|achieved)|(?:reduced|increased|improved|cut|saved|grew) (?:\w+ ){0,4}by)\b"),
+}
+
+STAR_TIPS = {
+    'situation': "Open with the situation: where you were and what was going on.",
+    'task': "Say what you specifically were responsible for.",
+    'action': "Walk through the actions you personally took, in order.",
+    'result': "Finish with the outcome of your actions.",
+}
+
+
+def _stem(word):
+    """Crude suffix stripping so "scaling" matches "scale" and "services" matches "service" """
+    for suffix in ('ing', 'ed', 'es', 's', 'ly'):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)].rstrip('e')
+    return word.rstrip('e') if len(word) > 3 else word
+
+
+def content_terms(text):
+    """Stems of the meaningful words in a text, mapped to the first word seen"""
+    terms = {}
+    for word in WORD.findall(text.lower()):
+        if len(word) > 2 and word not in STOPWORDS:
+            terms.setdefault(_stem(word), word)
+    return terms
+
+
+def _clamp(score):
+    return int(round(min(10, max(0, score))))
+
+
+class LocalScorer:
+    """Grammar, relevance and STAR scores (0-10) computed in-process.
+
+    Uses lexical overlap with the question, STAR cue phrases and numbers,
+    and sentence statistics, so an answer is scored in about a millisecond.
+    Also returns short feedback built from the same features, used when
+    the model isn't asked for (or fails to give) narrative feedback.
+    """
+
+    def score(self, question, answer, speech=None):
+        """Scores and feature details for an answer.
+
+        ``speech`` is the DisfluencyAnalyzer result for the spoken answer,
+        used to penalize grammar for fillers and repeated words.
+        """
+        answer = answer or ''
+        words = WORD.findall(answer.lower())
+        if not words:
+            return {
+                'grammar_score': 0, 'relevance_score': 0, 'star_score': 0,
+                'feedback': "No answer was given.", 'star': dict.fromkeys(STAR_CUES, False),
+                'question_coverage': 0.0, 'word_count': 0
+            }
+
+        lowered = answer.lower()
+        star = {part: bool(cue.search(lowered)) for part, cue in STAR_CUES.items()}
+        has_metric = bool(METRIC.search(lowered))
+
+        question_terms = content_terms(question or '')
+        answer_terms = content_terms(answer)
+        covered = question_terms.keys() & answer_terms.keys()
+        coverage = len(covered) / len(question_terms) if question_terms else 0.5
+
+        tips = []
+        missing_terms = [word for stem, word in question_terms.items() if stem not in covered]
+        if coverage < 0.3 and missing_terms:
+            tips.append(f"Address the question more directly (it asks about {', '.join(missing_terms[:3])}).")
+        tips.extend(STAR_TIPS[part] for part, found in star.items() if not found)
+        if star['result'] and not has_metric:
+            tips.append("Quantify the result with a number, such as time saved or a percentage.")
+        if len(words) < 30:
+            tips.append("Expand your answer with a concrete example.")
+        if speech and speech.get('filler_count', 0) >= 5:
+            tips.append("Cut down on filler words; a short pause reads better than \"um\".")
+
+        return {
+            'grammar_score': self._grammar(answer, words, speech),
+            'relevance_score': _clamp(10 * (0.2 + 0.5 * min(1, coverage * 1.5) + 0.3 * min(1, len(words) / 60))),
+            'star_score': _clamp(sum(star.values()) * 2.25 + (1 if has_metric else 0)),
+            'feedback': ' '.join(tips[:3]) or "Well-structured answer that addresses the question with a clear outcome.",
+            'star': star,
+            'question_coverage': round(coverage, 2),
+            'word_count': len(words)
+        }
+
+    @staticmethod
+    def _grammar(answer, words, speech):
+        score = 10.0
+        # Spoken transcripts usually have no punctuation or capitals, so
+        # sentence checks only apply to text that has them
+        sentences = [s for s in SENTENCE_END.split(answer.strip()) if s.strip()]
+        if len(sentences) > 1 or SENTENCE_END.search(answer):
+            lengths = [len(WORD.findall(sentence.lower())) for sentence in sentences]
+            average = sum(lengths) / len(lengths)
+            if average > 30:
+                score -= min(3, (average - 30) / 10 + 1)
+            elif average < 4:
+                score -= 2
+            if any(c.isupper() for c in answer):
+                uncapitalized = sum(1 for s in sentences if s.strip()[0].islower())
+                score -= 2 * uncapitalized / len(sentences)
+                if re.search(r"(?:^|\s)i(?:\s|'|$)", answer):
+                    score -= 1
+        elif len(words) > 40:
+            score -= 1  # one long run-on
+
+        repeated = speech.get('repeated_words', 0) if speech else sum(
+            1 for previous, word in zip(words, words[1:]) if previous == word)
+        score -= min(2, repeated * 0.5)
+        if speech:
+            score -= min(2, speech.get('filler_ratio', 0) * 10)
+        return _clamp(score)
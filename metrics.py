@@ -0,0 +1,210 @@
+import bisect
+import functools
+import os
+import threading
+import time
+
+# Seconds; covers fast SQLite writes up to slow model calls
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+# Bytes; session payloads grow with every stored answer
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+# Pages; resumes are short, but uploads are capped at DOCUMENT_MAX_PAGES
+PAGE_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+# Estimated tokens; prompts are budgeted by Config.PROMPT_BUDGETS
+TOKEN_BUCKETS = (250, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Metric:
+    """Base for a named metric with a fixed set of label names.
+
+    Values are kept per label combination behind one lock, so updates from
+    concurrent request threads are safe and cost a dict lookup and a few
+    additions.
+    """
+
+    kind = None
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+        REGISTRY.register(self)
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, '')) for name in self.labels)
+
+    def _format_labels(self, key, extra=()):
+        pairs = list(zip(self.labels, key)) + list(extra)
+        if not pairs:
+            return ''
+        return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+            lines.extend(self._render_items(items))
+        return '\n'.join(lines)
+
+
+class Counter(Metric):
+    """Monotonically increasing count"""
+
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _render_items(self, items):
+        for key, value in items:
+            yield f"{self.name}{self._format_labels(key)} {value}"
+
+
+class Histogram(Metric):
+    """Distribution of observed values in cumulative buckets"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labels=(), buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        super().__init__(name, documentation, labels)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def time(self, **labels):
+        """Context manager observing the duration of its block"""
+        return _Timer(self, labels)
+
+    def _render_items(self, items):
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket
+                le = '+Inf' if bound == float('inf') else repr(float(bound))
+                yield f"{self.name}_bucket{self._format_labels(key, [('le', le)])} {cumulative}"
+            yield f"{self.name}_sum{self._format_labels(key)} {total}"
+            yield f"{self.name}_count{self._format_labels(key)} {count}"
+
+
+class _Timer:
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            metrics = list(self._metrics)
+        return '\n'.join(metric.render() for metric in metrics) + '\n'
+
+
+REGISTRY = Registry()
+
+
+def timed(histogram, **labels):
+    """Decorator observing how long each call of a function takes"""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with histogram.time(**labels):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+HTTP_REQUEST_SECONDS = Histogram(
+    'http_request_duration_seconds', 'Time to handle a request, up to the response headers',
+    ('route', 'method', 'status'))
+LLM_REQUEST_SECONDS = Histogram(
+    'llm_request_duration_seconds', 'Upstream model call latency by AIProcessor method', ('method',))
+LLM_ERRORS = Counter(
+    'llm_errors_total', 'Failed model calls by AIProcessor method and error type', ('method', 'error'))
+LLM_CACHE_HITS = Counter(
+    'llm_cache_hits_total', 'Model responses served from the response cache', ('method',))
+PROMPT_TOKENS = Histogram(
+    'llm_prompt_tokens', 'Estimated size of built prompts by AIProcessor method', ('method',),
+    buckets=TOKEN_BUCKETS)
+PDF_EXTRACTION_SECONDS = Histogram(
+    'pdf_extraction_duration_seconds', 'Time to extract text from an uploaded PDF')
+DOCX_EXTRACTION_SECONDS = Histogram(
+    'docx_extraction_duration_seconds', 'Time to extract text from an uploaded DOCX file')
+PDF_PAGES = Histogram(
+    'pdf_pages_extracted', 'Pages read from an uploaded PDF before extraction stopped',
+    buckets=PAGE_BUCKETS)
+SANDBOX_QUEUE_SECONDS = Histogram(
+    'sandbox_queue_wait_seconds', 'Time submitted code waits for a free sandbox slot')
+SANDBOX_RUN_SECONDS = Histogram(
+    'sandbox_run_duration_seconds', 'Time to run submitted code in the sandbox')
+SQLITE_WRITE_SECONDS = Histogram(
+    'sqlite_write_duration_seconds', 'SQLite write latency by database.py function', ('operation',))
+SESSION_BYTES = Histogram(
+    'session_store_bytes', 'Size of the session record read from or written to the store',
+    ('operation',), buckets=SIZE_BUCKETS)
+
+
+def instrument_session_store(interface):
+    """Observe session sizes for Flask-Session's filesystem interface.
+
+    Sizes are taken from the stored file, so this costs one stat per read
+    and write. Other session backends are left as they are.
+    """
+    cache = getattr(interface, 'cache', None)
+    if cache is None or not hasattr(cache, '_get_filename'):
+        return
+
+    def observe(store_id, operation):
+        try:
+            SESSION_BYTES.observe(os.path.getsize(cache._get_filename(store_id)), operation=operation)
+        except OSError:
+            pass
+
+    retrieve = interface._retrieve_session_data
+    upsert = interface._upsert_session
+
+    def retrieve_session_data(store_id):
+        data = retrieve(store_id)
+        if data is not None:
+            observe(store_id, 'read')
+        return data
+
+    def upsert_session(session_lifetime, session, store_id):
+        upsert(session_lifetime, session, store_id)
+        observe(store_id, 'write')
+
+    interface._retrieve_session_data = retrieve_session_data
+    interface._upsert_session = upsert_session
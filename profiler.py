@@ -0,0 +1,143 @@
+import cProfile
+import io
+import os
+import pstats
+import random
+import threading
+import time
+import tracemalloc
+import uuid
+from datetime import datetime
+from config import Config
+
+MODES = ('cpu', 'memory')
+
+# cProfile (from Python 3.12) and tracemalloc are process-wide, so only one
+# request is profiled at a time; requests arriving meanwhile run unprofiled.
+_busy = threading.Lock()
+
+
+class RequestProfile:
+    """A CPU profile or allocation diff taken around one request"""
+
+    def __init__(self, mode, name):
+        self.mode = mode
+        self.name = name
+        self.profile_id = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self.start = time.perf_counter()
+        self._started_tracemalloc = False
+        if mode == 'cpu':
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        else:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(Config.PROFILE_TRACEMALLOC_FRAMES)
+                self._started_tracemalloc = True
+            tracemalloc.reset_peak()
+            self._snapshot = tracemalloc.take_snapshot()
+
+    def stop(self):
+        """Finish profiling and write the report; returns its path"""
+        elapsed = time.perf_counter() - self.start
+        header = f"{self.name}\nmode: {self.mode}\nelapsed: {elapsed * 1000:.1f} ms\n\n"
+        os.makedirs(Config.PROFILE_DIR, exist_ok=True)
+
+        if self.mode == 'cpu':
+            self._profiler.disable()
+            # The raw stats can be opened with pstats or snakeviz
+            self._profiler.dump_stats(os.path.join(Config.PROFILE_DIR, self.profile_id + '.prof'))
+            out = io.StringIO()
+            stats = pstats.Stats(self._profiler, stream=out)
+            stats.sort_stats('cumulative').print_stats(Config.PROFILE_TOP)
+            report = header + out.getvalue()
+        else:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+            ignore = (tracemalloc.Filter(False, tracemalloc.__file__),)
+            diff = snapshot.filter_traces(ignore).compare_to(self._snapshot.filter_traces(ignore), 'lineno')
+            lines = [f"traced: {current / 1024:.1f} KiB, peak during request: {peak / 1024:.1f} KiB", '',
+                     f"Top {Config.PROFILE_TOP} allocation sites still alive at the end of the request:"]
+            lines.extend(str(stat) for stat in diff[:Config.PROFILE_TOP])
+            report = header + '\n'.join(lines) + '\n'
+
+        path = os.path.join(Config.PROFILE_DIR, self.profile_id + '.txt')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(report)
+        _prune()
+        return path
+
+
+def start(name, mode=None):
+    """Begin profiling if ``mode`` is requested or the request is sampled.
+
+    Returns a RequestProfile, or None when not profiling or another
+    request is already being profiled.
+    """
+    if not Config.PROFILE_ENABLED:
+        return None
+    if mode not in MODES:
+        if random.random() >= Config.PROFILE_SAMPLE_RATE:
+            return None
+        mode = Config.PROFILE_SAMPLE_MODE
+    if not _busy.acquire(blocking=False):
+        return None
+    try:
+        return RequestProfile(mode, name)
+    except Exception as e:
+        _busy.release()
+        print(f"Error starting profiler: {e}")
+        return None
+
+
+def stop(profile):
+    """Finish a profile returned by start()"""
+    try:
+        return profile.stop()
+    except Exception as e:
+        print(f"Error writing profile: {e}")
+    finally:
+        _busy.release()
+
+
+def _prune():
+    """Keep only the newest Config.PROFILE_KEEP profiles"""
+    ids = sorted({name.rsplit('.', 1)[0] for name in os.listdir(Config.PROFILE_DIR)}, reverse=True)
+    for profile_id in ids[Config.PROFILE_KEEP:]:
+        for ext in ('.txt', '.prof'):
+            try:
+                os.remove(os.path.join(Config.PROFILE_DIR, profile_id + ext))
+            except OSError:
+                pass
+
+
+def list_profiles():
+    """Stored profiles, newest first"""
+    if not os.path.isdir(Config.PROFILE_DIR):
+        return []
+    profiles = []
+    for name in sorted(os.listdir(Config.PROFILE_DIR), reverse=True):
+        if not name.endswith('.txt'):
+            continue
+        profile_id = name[:-4]
+        try:
+            with open(os.path.join(Config.PROFILE_DIR, name), encoding='utf-8') as f:
+                title, mode = f.readline().strip(), f.readline().split(':', 1)[-1].strip()
+        except OSError:
+            continue  # pruned meanwhile
+        profiles.append({
+            'id': profile_id,
+            'request': title,
+            'mode': mode,
+            'has_pstats': os.path.exists(os.path.join(Config.PROFILE_DIR, profile_id + '.prof'))
+        })
+    return profiles
+
+
+def profile_path(profile_id, raw=False):
+    """Path of a stored report (or its raw pstats file), or None"""
+    if not profile_id.replace('-', '').isalnum():
+        return None
+    path = os.path.join(Config.PROFILE_DIR, profile_id + ('.prof' if raw else '.txt'))
+    return path if os.path.exists(path) else None
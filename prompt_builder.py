@@ -0,0 +1,118 @@
+import json
+import math
+import textwrap
+from config import Config
+from metrics import PROMPT_TOKENS
+
+# Rough average for English text with Gemini's tokenizer
+CHARS_PER_TOKEN = 4
+TRUNCATION_MARK = ' [...]'
+
+
+def estimate_tokens(text):
+    """Cheap token estimate, good enough for budgeting"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def truncate_text(text, max_tokens):
+    """Cut text to roughly max_tokens, preferring a word boundary"""
+    text = text or ''
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max(0, max_chars - len(TRUNCATION_MARK))]
+    space = cut.rfind(' ')
+    if space > len(cut) * 0.8:
+        cut = cut[:space]
+    return cut + TRUNCATION_MARK
+
+
+def compact_json(data):
+    """JSON without indentation or padding"""
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False, default=str)
+
+
+def select_fields(record, fields):
+    """Keep only the listed keys that are present and non-empty"""
+    return {key: record[key] for key in fields if record.get(key) not in (None, '', [], {})}
+
+
+def fit_records(records, fields, text_fields, max_tokens):
+    """Compact a list of dicts into JSON within a token budget.
+
+    Only ``fields`` are kept. If the result is too large, the ``text_fields``
+    of every record are shortened evenly; if it still doesn't fit, trailing
+    records are dropped.
+    """
+    records = [select_fields(record, fields) for record in records]
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    text = compact_json(records)
+    if len(text) <= max_chars or not records:
+        return text
+
+    # Share what's left after the fixed fields evenly between the text fields
+    skeleton = [{k: ('' if k in text_fields else v) for k, v in r.items()} for r in records]
+    spare = max_chars - len(compact_json(skeleton))
+    slots = sum(1 for r in records for k in text_fields if k in r) or 1
+    per_field = max(10, spare // slots // CHARS_PER_TOKEN)
+    for record in records:
+        for key in text_fields:
+            if isinstance(record.get(key), str):
+                record[key] = truncate_text(record[key], per_field)
+
+    while len(records) > 1 and len(compact_json(records)) > max_chars:
+        records.pop()
+    return compact_json(records)
+
+
+class PromptBuilder:
+    """Fits the variable parts of one AIProcessor prompt into its token budget.
+
+    Budgets come from Config.PROMPT_BUDGETS[method] and are per field, in
+    estimated tokens. ``build`` strips the source indentation from the
+    template before filling it in (so indentation inside values such as
+    code is kept) and records the final prompt size in PROMPT_TOKENS.
+    """
+
+    def __init__(self, method, budgets=None):
+        self.method = method
+        self.budgets = budgets if budgets is not None else Config.PROMPT_BUDGETS.get(method, {})
+
+    def text(self, name, value):
+        """A free-text field truncated to its budget"""
+        value = '' if value is None else str(value)
+        budget = self.budgets.get(name)
+        return truncate_text(value, budget) if budget else value
+
+    def json(self, name, data, fields=None):
+        """A dict compacted to ``fields`` and truncated to its budget"""
+        if fields is not None:
+            data = select_fields(data or {}, fields)
+        text = compact_json(data)
+        budget = self.budgets.get(name)
+        if budget and estimate_tokens(text) > budget:
+            # Shorten the longest string values until the object fits
+            data = dict(data)
+            for key in sorted(data, key=lambda k: len(compact_json(data[k])), reverse=True):
+                if estimate_tokens(compact_json(data)) <= budget:
+                    break
+                if isinstance(data[key], str):
+                    data[key] = truncate_text(data[key], budget // 2)
+                elif isinstance(data[key], list):
+                    while len(data[key]) > 1 and estimate_tokens(compact_json(data)) > budget:
+                        data[key] = data[key][:-1]
+            text = compact_json(data)
+        return text
+
+    def records(self, name, records, fields, text_fields=()):
+        """A list of dicts compacted to ``fields`` and fitted to the budget"""
+        budget = self.budgets.get(name)
+        if not budget:
+            return compact_json([select_fields(record, fields) for record in records])
+        return fit_records(records, fields, text_fields, budget)
+
+    def build(self, template, **values):
+        """Fill in a str.format template and record the prompt size"""
+        prompt = textwrap.dedent(template).strip().format(**values)
+        PROMPT_TOKENS.observe(estimate_tokens(prompt), method=self.method)
+        return prompt
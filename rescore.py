@@ -0,0 +1,127 @@
+"""Recompute confidence_score for stored answers after the formula changes.
+
+Answers are read from SQLite in id order, one chunk at a time, scored with
+NumPy array arithmetic, and only the rows whose score changed are written
+back, one transaction per chunk.
+
+    python rescore.py                   # rescore every answer
+    python rescore.py --dry-run         # report what would change
+    python rescore.py --chunk-size 50000
+
+Answers saved before sentiment_score was stored have it computed from the
+transcript with TextBlob and saved along the way. That backfill is slower
+than rescoring, but only happens once per answer.
+"""
+import argparse
+import sqlite3
+import time
+import numpy as np
+from config import Config
+from ai_processor import CONFIDENCE_WEIGHTS, FILLER_PENALTY
+from database import init_db
+
+
+def confidence_scores(relevance, star, sentiment, fillers):
+    """Vectorized AIProcessor._confidence_score over arrays of answers"""
+    weights = CONFIDENCE_WEIGHTS
+    scores = (
+        relevance * weights['relevance'] +
+        star * weights['star'] +
+        (1 + sentiment) * 5 * weights['sentiment'] +
+        np.maximum(0, 10 - fillers * FILLER_PENALTY) * weights['fillers']
+    )
+    return np.clip(scores, 0, 10)
+
+
+def _column(rows, index, default):
+    """One column of the chunk as a float array, with NULLs replaced by ``default``"""
+    values = np.array([row[index] for row in rows], dtype=float)  # None becomes nan
+    values[np.isnan(values)] = default
+    return values
+
+
+def _backfill_sentiment(rows):
+    """Sentiment polarity of each transcript, for answers saved without one.
+
+    Empty transcripts are neutral and repeated ones are scored once, so
+    only distinct spoken answers pay for TextBlob.
+    """
+    from textblob import TextBlob
+    polarity = {'': 0.0}
+    backfilled = []
+    for row in rows:
+        transcript = (row[6] or '').strip()
+        if transcript not in polarity:
+            polarity[transcript] = TextBlob(transcript).sentiment.polarity
+        backfilled.append((polarity[transcript], row[0]))
+    return backfilled
+
+
+def rescore(database=None, chunk_size=10000, dry_run=False, backfill=True):
+    """Rescore every answer; returns counts of rows scanned, changed and backfilled"""
+    conn = sqlite3.connect(database or Config.DATABASE)
+    stats = {'scanned': 0, 'changed': 0, 'backfilled': 0}
+    last_id = 0
+    try:
+        while True:
+            # Keyset pagination keeps each read cheap however far in we are.
+            # Transcripts are only fetched for rows that need a sentiment.
+            rows = conn.execute('''
+                SELECT id, relevance_score, star_score, filler_words_count, sentiment_score,
+                       confidence_score, CASE WHEN sentiment_score IS NULL THEN transcript END
+                FROM answers WHERE id > ? ORDER BY id LIMIT ?
+            ''', (last_id, chunk_size)).fetchall()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            stats['scanned'] += len(rows)
+
+            missing = [row for row in rows if row[4] is None]
+            sentiment = _column(rows, 4, 0.0)
+            backfilled = []
+            if missing and backfill:
+                backfilled = _backfill_sentiment(missing)
+                positions = {row[0]: i for i, row in enumerate(rows)}
+                for polarity, answer_id in backfilled:
+                    sentiment[positions[answer_id]] = polarity
+
+            ids = np.array([row[0] for row in rows])
+            old = np.array([row[5] for row in rows], dtype=float)
+            new = confidence_scores(_column(rows, 1, 5), _column(rows, 2, 5), sentiment, _column(rows, 3, 0))
+            changed = np.isnan(old) | (np.abs(new - old) > 1e-9)
+            stats['changed'] += int(changed.sum())
+            stats['backfilled'] += len(backfilled)
+
+            if dry_run:
+                continue
+            with conn:
+                conn.executemany('UPDATE answers SET confidence_score = ? WHERE id = ?',
+                                 zip(new[changed].tolist(), ids[changed].tolist()))
+                conn.executemany('UPDATE answers SET sentiment_score = ? WHERE id = ?', backfilled)
+    finally:
+        conn.close()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Recompute confidence scores of stored answers')
+    parser.add_argument('--database', default=Config.DATABASE)
+    parser.add_argument('--chunk-size', type=int, default=10000, help='answers read and written per transaction')
+    parser.add_argument('--dry-run', action='store_true', help='count changes without writing them')
+    parser.add_argument('--no-backfill', action='store_true',
+                        help='treat a missing sentiment as neutral instead of computing it')
+    args = parser.parse_args()
+
+    Config.DATABASE = args.database
+    init_db()  # adds sentiment_score to databases created before it existed
+
+    start = time.perf_counter()
+    stats = rescore(args.database, args.chunk_size, args.dry_run, not args.no_backfill)
+    elapsed = time.perf_counter() - start
+    action = 'would change' if args.dry_run else 'changed'
+    print(f"Scanned {stats['scanned']} answers in {elapsed:.2f}s: {action} {stats['changed']}, "
+          f"backfilled sentiment for {stats['backfilled']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,246 @@
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
+from config import Config
+from llm_client import LLMError
+
+
+class CircuitOpenError(LLMError):
+    """Raised instead of calling the model while the circuit breaker is open"""
+
+
+class LatencyTracker:
+    """Rolling window of recent successful call latencies for one method"""
+
+    def __init__(self, window=None):
+        self._samples = deque(maxlen=window or Config.LLM_LATENCY_WINDOW)
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self):
+        return len(self._samples)
+
+    def percentile(self, p):
+        """Nearest-rank percentile (0-100), or None without samples"""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        rank = max(1, math.ceil(p / 100 * len(samples)))
+        return samples[rank - 1]
+
+
+class CircuitBreaker:
+    """Stop calling the upstream after repeated failures.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls fail immediately for ``reset_timeout`` seconds. Then a single probe
+    call is let through (half-open); its outcome closes or re-opens the circuit.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=None, reset_timeout=None):
+        self.failure_threshold = failure_threshold or Config.LLM_BREAKER_FAILURES
+        self.reset_timeout = reset_timeout or Config.LLM_BREAKER_RESET
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.rejected = 0
+        self._probe_started = None
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """True if a call may go upstream now"""
+        with self._lock:
+            now = time.monotonic()
+            if self.state == self.OPEN and now - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._probe_started = None
+            if self.state == self.CLOSED:
+                return True
+            # A probe that never reported back (e.g. an abandoned stream) expires
+            if self.state == self.HALF_OPEN and (
+                    self._probe_started is None or now - self._probe_started >= self.reset_timeout):
+                self._probe_started = now
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probe_started = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self._probe_started = None
+
+
+class ResilientCaller:
+    """Deadlines, hedging and circuit breaking around model calls.
+
+    Each method gets a deadline derived from its recent latencies (p99 times
+    Config.LLM_DEADLINE_FACTOR, kept between LLM_MIN_DEADLINE and
+    LLM_TIMEOUT) instead of always waiting the full client timeout. If a call
+    is still running past the method's p95, or fails early, one duplicate
+    request is sent and whichever finishes first wins. All methods share one
+    circuit breaker, since they share one upstream.
+
+    Streamed calls can't be hedged, since their chunks are already on the
+    way to the client. They use ``check``, ``deadline`` and ``record`` to
+    share the breaker and latency tracking instead.
+    """
+
+    def __init__(self, breaker=None, hedge=None):
+        self.breaker = breaker or CircuitBreaker()
+        self.hedge = Config.LLM_HEDGE if hedge is None else hedge
+        self._latency = {}
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def _tracker(self, method):
+        with self._lock:
+            if method not in self._latency:
+                self._latency[method] = LatencyTracker()
+                self._counts[method] = {'calls': 0, 'failures': 0, 'timeouts': 0, 'hedged': 0, 'hedge_wins': 0}
+            return self._latency[method]
+
+    def _count(self, method, name):
+        with self._lock:
+            self._counts[method][name] += 1
+
+    def deadline(self, method):
+        """Seconds to wait for a method before giving up"""
+        tracker = self._tracker(method)
+        if len(tracker) < Config.LLM_LATENCY_MIN_SAMPLES:
+            return Config.LLM_TIMEOUT
+        adaptive = tracker.percentile(99) * Config.LLM_DEADLINE_FACTOR
+        return min(Config.LLM_TIMEOUT, max(Config.LLM_MIN_DEADLINE, adaptive))
+
+    def hedge_after(self, method):
+        """Seconds after which a duplicate request is sent, or None"""
+        tracker = self._tracker(method)
+        if not self.hedge or len(tracker) < Config.LLM_LATENCY_MIN_SAMPLES:
+            return None
+        return tracker.percentile(95)
+
+    def check(self):
+        """Raise CircuitOpenError if the upstream should not be called"""
+        if not self.breaker.allow():
+            raise CircuitOpenError("Model API circuit is open; using fallback")
+
+    def call(self, method, submit):
+        """Run a model call with a deadline and optional hedge.
+
+        ``submit`` starts one attempt and returns a concurrent future; it may
+        be called twice. Returns (result, latency in seconds).
+        """
+        self.check()
+        tracker = self._tracker(method)
+        self._count(method, 'calls')
+        deadline = self.deadline(method)
+        hedge_after = self.hedge_after(method)
+
+        start = time.perf_counter()
+        primary = submit()
+        attempts = [primary]
+        spare = self.hedge
+        error = None
+        try:
+            while attempts:
+                elapsed = time.perf_counter() - start
+                if elapsed >= deadline:
+                    break
+                wait_for = deadline - elapsed
+                if spare and hedge_after is not None:
+                    wait_for = min(wait_for, max(0, hedge_after - elapsed))
+
+                done, _ = wait(attempts, timeout=wait_for, return_when=FIRST_COMPLETED)
+                for future in done:
+                    attempts.remove(future)
+                    if future.exception() is None:
+                        latency = time.perf_counter() - start
+                        tracker.record(latency)
+                        self.breaker.record_success()
+                        if future is not primary:
+                            self._count(method, 'hedge_wins')
+                        return future.result(), latency
+                    error = future.exception()
+
+                # Slower than p95, or failed early: send one duplicate request
+                slow = not done and time.perf_counter() - start < deadline
+                if spare and (slow or not attempts) and self._retryable(error):
+                    spare = False
+                    self._count(method, 'hedged')
+                    attempts.append(submit())
+        finally:
+            for future in attempts:
+                future.cancel()
+
+        self._count(method, 'failures')
+        if error is None:
+            self._count(method, 'timeouts')
+            error = LLMError(f"{method} exceeded its {deadline:.1f}s deadline")
+        if isinstance(error, ValueError):
+            # The upstream answered; the response just didn't parse
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+        raise error
+
+    def record(self, method, latency=None, error=None):
+        """Account for a call made outside ``call``, such as a streamed one"""
+        tracker = self._tracker(method)
+        self._count(method, 'calls')
+        if error is None:
+            tracker.record(latency)
+            self.breaker.record_success()
+            return
+        self._count(method, 'failures')
+        if isinstance(error, ValueError):
+            # The upstream answered; the response just didn't parse
+            self.breaker.record_success()
+        elif not isinstance(error, CircuitOpenError):
+            self.breaker.record_failure()
+
+    @staticmethod
+    def _retryable(error):
+        """Parse errors and client errors other than rate limiting fail the same way again"""
+        if isinstance(error, ValueError):
+            return False
+        status = getattr(error, 'status', None)
+        return not (status and 400 <= status < 500 and status != 429)
+
+    def stats(self):
+        with self._lock:
+            methods = {
+                method: dict(
+                    self._counts[method],
+                    samples=len(tracker),
+                    p50=tracker.percentile(50),
+                    p95=tracker.percentile(95),
+                    p99=tracker.percentile(99)
+                )
+                for method, tracker in self._latency.items()
+            }
+        for method in methods:
+            methods[method]['deadline'] = self.deadline(method)
+        return {
+            'circuit': self.breaker.state,
+            'consecutive_failures': self.breaker.failures,
+            'rejected_calls': self.breaker.rejected,
+            'methods': methods
+        }
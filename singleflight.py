@@ -0,0 +1,54 @@
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key.
+
+    The first caller for a key (the leader) runs the function; callers that
+    arrive while it is still running wait for and share its result or
+    exception. Nothing is remembered once the call finishes, so this only
+    deduplicates requests that are truly in flight at the same time.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._leaders = 0
+        self._followers = 0
+
+    def do(self, key, fn):
+        """Run fn() once for all concurrent callers with the same key"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = Future()
+                self._calls[key] = call
+                self._leaders += 1
+                leader = True
+            else:
+                self._followers += 1
+                leader = False
+
+        if not leader:
+            return call.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            call.set_exception(e)
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'upstream_calls': self._leaders,
+                'coalesced_calls': self._followers,
+                'in_flight': len(self._calls)
+            }
@@ -0,0 +1,87 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+
+
+class SpeculativePipeline:
+    """Start interview preparation before the candidate asks for it.
+
+    Resume extraction is kicked off when the upload lands and question
+    generation when the setup form is posted. Futures are kept per
+    speculation id (stored in the user's session) until /start-interview
+    collects them or they expire.
+    """
+
+    def __init__(self, ai_processor, max_workers=None, ttl=None):
+        self.ai_processor = ai_processor
+        self.ttl = ttl or Config.SPECULATIVE_TTL
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or Config.SPECULATIVE_WORKERS,
+            thread_name_prefix='speculative'
+        )
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def new_id():
+        return uuid.uuid4().hex
+
+    def _entry(self, speculation_id):
+        """Get or create the job entry for an id, dropping expired ones"""
+        now = time.time()
+        with self._lock:
+            for key in [k for k, v in self._jobs.items() if now - v['created'] > self.ttl]:
+                del self._jobs[key]
+            return self._jobs.setdefault(speculation_id, {'created': now})
+
+    def start_resume_extraction(self, speculation_id, resume_text):
+        """Extract structured resume data in the background"""
+        entry = self._entry(speculation_id)
+        entry['resume'] = self.executor.submit(self.ai_processor.extract_text_from_resume, resume_text)
+        entry.pop('questions', None)
+
+    def start_question_generation(self, speculation_id, resume_text, job_description,
+                                  domain, experience_level, count):
+        """Generate questions in the background once resume data is available"""
+        entry = self._entry(speculation_id)
+        resume_future = entry.get('resume')
+
+        def generate():
+            if resume_future is not None:
+                resume_data = resume_future.result()
+            else:
+                resume_data = self.ai_processor.extract_text_from_resume(resume_text)
+            return self.ai_processor.generate_questions(
+                resume_data=resume_data,
+                job_description=job_description,
+                domain=domain,
+                experience_level=experience_level,
+                count=count
+            )
+
+        entry['questions_params'] = (domain, experience_level, count)
+        entry['questions'] = self.executor.submit(generate)
+
+    def collect(self, speculation_id, name, params=None):
+        """Return a finished speculative result, or None if it isn't ready.
+
+        ``params`` guards against using questions generated for different
+        setup choices than the ones the interview is starting with.
+        """
+        with self._lock:
+            entry = self._jobs.get(speculation_id)
+        if not entry or name not in entry:
+            return None
+        if params is not None and entry.get(f'{name}_params') != params:
+            return None
+
+        future = entry[name]
+        if not future.done() or future.exception() is not None:
+            return None
+        return future.result()
+
+    def discard(self, speculation_id):
+        with self._lock:
+            self._jobs.pop(speculation_id, None)
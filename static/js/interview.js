@@ -5,6 +5,7 @@ class InterviewManager {
         this.questions = [];
         this.sessionId = document.getElementById('session-id')?.value;
         this.timerInterval = null;
+        this.feedbackJob = null;
         this.timeLeft = 120; // 2 minutes default
         
         this.init();
@@ -127,6 +128,7 @@ class InterviewManager {
         if (this.timerInterval) {
             clearInterval(this.timerInterval);
             this.timerInterval = null;
+        this.feedbackJob = null;
         }
     }
     
@@ -161,22 +163,31 @@ class InterviewManager {
         submitBtn.disabled = true;
         submitBtn.innerHTML = '<i class="fas fa-spinner fa-spin mr-2"></i> Analyzing...';
         
+        const payload = {
+            question_id: questionId,
+            answer_text: answerText,
+            transcript: transcript,
+            duration: duration
+        };
+        
         try {
-            const response = await fetch('/api/analyze-answer', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({
-                    question_id: questionId,
-                    answer_text: answerText,
-                    transcript: transcript,
-                    duration: duration
-                })
-            });
-            
-            const data = await response.json();
-            
-            if (data.status === 'success') {
-                this.displayFeedback(data.analysis, data.next_question_available);
+            if (window.ReadableStream && window.TextDecoder) {
+                await this.streamAnalysis(payload);
+            } else {
+                const response = await fetch('/api/analyze-answer', {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: JSON.stringify(payload)
+                });
+                
+                const data = await response.json();
+                
+                if (data.status === 'success') {
+                    this.displayFeedback(data.analysis, data.next_question_available);
+                    if (data.feedback_job) {
+                        this.pollFeedback(data.feedback_job, data.next_question_available);
+                    }
+                }
             }
         } catch (error) {
             console.error('Error submitting answer:', error);
@@ -187,11 +198,85 @@ class InterviewManager {
         }
     }
     
+    async streamAnalysis(payload) {
+        // Render feedback piece by piece from the server-sent events
+        const response = await fetch('/api/analyze-answer/stream', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(payload)
+        });
+        
+        if (!response.headers.get('Content-Type')?.startsWith('text/event-stream')) {
+            const data = await response.json();
+            if (data.status === 'success') {
+                this.displayFeedback(data.analysis, data.next_question_available);
+            }
+            return;
+        }
+        
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        const partial = {};
+        let buffer = '';
+        
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const block = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+                
+                const event = block.match(/^event: (.*)$/m)?.[1];
+                const dataLine = block.match(/^data: (.*)$/m)?.[1];
+                if (!event || dataLine === undefined) continue;
+                const data = JSON.parse(dataLine);
+                
+                if (event === 'scores') {
+                    Object.assign(partial, data);
+                } else if (event === 'feedback' || event === 'suggested_answer') {
+                    partial[event] = data;
+                } else if (event === 'done') {
+                    this.displayFeedback(data.analysis, data.next_question_available);
+                    return;
+                }
+                this.displayFeedback(partial, null);
+            }
+        }
+    }
+    
+    async pollFeedback(jobId, hasNextQuestion) {
+        // Locally scored answers get the written feedback from a background job
+        this.feedbackJob = jobId;
+        while (this.feedbackJob === jobId) {
+            await new Promise((resolve) => setTimeout(resolve, 1000));
+            try {
+                const response = await fetch(`/api/answer-feedback/${jobId}`);
+                const data = await response.json();
+                if (data.status === 'done' && this.feedbackJob === jobId) {
+                    this.displayFeedback(data.analysis, hasNextQuestion);
+                }
+                if (data.status !== 'queued' && data.status !== 'running') {
+                    break;
+                }
+            } catch (error) {
+                console.error('Error checking answer feedback:', error);
+                break;
+            }
+        }
+    }
+    
     displayFeedback(analysis, hasNextQuestion) {
         const feedbackArea = document.getElementById('feedback-area');
         const feedbackContent = document.getElementById('feedback-content');
         const nextBtn = document.getElementById('next-question-btn');
         
+        // hasNextQuestion is null while a streamed analysis is still arriving
+        const pending = hasNextQuestion === null;
+        const loading = '<i class="fas fa-spinner fa-spin mr-2"></i> Analyzing...';
+        
         // Build feedback HTML
         let feedbackHTML = `
             <div class="grid grid-cols-2 md:grid-cols-4 gap-4 mb-6">
@@ -220,15 +305,15 @@ class InterviewManager {
             
             <div class="p-4 bg-green-50 rounded-lg mb-4">
                 <h4 class="font-bold mb-2">AI Feedback:</h4>
-                <p>${analysis.feedback}</p>
+                <p>${analysis.feedback ?? loading}</p>
             </div>
         `;
         
-        if (analysis.suggested_answer) {
+        if (analysis.suggested_answer || (pending && analysis.feedback !== undefined)) {
             feedbackHTML += `
                 <div class="p-4 bg-blue-50 rounded-lg mb-4">
                     <h4 class="font-bold mb-2">Suggested Better Answer:</h4>
-                    <p>${analysis.suggested_answer}</p>
+                    <p>${analysis.suggested_answer ?? loading}</p>
                 </div>
             `;
         }
@@ -244,6 +329,13 @@ class InterviewManager {
         
         feedbackContent.innerHTML = feedbackHTML;
         
+        // Keep the candidate on this answer until the analysis is complete
+        nextBtn.disabled = pending;
+        if (pending) {
+            feedbackArea.classList.remove('hidden');
+            return;
+        }
+        
         // Update next button text
         if (hasNextQuestion) {
             nextBtn.innerHTML = 'Next Question <i class="fas fa-arrow-right ml-2"></i>';
@@ -265,6 +357,7 @@ class InterviewManager {
     }
     
     async nextQuestion() {
+        this.feedbackJob = null; // feedback for the previous answer is no longer shown
         try {
             const response = await fetch('/api/next-question', {
                 method: 'POST',
@@ -0,0 +1,78 @@
+import os
+import sys
+import pytest
+
+# The app is a set of top-level modules; make them importable from tests
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from fake_gemini import FakeGeminiServer
+from llm_cache import LLMCache
+
+
+@pytest.fixture
+def fake_gemini():
+    """Start FakeGeminiServer(**options) on an ephemeral port; stopped after the test"""
+    servers = []
+
+    def start(**options):
+        server = FakeGeminiServer(**options).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+def write_pdf(path, pages):
+    """Minimal PDF with one line of text per page"""
+    objects = ['<< /Type /Catalog /Pages 2 0 R >>', None,
+               '<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    kids = []
+    for text in pages:
+        stream = f'BT /F1 12 Tf 72 720 Td ({text}) Tj ET'
+        objects.append(f'<< /Length {len(stream)} >>\nstream\n{stream}\nendstream')
+        objects.append(f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+                       f'/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>')
+        kids.append(f'{len(objects)} 0 R')
+    objects[1] = f'<< /Type /Pages /Kids [{" ".join(kids)}] /Count {len(kids)} >>'
+
+    data = b'%PDF-1.4\n'
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(data))
+        data += f'{number} 0 obj\n{body}\nendobj\n'.encode('latin-1')
+    xref = len(data)
+    data += f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode('latin-1')
+    data += ''.join(f'{offset:010d} 00000 n \n' for offset in offsets).encode('latin-1')
+    data += f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'.encode('latin-1')
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+@pytest.fixture
+def make_pdf(tmp_path):
+    """Write a PDF with the given page texts; returns its path"""
+    def make(pages, name='document.pdf'):
+        path = str(tmp_path / name)
+        write_pdf(path, pages)
+        return path
+    return make
+
+
+@pytest.fixture
+def make_client(tmp_path, monkeypatch):
+    """Test client factory for an app on the stub backend, working in tmp_path"""
+    import app as app_module
+    # Uploads are stored relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(Config, 'DATABASE', str(tmp_path / 'database.sqlite'))
+    monkeypatch.setattr(Config, 'SESSION_FILE_DIR', str(tmp_path / 'flask_session'), raising=False)
+    monkeypatch.setattr(Config, 'LLM_BACKEND', 'stub')
+    monkeypatch.setattr(Config, 'LLM_STUB_LATENCY', 0.0)
+    monkeypatch.setattr(app_module.ai_processor, '_client', None)
+    monkeypatch.setattr(app_module.ai_processor, 'cache', LLMCache(str(tmp_path / 'llm_cache.sqlite')))
+    app = app_module.create_app()
+    app.config['TESTING'] = True
+    return app.test_client
@@ -0,0 +1,191 @@
+import asyncio
+import json
+import threading
+import time
+import pytest
+from config import Config
+from ai_processor import AIProcessor
+from resilience import CircuitBreaker
+
+QUESTIONS = [{'question_text': f'Q{i}?', 'question_type': 'technical', 'difficulty': 'easy',
+              'category': 'Python', 'time_allocated': 120} for i in range(3)]
+ANALYSIS = {'grammar_score': 7, 'relevance_score': 8, 'star_score': 6,
+            'detailed_feedback': 'Good example.', 'suggested_better_answer': 'Better.',
+            'needs_cross_question': False, 'cross_question': ''}
+ANSWER = 'I profiled the slow report, cached the expensive query and cut it from 9s to 1s.'
+
+
+def responder(prompt):
+    if 'JSON list of questions' in prompt:
+        return 'Here you go: ' + json.dumps(QUESTIONS)
+    return json.dumps(ANALYSIS)
+
+
+@pytest.fixture
+def processor(monkeypatch, tmp_path):
+    """Build AIProcessors talking to a fake server, with no response cache"""
+    processors = []
+
+    def build(server, **config):
+        settings = {
+            'LLM_BACKEND': 'gemini', 'GEMINI_API_KEY': 'test', 'GEMINI_API_BASE': server.base_url,
+            'LLM_CASSETTE_MODE': '', 'LLM_CACHE_DATABASE': str(tmp_path / 'llm_cache.sqlite'),
+            'LLM_CACHE_TTL': {}, 'SCORING_MODE': 'llm'
+        }
+        settings.update(config)
+        for name, value in settings.items():
+            monkeypatch.setattr(Config, name, value)
+        ai = AIProcessor()
+        processors.append(ai)
+        return ai
+
+    yield build
+    for ai in processors:
+        if ai._client is not None:
+            ai.client.close()
+
+
+def warm_up(ai, method, latency):
+    """Give a method enough latency samples for its deadline and hedge to adapt"""
+    for _ in range(Config.LLM_LATENCY_MIN_SAMPLES):
+        ai.resilience._tracker(method).record(latency)
+
+
+def pending_tasks(client):
+    """Tasks still running on the client's event loop"""
+    async def others():
+        return [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+    return asyncio.run_coroutine_threadsafe(others(), client._loop).result(timeout=5)
+
+
+def stream_events(ai, **kwargs):
+    return list(ai.analyze_answer_stream('Tell me about a speedup.', ANSWER, ANSWER, duration=30, **kwargs))
+
+
+def test_generate_round_trip(fake_gemini, processor):
+    server = fake_gemini(responder=responder, chunk_size=8)
+    ai = processor(server)
+    assert ai.generate_questions({}, 'Python developer', 'Python', 'Entry', count=3) == QUESTIONS
+    assert len(server.requests) == 1
+    assert ai.resilience.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_failures_fall_back_then_open_breaker(fake_gemini, processor):
+    server = fake_gemini(responder=responder, error_rate=1.0)
+    ai = processor(server, LLM_BREAKER_FAILURES=2)
+    defaults = ai._get_default_questions('Python', 'Entry', 3)
+    for _ in range(2):
+        assert ai.generate_questions({}, '', 'Python', 'Entry', count=3) == defaults
+    assert ai.resilience.breaker.state == CircuitBreaker.OPEN
+    # A 503 fails early, so each call was hedged once
+    assert len(server.requests) == 4
+
+    assert ai.generate_questions({}, '', 'Python', 'Entry', count=3) == defaults
+    events = stream_events(ai)
+    assert events[-1][0] == 'done' and events[-1][1]['scoring'] == 'fallback'
+    assert len(server.requests) == 4
+
+
+def test_hedge_wins_and_slow_stream_is_cancelled(fake_gemini, processor):
+    first = threading.Event()
+
+    def slow_first(prompt):
+        if not first.is_set():
+            first.set()
+            time.sleep(3)
+        return responder(prompt)
+
+    server = fake_gemini(responder=slow_first)
+    ai = processor(server)
+    warm_up(ai, 'generate_questions', 0.05)
+
+    start = time.perf_counter()
+    assert ai.generate_questions({}, '', 'Python', 'Entry', count=3) == QUESTIONS
+    assert time.perf_counter() - start < 2
+    stats = ai.resilience.stats()['methods']['generate_questions']
+    assert stats['hedged'] == 1 and stats['hedge_wins'] == 1
+
+    # The losing request is cancelled on the client loop, not left running
+    for _ in range(50):
+        if not pending_tasks(ai.client):
+            break
+        time.sleep(0.02)
+    assert pending_tasks(ai.client) == []
+
+
+def test_deadline_exceeded_falls_back(fake_gemini, processor):
+    server = fake_gemini(responder=responder, slow_rate=1.0, slow_delay=3)
+    ai = processor(server, LLM_MIN_DEADLINE=0.3, LLM_HEDGE=False)
+    warm_up(ai, 'generate_questions', 0.1)
+
+    start = time.perf_counter()
+    assert ai.generate_questions({}, '', 'Python', 'Entry', count=3) == \
+        ai._get_default_questions('Python', 'Entry', 3)
+    assert time.perf_counter() - start < 1.5
+    assert ai.resilience.stats()['methods']['generate_questions']['timeouts'] == 1
+
+
+def test_analyze_answer_stream(fake_gemini, processor):
+    server = fake_gemini(responder=responder, chunk_size=8)
+    ai = processor(server)
+    events = stream_events(ai)
+    assert [event for event, _ in events] == ['scores', 'feedback', 'suggested_answer', 'done']
+    done = events[-1][1]
+    assert done['grammar_score'] == 7 and done['feedback'] == 'Good example.'
+    assert ai.resilience.stats()['methods']['analyze_answer_stream']['samples'] == 1
+
+
+def test_analyze_answer_stream_errors_fall_back(fake_gemini, processor):
+    server = fake_gemini(responder=responder, error_rate=1.0)
+    ai = processor(server, LLM_BREAKER_FAILURES=1)
+    events = stream_events(ai)
+    assert [event for event, _ in events] == ['done']
+    assert events[-1][1]['scoring'] == 'fallback'
+    assert ai.resilience.breaker.state == CircuitBreaker.OPEN
+
+
+def test_analyze_answer_stream_deadline(fake_gemini, processor):
+    # Streams aren't hedged, but a stalled one still ends at the deadline
+    server = fake_gemini(responder=responder, chunk_size=8, chunk_delay=0.5)
+    ai = processor(server, LLM_MIN_DEADLINE=0.3)
+    warm_up(ai, 'analyze_answer_stream', 0.1)
+
+    start = time.perf_counter()
+    events = stream_events(ai)
+    assert time.perf_counter() - start < 1.5
+    assert events[-1][1]['scoring'] == 'fallback'
+    assert ai.resilience.stats()['methods']['analyze_answer_stream']['failures'] == 1
+
+
+def test_tiered_stream_sends_local_scores_first(fake_gemini, processor):
+    server = fake_gemini(responder=responder, error_rate=1.0)
+    ai = processor(server, SCORING_MODE='tiered')
+    events = stream_events(ai)
+    assert events[0][0] == 'scores'
+    assert events[-1][1]['scoring'] == 'local'
+
+
+def test_tiered_analysis_returns_before_the_model(fake_gemini, processor):
+    narrative = {'detailed_feedback': 'Written by the model.', 'needs_cross_question': False}
+    server = fake_gemini(responder=lambda prompt: json.dumps(narrative), delay=0.5)
+    ai = processor(server, SCORING_MODE='tiered')
+
+    start = time.perf_counter()
+    analysis = ai.analyze_answer('Tell me about a speedup.', ANSWER, ANSWER, duration=30)
+    assert time.perf_counter() - start < 0.4
+    assert analysis['scoring'] == 'local' and server.requests == []
+
+    narrated = ai.narrate_answer('Tell me about a speedup.', ANSWER, ANSWER, duration=30)
+    assert narrated['scoring'] == 'tiered'
+    assert narrated['feedback'] == 'Written by the model.'
+    assert narrated['grammar_score'] == analysis['grammar_score']
+
+
+def test_quoted_scores_are_used(fake_gemini, processor):
+    quoted = dict(ANALYSIS, grammar_score='9', relevance_score='8.5', needs_cross_question='false')
+    server = fake_gemini(responder=lambda prompt: json.dumps(quoted))
+    analysis = processor(server).analyze_answer('Tell me about a speedup.', ANSWER, ANSWER, duration=30)
+
+    assert analysis['scoring'] == 'llm'
+    assert (analysis['grammar_score'], analysis['relevance_score']) == (9, 8.5)
+    assert analysis['needs_cross_question'] is False
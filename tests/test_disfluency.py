@@ -0,0 +1,62 @@
+import pytest
+from disfluency import DisfluencyAnalyzer
+
+
+@pytest.fixture
+def analyzer():
+    return DisfluencyAnalyzer(['um', 'uh', 'like', 'so', 'you know', 'I mean'])
+
+
+def test_fillers_match_whole_words_only(analyzer):
+    result = analyzer.analyze('I also likely solved it, and the unlike case too')
+    assert result['filler_count'] == 0
+    assert result['fillers'] == {}
+    assert result['word_count'] == 10
+
+
+def test_counts_fillers_and_words(analyzer):
+    result = analyzer.analyze('Um, so I built it. Uh, like, so it worked')
+    assert result['fillers'] == {'so': 2, 'um': 1, 'uh': 1, 'like': 1}
+    assert result['filler_count'] == 5
+    assert result['word_count'] == 10
+    assert result['filler_ratio'] == 0.5
+
+
+def test_phrases_match_across_whitespace(analyzer):
+    result = analyzer.analyze('You know, it was,  I\n mean, fast. You knowingly did it')
+    assert result['fillers'] == {'you know': 1, 'i mean': 1}
+    # Phrases count each of their words
+    assert result['word_count'] == 11
+
+
+def test_repeats_and_pauses(analyzer):
+    result = analyzer.analyze('The the cache... was [pause] was um um fast (silence) fast')
+    assert result['repeated_words'] == 1
+    assert result['pause_count'] == 3
+    assert result['filler_count'] == 2
+
+
+def test_rates_need_a_duration(analyzer):
+    result = analyzer.analyze('um it works')
+    assert result['fillers_per_minute'] is None
+    assert result['words_per_minute'] is None
+    assert analyzer.analyze('um it works', duration='bad')['words_per_minute'] is None
+    assert analyzer.analyze('um it works', duration=0)['fillers_per_minute'] is None
+
+
+def test_analyze_many_rates_per_minute(analyzer):
+    transcripts = ['um uh it works', 'so it works well', '']
+    results = analyzer.analyze_many(transcripts, [30, 120, 60])
+
+    assert results[0]['fillers_per_minute'] == 4.0
+    assert results[0]['words_per_minute'] == 8.0
+    assert results[1]['fillers_per_minute'] == 0.5
+    assert results[1]['words_per_minute'] == 2.0
+    assert results[2]['words_per_minute'] == 0.0
+    assert results == [analyzer.analyze(t, d) for t, d in zip(transcripts, [30, 120, 60])]
+
+
+def test_analyze_many_without_durations(analyzer):
+    results = analyzer.analyze_many(['um yes', 'no'])
+    assert [r['filler_count'] for r in results] == [1, 0]
+    assert all(r['fillers_per_minute'] is None for r in results)
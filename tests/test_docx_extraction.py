@@ -0,0 +1,95 @@
+import io
+import zipfile
+import pytest
+from xml.etree import ElementTree
+import text_extractor
+from text_extractor import TextExtractor
+
+NAMESPACE = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+
+
+def paragraph(*runs):
+    return '<w:p>' + ''.join(f'<w:r>{run}</w:r>' for run in runs) + '</w:p>'
+
+
+def document_xml(*blocks):
+    return (f'<?xml version="1.0" encoding="UTF-8"?><w:document xmlns:w="{NAMESPACE}"><w:body>'
+            + ''.join(blocks) + '<w:sectPr/></w:body></w:document>')
+
+
+@pytest.fixture
+def make_docx(tmp_path):
+    def make(xml, name='resume.docx'):
+        path = str(tmp_path / name)
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr('[Content_Types].xml', '<Types/>')
+            archive.writestr('word/document.xml', xml)
+        return path
+    return make
+
+
+def test_paragraphs_tables_and_breaks(make_docx):
+    xml = document_xml(
+        paragraph('<w:t>Ada </w:t>', '<w:t>Lovelace</w:t>'),
+        paragraph('<w:t>Skills</w:t><w:tab/><w:t>Python</w:t><w:br/><w:t>SQL</w:t>'),
+        '<w:tbl><w:tr><w:tc>' + paragraph('<w:t>2019</w:t>') + '</w:tc><w:tc>'
+        + paragraph('<w:t>Engineer</w:t>') + '</w:tc></w:tr></w:tbl>',
+        paragraph(),
+    )
+    progress = []
+    result = TextExtractor(max_chars=1000).extract(
+        make_docx(xml), progress=lambda done, total: progress.append((done, total)))
+
+    assert result['text'] == 'Ada Lovelace\nSkills\tPython\nSQL\n2019\nEngineer\n'
+    assert result['paragraphs'] == 5 and not result['truncated']
+    assert progress and progress[-1][0] == progress[-1][1] == len(xml.encode('utf-8'))
+
+
+def test_stops_reading_at_max_chars(make_docx):
+    xml = document_xml(*(paragraph(f'<w:t>Paragraph {number:04d}</w:t>') for number in range(5000)))
+    reads = []
+    result = TextExtractor(max_chars=100).extract(
+        make_docx(xml), progress=lambda done, total: reads.append(done))
+
+    # Fifteen characters a paragraph, so the seventh passes the cap
+    assert result['paragraphs'] == 7 and result['truncated']
+    assert result['text'] == '\n'.join(f'Paragraph {number:04d}' for number in range(7))[:100]
+    assert reads[-1] < len(xml.encode('utf-8'))
+
+
+def test_finished_paragraphs_are_dropped(monkeypatch):
+    xml = document_xml(*(paragraph(f'<w:t>line {number}</w:t>') for number in range(20000)))
+    started = []
+    iterparse = ElementTree.iterparse
+
+    def recording_iterparse(source, events=None):
+        for event, elem in iterparse(source, events):
+            if event == 'start':
+                started.append(elem)
+            yield event, elem
+
+    monkeypatch.setattr(text_extractor.ElementTree, 'iterparse', recording_iterparse)
+    body_sizes = []
+    texts = []
+    for text in TextExtractor().iter_docx_paragraphs(io.BytesIO(xml.encode('utf-8'))):
+        texts.append(text)
+        body = next(elem for elem in started if elem.tag.endswith('}body'))
+        body_sizes.append(len(body))
+
+    assert texts == [f'line {number}' for number in range(20000)]
+    # Read paragraphs are detached, so the body only holds the few the
+    # parser has buffered ahead, however long the document is
+    assert max(body_sizes) < 1000
+    assert body_sizes[-1] <= 2
+
+
+@pytest.mark.parametrize('content', [b'not a zip', None])
+def test_unreadable_docx_gives_empty_text(tmp_path, content):
+    path = tmp_path / 'broken.docx'
+    if content is None:
+        with zipfile.ZipFile(path, 'w') as archive:
+            archive.writestr('word/other.xml', '<x/>')
+    else:
+        path.write_bytes(content)
+    result = TextExtractor().extract(str(path))
+    assert result['text'] == '' and result['paragraphs'] == 0
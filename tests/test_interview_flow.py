@@ -0,0 +1,80 @@
+import json
+from config import Config
+from database import get_answers
+
+
+def start_interview(client):
+    client.post('/upload', data={'job_description_text': 'Backend engineer, Python and SQL'})
+    client.post('/setup', data={'domain': 'Python', 'experience_level': 'Mid'})
+    assert client.get('/start-interview').status_code == 200
+    with client.session_transaction() as session:
+        return session['session_id']
+
+
+def answer(client, question_id):
+    response = client.post('/api/analyze-answer', json={
+        'question_id': question_id,
+        'answer_text': 'I added an index and a cache, and latency fell tenfold.',
+        'transcript': 'um I added an index and a cache',
+        'duration': 45
+    })
+    return response.get_json()
+
+
+def test_browser_flow_answers_every_question(make_client):
+    client = make_client()
+    session_id = start_interview(client)
+
+    # As static/js/interview.js does: fetch a question, then answer it by the
+    # id it was shown with
+    shown = []
+    while True:
+        question = client.post('/api/next-question', json={}).get_json()
+        if question['status'] != 'success':
+            break
+        shown.append(question['question']['id'])
+        result = answer(client, str(question['question']['id']))
+        assert result['status'] == 'success'
+        if not result['next_question_available']:
+            break
+
+    assert len(shown) == Config.INTERVIEW_QUESTION_COUNT
+    assert [row['question_id'] for row in get_answers(session_id)] == shown
+
+
+def test_answer_without_an_id_is_for_the_current_question(make_client):
+    client = make_client()
+    session_id = start_interview(client)
+
+    assert answer(client, None)['next_question_available']
+    question = client.post('/api/next-question', json={}).get_json()['question']
+    answer(client, question['id'])
+
+    answered = [row['question_id'] for row in get_answers(session_id)]
+    assert len(answered) == 2 and answered[1] == question['id'] and answered[0] != answered[1]
+
+
+def test_streamed_answer_is_saved_before_the_stream_runs(make_client):
+    client = make_client()
+    session_id = start_interview(client)
+    question = client.post('/api/next-question', json={}).get_json()['question']
+
+    response = client.post('/api/analyze-answer/stream', buffered=False, json={
+        'question_id': question['id'],
+        'answer_text': 'I added an index and a cache, and latency fell tenfold.',
+        'transcript': 'um I added an index and a cache',
+        'duration': 45
+    })
+    # Nothing has been streamed yet, but the answer is already stored
+    [saved] = get_answers(session_id)
+    assert saved['question_id'] == question['id']
+    assert saved['filler_words_count'] == 1 and saved['sentiment_score'] is None
+
+    body = response.get_data(as_text=True)
+    response.close()
+    analysis = json.loads(body.rstrip().rsplit('\ndata: ', 1)[1])['analysis']
+    [updated] = get_answers(session_id)
+    assert updated['id'] == saved['id']
+    assert updated['feedback'] == analysis['feedback']
+    assert updated['grammar_score'] == analysis['grammar_score']
+    assert updated['sentiment_score'] is not None
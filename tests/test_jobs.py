@@ -0,0 +1,129 @@
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+import pytest
+import jobs
+from config import Config
+from database import init_db, create_job, update_job, get_job
+from jobs import JobQueue, input_hash, report_progress
+
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'DATABASE', str(tmp_path / 'jobs.sqlite'))
+    init_db()
+    queue = JobQueue(max_workers=2, timeout=60)
+    yield queue
+    queue.executor.shutdown(wait=True)
+
+
+def test_input_hash_is_stable():
+    assert input_hash({'b': 1, 'a': 2}, [3]) == input_hash({'a': 2, 'b': 1}, [3])
+    assert input_hash(1) != input_hash('1')
+
+
+def test_same_inputs_share_a_job(queue):
+    release = threading.Event()
+    calls = []
+
+    def report(value):
+        calls.append(value)
+        release.wait(5)
+        return {'score': value}
+
+    first = queue.submit('report', 1, input_hash('a'), report, 7)
+    assert queue.submit('report', 1, input_hash('a'), report, 7) == first
+    other_session = queue.submit('report', 2, input_hash('a'), report, 8)
+    assert other_session != first
+    release.set()
+
+    job = queue.wait(first, timeout=5)
+    assert job['status'] == 'done' and job['result'] == {'score': 7} and job['progress'] == 1
+    # Finished jobs are reused too
+    assert queue.submit('report', 1, input_hash('a'), report, 7) == first
+    queue.wait(other_session, timeout=5)
+    assert sorted(calls) == [7, 8]
+
+
+def test_failure_is_captured_and_not_reused(queue):
+    def broken():
+        raise ValueError('model returned nothing')
+
+    job_id = queue.submit('report', 1, input_hash('a'), broken)
+    job = queue.wait(job_id, timeout=5)
+    assert job['status'] == 'failed'
+    assert job['error'] == 'model returned nothing'
+    assert job['result'] is None
+
+    retry = queue.submit('report', 1, input_hash('a'), lambda: 'ok')
+    assert retry != job_id
+    assert queue.wait(retry, timeout=5)['result'] == 'ok'
+
+
+def test_stale_unfinished_job_is_resubmitted(queue):
+    # A job left queued by a process that went away
+    lost = create_job('report', 1, input_hash('a'))
+    assert queue.submit('report', 1, input_hash('a'), lambda: 'new') == lost
+
+    conn = sqlite3.connect(Config.DATABASE)
+    conn.execute('UPDATE jobs SET created_at = ? WHERE id = ?',
+                 (datetime.now() - timedelta(seconds=queue.timeout + 1), lost))
+    conn.commit()
+    conn.close()
+
+    job_id = queue.submit('report', 1, input_hash('a'), lambda: 'new')
+    assert job_id != lost
+    assert queue.wait(job_id, timeout=5)['result'] == 'new'
+
+
+def test_progress_is_reported(queue, monkeypatch):
+    monkeypatch.setattr(jobs, 'PROGRESS_INTERVAL', 0)
+    halfway = threading.Event()
+    release = threading.Event()
+
+    def work():
+        report_progress(1, 4)
+        report_progress(2, 4)
+        halfway.set()
+        release.wait(5)
+        report_progress(4, 4)
+        return 'done'
+
+    job_id = queue.submit('report', 1, input_hash('a'), work)
+    assert halfway.wait(5)
+    job = queue.get(job_id)
+    assert job['status'] == 'running' and job['progress'] == 0.5
+    release.set()
+    assert queue.wait(job_id, timeout=5)['progress'] == 1
+
+
+def test_progress_writes_are_throttled(queue):
+    seen = []
+
+    def work():
+        for done in range(1, 100):
+            report_progress(done, 100)
+        seen.append(get_job(job_id)['progress'])
+
+    job_id = queue.submit('report', 1, input_hash('a'), work)
+    queue.wait(job_id, timeout=5)
+    # Only the first call lands within PROGRESS_INTERVAL
+    assert seen == [0.01]
+
+
+def test_report_progress_outside_a_job_does_nothing(queue):
+    report_progress(1, 2)
+
+
+def test_wait_polls_jobs_run_elsewhere(queue, monkeypatch):
+    monkeypatch.setattr(jobs, 'POLL_INTERVAL', 0.01)
+    job_id = create_job('report', 1, input_hash('a'))
+
+    assert queue.wait(job_id, timeout=0.05)['status'] == 'queued'
+
+    timer = threading.Timer(0.05, update_job, (job_id, 'done'), {'result': {'score': 9}})
+    timer.start()
+    job = queue.wait(job_id, timeout=5)
+    timer.join()
+    assert job['status'] == 'done' and job['result'] == {'score': 9}
+    assert queue.wait(12345) is None
@@ -0,0 +1,141 @@
+import pytest
+from json_stream import JSONExtractor, Schema, SchemaError, NUMBER, extract_json
+
+SCORES = Schema(required={'grammar_score': NUMBER, 'feedback': str})
+
+
+def feed_chunks(extractor, text, size):
+    """Feed text in fixed-size chunks; returns the chunks read before stopping"""
+    read = 0
+    for start in range(0, len(text), size):
+        read += 1
+        if extractor.feed(text[start:start + size]):
+            break
+    return read
+
+
+@pytest.mark.parametrize('size', [1, 3, 7, 1000])
+def test_object_in_prose(size):
+    text = 'Sure! {this} is it: {"grammar_score": 7, "feedback": "Good"} hope {that} helps'
+    extractor = JSONExtractor(SCORES)
+    feed_chunks(extractor, text, size)
+    assert extractor.result() == {'grammar_score': 7, 'feedback': 'Good'}
+
+
+@pytest.mark.parametrize('size', [1, 2, 5, 1000])
+def test_nested_values(size):
+    text = '{"grammar_score": 8, "detail": {"a": [1, {"b": "}]"}], "c": {}}, "feedback": "[ok]"}'
+    extractor = JSONExtractor(Schema(required={'grammar_score': NUMBER, 'detail': dict, 'feedback': str}))
+    feed_chunks(extractor, text, size)
+    assert extractor.result() == {
+        'grammar_score': 8,
+        'detail': {'a': [1, {'b': '}]'}], 'c': {}},
+        'feedback': '[ok]'
+    }
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 1000])
+def test_escaped_strings(size):
+    feedback = 'Say "hi" \\ then {brace}, [bracket]'
+    text = '{"grammar_score": 1, "feedback": "Say \\"hi\\" \\\\ then {brace}, [bracket]"}'
+    extractor = JSONExtractor(SCORES)
+    feed_chunks(extractor, text, size)
+    assert extractor.result()['feedback'] == feedback
+
+
+def test_truncated_object_that_satisfies_schema():
+    extractor = JSONExtractor(SCORES)
+    assert extractor.feed('{"grammar_score": 6, "feedback": "Fine", "extra": "cut of')
+    assert not extractor.complete
+    assert extractor.result() == {'grammar_score': 6, 'feedback': 'Fine'}
+
+
+def test_truncated_object_missing_fields():
+    extractor = JSONExtractor(SCORES)
+    assert not extractor.feed('{"grammar_score": 6, "feedback": "Fi')
+    with pytest.raises(ValueError):
+        extractor.result()
+
+
+def test_stops_once_declared_fields_arrive():
+    text = '{"grammar_score": 9, "feedback": "Great"' + ', "padding": "' + 'x' * 1000 + '"}'
+    extractor = JSONExtractor(SCORES)
+    read = feed_chunks(extractor, text, 10)
+    assert read < 10
+    assert extractor.result() == {'grammar_score': 9, 'feedback': 'Great'}
+
+
+def test_stops_after_max_items():
+    items = Schema(root=list, item=Schema(required={'q': str})).limit(2)
+    text = '[{"q": "one"}, {"q": "two"}, {"q": "three"}]'
+    extractor = JSONExtractor(items)
+    read = feed_chunks(extractor, text, 1)
+    assert read < len(text)
+    assert extractor.result() == [{'q': 'one'}, {'q': 'two'}]
+
+
+def test_wrong_field_type():
+    extractor = JSONExtractor(SCORES)
+    with pytest.raises(SchemaError):
+        extractor.feed('{"grammar_score": "high", "feedback": "x"}')
+
+
+@pytest.mark.parametrize('size', [1, 4, 1000])
+def test_quoted_scalars_are_coerced(size):
+    schema = Schema(required={'score': NUMBER, 'passed': bool}, optional={'ratio': NUMBER, 'retry': bool})
+    text = 'Result: {"score": "7", "ratio": " 0.5 ", "passed": "true", "retry": 0}'
+    extractor = JSONExtractor(schema)
+    feed_chunks(extractor, text, size)
+    expected = {'score': 7, 'ratio': 0.5, 'passed': True, 'retry': False}
+    assert extractor.fields == expected
+    assert extractor.result() == expected
+    assert extract_json(text, schema) == expected
+    assert extract_json('{"score": 8, "passed": "No"}', schema) == {'score': 8, 'passed': False}
+
+
+def test_array_items_are_coerced():
+    schema = Schema(list, item=Schema(required={'time_allocated': NUMBER}))
+    assert extract_json('[{"time_allocated": "120"}, {"time_allocated": 90}]', schema) == [
+        {'time_allocated': 120}, {'time_allocated': 90}]
+
+
+@pytest.mark.parametrize('expected, raw', [
+    (NUMBER, '"high"'), (NUMBER, '"nan"'), (NUMBER, '"7/10"'), (NUMBER, '[7]'),
+    (bool, '"maybe"'), (bool, '2'),
+])
+def test_values_that_cannot_be_coerced(expected, raw):
+    with pytest.raises(SchemaError):
+        extract_json('{"value": %s}' % raw, Schema(required={'value': expected}))
+
+
+def test_no_json():
+    extractor = JSONExtractor(SCORES)
+    extractor.feed('I cannot score this answer.')
+    with pytest.raises(ValueError):
+        extractor.result()
+
+
+def test_extract_json_skips_braces_in_prose():
+    assert extract_json('see {here} then {"a": [1, 2]} and {more}') == {'a': [1, 2]}
+    with pytest.raises(SchemaError):
+        extract_json('{"a": 1}', Schema(required={'b': str}))
+
+
+@pytest.mark.parametrize('size', [1, 4, 1000])
+@pytest.mark.parametrize('text', [
+    '{oops {"grammar_score": 7, "feedback": "Good"}',
+    'Note {unclosed [ {"grammar_score": 7, "feedback": "Good"} thanks',
+    '{"x": {"grammar_score": 7, "feedback": "Good"} , ] trailing',
+    '{"a": 1, } then {"grammar_score": 7, "feedback": "Good"}',
+])
+def test_unclosed_opener_in_prose(text, size):
+    extractor = JSONExtractor(SCORES)
+    feed_chunks(extractor, text, size)
+    assert extractor.result() == extract_json(text, SCORES) == {'grammar_score': 7, 'feedback': 'Good'}
+
+
+def test_empty_values():
+    for text, expected in (('{}', {}), ('x [] y', []), ('{"a": [], "b": {}}', {'a': [], 'b': {}})):
+        extractor = JSONExtractor()
+        extractor.feed(text)
+        assert extractor.result() == expected
@@ -0,0 +1,74 @@
+import pytest
+import llm_cache
+from llm_cache import LLMCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(llm_cache.time, 'time', clock)
+    return clock
+
+
+def test_database_opens_lazily(tmp_path):
+    path = tmp_path / 'cache.sqlite'
+    cache = LLMCache(str(path), max_entries=10)
+    assert not path.exists()
+
+    assert cache.get('missing', 'analyze_answer') is None
+    assert path.exists()
+    assert cache.stats()['entries'] == 0
+
+
+def test_key_ignores_whitespace_but_not_model():
+    key = LLMCache.make_key('gemini', 'Rate  this\n   answer')
+    assert key == LLMCache.make_key('gemini', ' Rate this answer ')
+    assert key != LLMCache.make_key('other', 'Rate this answer')
+
+
+def test_entries_expire_after_ttl(tmp_path, clock):
+    cache = LLMCache(str(tmp_path / 'cache.sqlite'), max_entries=10)
+    cache.set('k', 'analyze_answer', '{"ok": 1}', latency=2.0, ttl=60)
+
+    clock.now += 59
+    assert cache.get('k', 'analyze_answer') == '{"ok": 1}'
+    clock.now += 1
+    assert cache.get('k', 'analyze_answer') is None
+
+    stats = cache.stats()
+    assert stats['methods']['analyze_answer'] == {'hits': 1, 'misses': 1, 'saved_seconds': 2.0}
+    # Expired rows are dropped on the next write
+    cache.set('other', 'analyze_answer', 'x', latency=0.1, ttl=60)
+    assert cache.stats()['entries'] == 1
+
+
+def test_least_recently_used_evicted_at_cap(tmp_path, clock):
+    cache = LLMCache(str(tmp_path / 'cache.sqlite'), max_entries=3)
+    for key in 'abc':
+        clock.now += 1
+        cache.set(key, 'm', key.upper(), latency=1.0, ttl=3600)
+
+    clock.now += 1
+    assert cache.get('a', 'm') == 'A'  # 'b' is now the oldest
+    clock.now += 1
+    cache.set('d', 'm', 'D', latency=1.0, ttl=3600)
+
+    assert cache.stats()['entries'] == 3
+    assert cache.get('b', 'm') is None
+    assert [cache.get(key, 'm') for key in 'acd'] == ['A', 'C', 'D']
+
+
+def test_clear(tmp_path):
+    cache = LLMCache(str(tmp_path / 'cache.sqlite'), max_entries=10)
+    cache.set('k', 'm', 'v', latency=1.0, ttl=60)
+    cache.clear()
+    assert cache.get('k', 'm') is None
+    assert cache.stats()['entries'] == 0
@@ -0,0 +1,156 @@
+import asyncio
+import gzip
+import json
+import pytest
+from llm_cassette import CassetteBackend, CassetteMiss
+from llm_client import LLMBackend, LLMError
+
+CHUNKS = ['{"grammar', '_score": 7', ', "feedback": ', '"Good"}']
+
+
+class ScriptedBackend(LLMBackend):
+    """Streams CHUNKS for every prompt, pausing between them"""
+
+    def __init__(self, pause=0.01, fail_after=None):
+        super().__init__('scripted-model', timeout=5)
+        self.pause = pause
+        self.fail_after = fail_after
+        self.calls = 0
+
+    async def generate_async(self, prompt):
+        self.calls += 1
+        await asyncio.sleep(self.pause)
+        return ''.join(CHUNKS)
+
+    async def stream_async(self, prompt):
+        self.calls += 1
+        for index, chunk in enumerate(CHUNKS):
+            await asyncio.sleep(self.pause)
+            if index == self.fail_after:
+                raise LLMError('connection reset', status=503)
+            yield chunk
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'llm.jsonl.gz')
+
+
+def recorder(path, **options):
+    return CassetteBackend('record', inner=ScriptedBackend(**options), path=path)
+
+
+def replay(path, prompt, stream=True):
+    """Replay a prompt from a freshly loaded cassette"""
+    backend = CassetteBackend('replay', path=path, realtime=False)
+
+    async def run():
+        if not stream:
+            return await backend.generate_async(prompt)
+        return [chunk async for chunk in backend.stream_async(prompt)]
+    try:
+        return asyncio.run(run())
+    finally:
+        backend.cassette.close()
+
+
+def test_complete_stream_is_recorded(path):
+    backend = recorder(path)
+
+    async def run():
+        return [chunk async for chunk in backend.stream_async('rate this')]
+    assert asyncio.run(run()) == CHUNKS
+    backend.cassette.close()
+
+    assert replay(path, 'rate this') == CHUNKS
+    assert replay(path, 'rate this', stream=False) == ''.join(CHUNKS)
+
+
+def read_first_chunk(backend, prompt):
+    """Close a stream after its first chunk, as a caller with all it needs does"""
+    async def run():
+        stream = backend.stream_async(prompt)
+        first = await stream.__anext__()
+        await stream.aclose()
+        await backend.aclose()  # waits for the rest to be read
+        return first
+    return asyncio.run(run())
+
+
+def test_stream_closed_early_is_recorded_whole(path):
+    backend = recorder(path)
+    assert read_first_chunk(backend, 'rate this') == CHUNKS[0]
+    assert backend.inner.calls == 1
+
+    assert replay(path, 'rate this') == CHUNKS
+
+
+def test_stream_closed_early_that_then_fails_is_not_recorded(path):
+    backend = recorder(path, fail_after=2)
+    assert read_first_chunk(backend, 'rate this') == CHUNKS[0]
+    assert len(backend.cassette) == 0
+
+    with pytest.raises(CassetteMiss):
+        replay(path, 'rate this')
+
+
+def test_cancelled_calls_are_not_recorded(path):
+    backend = recorder(path)
+
+    async def read(stream):
+        return [chunk async for chunk in stream]
+
+    async def run():
+        # The stream is cancelled after two of its chunks
+        for call, after in ((read(backend.stream_async('a')), 0.025), (backend.generate_async('b'), 0.005)):
+            task = asyncio.ensure_future(call)
+            await asyncio.sleep(after)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+    asyncio.run(run())
+    assert len(backend.cassette) == 0
+    backend.cassette.close()
+
+
+def test_concurrent_duplicates_are_recorded_once(path):
+    backend = recorder(path)
+
+    async def read():
+        return ''.join([chunk async for chunk in backend.stream_async('rate this')])
+
+    async def run():
+        # Hedged calls: both reach the backend, one record is kept
+        await asyncio.gather(read(), read(), backend.generate_async('other'), backend.generate_async('other'))
+        # Later calls for the same prompt are recorded again
+        await read()
+    asyncio.run(run())
+
+    assert backend.inner.calls == 5
+    assert backend.cassette.count(backend._key('rate this')) == 2
+    assert backend.cassette.count(backend._key('other')) == 1
+    backend.cassette.close()
+
+
+def test_streams_from_older_cassettes_are_not_replayed(path):
+    key = recorder(path)._key
+    lines = [
+        {'v': 1, 'model': 'scripted-model', 'created': 0},
+        {'k': key('whole'), 'l': 0.1, 't': 'complete'},
+        {'k': key('streamed'), 'l': 0.1, 'c': [[0.05, '{"grammar']]},  # may be truncated
+    ]
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        f.write(''.join(json.dumps(line) + '\n' for line in lines))
+
+    assert replay(path, 'whole', stream=False) == 'complete'
+    with pytest.raises(CassetteMiss):
+        replay(path, 'streamed')
+
+    # Recording onto the old file adds a new header, so new streams replay
+    backend = recorder(path)
+
+    async def run():
+        return [chunk async for chunk in backend.stream_async('streamed')]
+    asyncio.run(run())
+    backend.cassette.close()
+    assert replay(path, 'streamed') == CHUNKS
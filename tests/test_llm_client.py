@@ -0,0 +1,88 @@
+import json
+import threading
+import time
+import pytest
+from llm_client import AsyncLLMClient, LLMError
+
+
+@pytest.fixture
+def client_for():
+    """Build AsyncLLMClients for a fake server; closed after the test"""
+    clients = []
+
+    def build(server, api_key='test', **options):
+        client = AsyncLLMClient(api_key, 'test-model', base_url=server.base_url, **options)
+        clients.append(client)
+        return client
+
+    yield build
+    for client in clients:
+        client.close()
+
+
+def test_generate_round_trip(fake_gemini, client_for):
+    server = fake_gemini(responder=lambda prompt: json.dumps({'echo': prompt}))
+    client = client_for(server)
+    text = client.submit_coroutine(client.generate_async('hello')).result(timeout=5)
+    assert json.loads(text) == {'echo': 'hello'}
+    assert server.requests == [{'model': 'test-model', 'prompt': 'hello'}]
+
+
+def test_streamed_round_trip(fake_gemini, client_for):
+    reply = 'A streamed reply that spans several server-sent events.'
+    server = fake_gemini(responder=lambda prompt: reply, chunk_size=5)
+    client = client_for(server)
+    chunks = list(client.stream('hello'))
+    assert len(chunks) == len(range(0, len(reply), 5))
+    assert ''.join(chunks) == reply
+
+
+def test_concurrency_is_capped(fake_gemini, client_for):
+    lock = threading.Lock()
+    in_flight = [0, 0]  # current, highest
+
+    def counting(prompt):
+        with lock:
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight[1], in_flight[0])
+        time.sleep(0.1)
+        with lock:
+            in_flight[0] -= 1
+        return 'ok'
+
+    server = fake_gemini(responder=counting)
+    client = client_for(server, max_concurrency=2)
+    futures = [client.submit_coroutine(client.generate_async(f'p{i}')) for i in range(6)]
+    assert [future.result(timeout=10) for future in futures] == ['ok'] * 6
+    assert in_flight[1] == 2
+
+
+@pytest.mark.parametrize('options, status', [({'error_rate': 1.0}, 503), ({}, 403)])
+def test_http_errors_map_to_llm_error(fake_gemini, client_for, options, status):
+    server = fake_gemini(**options)
+    client = client_for(server, api_key='test' if status != 403 else '')
+    with pytest.raises(LLMError) as error:
+        client.submit_coroutine(client.generate_async('hello')).result(timeout=5)
+    assert error.value.status == status
+    with pytest.raises(LLMError) as error:
+        list(client.stream('hello'))
+    assert error.value.status == status
+
+
+def test_stream_deadline(fake_gemini, client_for):
+    server = fake_gemini(responder=lambda prompt: 'x' * 40, chunk_size=4, chunk_delay=0.2)
+    client = client_for(server)
+    start = time.perf_counter()
+    with pytest.raises(LLMError, match='deadline'):
+        list(client.stream('hello', deadline=0.3))
+    assert time.perf_counter() - start < 1
+
+
+def test_cancelled_request_does_not_block_the_pool(fake_gemini, client_for):
+    server = fake_gemini(responder=lambda prompt: 'ok', slow_rate=1.0, slow_delay=1)
+    client = client_for(server, max_concurrency=1)
+    slow = client.submit_coroutine(client.generate_async('slow'))
+    time.sleep(0.1)
+    slow.cancel()
+    server.slow_rate = 0
+    assert client.submit_coroutine(client.generate_async('fast')).result(timeout=0.8) == 'ok'
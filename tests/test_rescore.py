@@ -0,0 +1,80 @@
+import sqlite3
+import pytest
+import rescore
+from ai_processor import AIProcessor
+from config import Config
+from database import init_db
+
+# relevance, star, filler count, sentiment, stored confidence, transcript
+ANSWERS = [
+    (8, 7, 0, 0.5, 1.0, 'I shipped it.'),
+    (4, 2, 25, -0.8, 3.0, 'um um um'),
+    (10, 10, 0, 1.0, None, 'Great results.'),
+    (None, None, None, 0.0, 5.0, ''),
+    (6, 5, 3, None, 2.0, 'It was a wonderful, excellent project.'),
+    (3, 9, 12, None, 4.0, ''),
+]
+
+
+def expected_score(relevance, star, fillers, sentiment):
+    analysis = {}
+    if relevance is not None:
+        analysis['relevance_score'] = relevance
+    if star is not None:
+        analysis['star_score'] = star
+    return AIProcessor._confidence_score(analysis, fillers or 0, sentiment)
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    path = str(tmp_path / 'answers.sqlite')
+    monkeypatch.setattr(Config, 'DATABASE', path)
+    init_db()
+    conn = sqlite3.connect(path)
+    conn.executemany('''
+        INSERT INTO answers (relevance_score, star_score, filler_words_count, sentiment_score,
+                             confidence_score, transcript)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', ANSWERS)
+    conn.commit()
+    conn.close()
+    return path
+
+
+def stored(path):
+    conn = sqlite3.connect(path)
+    rows = conn.execute('SELECT confidence_score, sentiment_score FROM answers ORDER BY id').fetchall()
+    conn.close()
+    return rows
+
+
+def test_matches_confidence_score(database):
+    stats = rescore.rescore(database, chunk_size=4)
+    assert stats == {'scanned': 6, 'changed': 6, 'backfilled': 2}
+
+    rows = stored(database)
+    for (relevance, star, fillers, _, _, _), (confidence, sentiment) in zip(ANSWERS, rows):
+        assert confidence == pytest.approx(expected_score(relevance, star, fillers, sentiment))
+    assert rows[4][1] > 0  # backfilled from the transcript
+    assert rows[5][1] == 0.0  # empty transcripts are neutral
+
+    # A second run finds nothing left to change
+    assert rescore.rescore(database, chunk_size=4) == {'scanned': 6, 'changed': 0, 'backfilled': 0}
+
+
+def test_without_backfill_missing_sentiment_is_neutral(database):
+    rescore.rescore(database, backfill=False)
+    rows = stored(database)
+    assert rows[4] == (pytest.approx(expected_score(6, 5, 3, 0.0)), None)
+
+
+def test_dry_run_writes_nothing(database, monkeypatch, capsys):
+    before = stored(database)
+    monkeypatch.setattr('sys.argv', ['rescore.py', '--database', database, '--dry-run', '--chunk-size', '2'])
+    rescore.main()
+
+    assert stored(database) == before
+    out = capsys.readouterr().out
+    assert 'Scanned 6 answers' in out and 'would change 6' in out
+    assert rescore.rescore(database, dry_run=True) == {'scanned': 6, 'changed': 6, 'backfilled': 2}
+    assert stored(database) == before
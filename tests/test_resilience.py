@@ -0,0 +1,134 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from config import Config
+from llm_client import LLMError
+from resilience import CircuitBreaker, CircuitOpenError, ResilientCaller
+
+
+@pytest.fixture
+def executor():
+    pool = ThreadPoolExecutor(max_workers=4)
+    yield pool
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def attempts(executor, *behaviours):
+    """submit() for ResilientCaller.call running one behaviour per attempt.
+
+    Each behaviour is a (delay, result) pair; a result that is an exception
+    is raised after the delay.
+    """
+    calls = iter(behaviours)
+
+    def run(delay, result):
+        time.sleep(delay)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    return lambda: executor.submit(run, *next(calls))
+
+
+def warmed_up(caller, method, latency=0.02):
+    """Give a method enough latency samples for deadlines and hedging to adapt"""
+    tracker = caller._tracker(method)
+    for _ in range(Config.LLM_LATENCY_MIN_SAMPLES):
+        tracker.record(latency)
+    return caller
+
+
+def test_success_records_latency(executor):
+    caller = ResilientCaller(hedge=False)
+    result, latency = caller.call('m', attempts(executor, (0, 'ok')))
+    assert result == 'ok'
+    assert latency >= 0
+    assert len(caller._tracker('m')) == 1
+
+
+def test_hedge_wins_over_slow_primary(executor):
+    caller = warmed_up(ResilientCaller(hedge=True), 'm')
+    start = time.perf_counter()
+    result, _ = caller.call('m', attempts(executor, (1.0, 'slow'), (0, 'fast')))
+    assert result == 'fast'
+    assert time.perf_counter() - start < 0.5
+    counts = caller.stats()['methods']['m']
+    assert counts['hedged'] == 1 and counts['hedge_wins'] == 1
+
+
+def test_transport_error_is_hedged(executor):
+    caller = ResilientCaller(hedge=True)
+    result, _ = caller.call('m', attempts(executor, (0, ConnectionError('reset')), (0, 'ok')))
+    assert result == 'ok'
+    assert caller.stats()['methods']['m']['hedged'] == 1
+
+
+@pytest.mark.parametrize('error', [ValueError('no JSON'), LLMError('bad request', status=400)])
+def test_errors_that_would_repeat_are_not_hedged(executor, error):
+    caller = ResilientCaller(hedge=True)
+    with pytest.raises(type(error)):
+        caller.call('m', attempts(executor, (0, error), (0, 'ok')))
+    assert caller.stats()['methods']['m']['hedged'] == 0
+
+
+def test_deadline_exceeded(executor, monkeypatch):
+    monkeypatch.setattr(Config, 'LLM_TIMEOUT', 0.1)
+    caller = ResilientCaller(hedge=False)
+    start = time.perf_counter()
+    with pytest.raises(LLMError, match='deadline'):
+        caller.call('m', attempts(executor, (1.0, 'late')))
+    assert time.perf_counter() - start < 0.5
+    counts = caller.stats()['methods']['m']
+    assert counts['timeouts'] == 1 and counts['failures'] == 1
+
+
+def test_deadline_adapts_to_latency(monkeypatch):
+    monkeypatch.setattr(Config, 'LLM_MIN_DEADLINE', 0.5)
+    caller = ResilientCaller(hedge=False)
+    assert caller.deadline('m') == Config.LLM_TIMEOUT
+    warmed_up(caller, 'm', latency=2.0)
+    assert caller.deadline('m') == 2.0 * Config.LLM_DEADLINE_FACTOR
+    assert caller.hedge_after('m') is None
+
+
+def test_breaker_opens_then_half_opens(executor):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.1)
+    caller = ResilientCaller(breaker=breaker, hedge=False)
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            caller.call('m', attempts(executor, (0, ConnectionError('down'))))
+    assert breaker.state == CircuitBreaker.OPEN
+
+    with pytest.raises(CircuitOpenError):
+        caller.call('m', attempts(executor, (0, 'ok')))
+    assert breaker.rejected == 1
+
+    time.sleep(0.15)
+    # One probe is let through; others wait for its outcome
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert caller.call('m', attempts(executor, (0, 'ok')))[0] == 'ok'
+
+
+def test_failed_probe_reopens_breaker(executor):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.1)
+    caller = ResilientCaller(breaker=breaker, hedge=False)
+    with pytest.raises(ConnectionError):
+        caller.call('m', attempts(executor, (0, ConnectionError('down'))))
+    time.sleep(0.15)
+    with pytest.raises(ConnectionError):
+        caller.call('m', attempts(executor, (0, ConnectionError('still down'))))
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        caller.check()
+
+
+def test_parse_errors_do_not_open_breaker(executor):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    caller = ResilientCaller(breaker=breaker, hedge=False)
+    with pytest.raises(ValueError):
+        caller.call('m', attempts(executor, (0, ValueError('no JSON'))))
+    assert breaker.state == CircuitBreaker.CLOSED
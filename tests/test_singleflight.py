@@ -0,0 +1,63 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from singleflight import SingleFlight
+
+CALLERS = 8
+
+
+def run_together(flight, key, fn):
+    """Call flight.do(key, fn) from CALLERS threads while fn is held open"""
+    release = threading.Event()
+    started = threading.Event()
+    calls = []
+
+    def leader_fn():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return fn()
+
+    with ThreadPoolExecutor(CALLERS) as pool:
+        futures = [pool.submit(flight.do, key, leader_fn)]
+        started.wait(5)
+        futures += [pool.submit(flight.do, key, leader_fn) for _ in range(CALLERS - 1)]
+        # Followers block on the leader's future; wait until they all joined
+        while flight.stats()['coalesced_calls'] < CALLERS - 1:
+            time.sleep(0.01)
+        release.set()
+    return calls, futures
+
+
+def test_concurrent_identical_keys_share_one_call():
+    flight = SingleFlight()
+    calls, futures = run_together(flight, 'k', lambda: {'score': 7})
+
+    assert len(calls) == 1
+    results = [future.result() for future in futures]
+    assert results == [{'score': 7}] * CALLERS
+    assert flight.stats() == {'upstream_calls': 1, 'coalesced_calls': CALLERS - 1, 'in_flight': 0}
+
+
+def test_exception_reaches_every_waiter():
+    flight = SingleFlight()
+
+    def fail():
+        raise RuntimeError('model down')
+
+    calls, futures = run_together(flight, 'k', fail)
+
+    assert len(calls) == 1
+    for future in futures:
+        with pytest.raises(RuntimeError, match='model down'):
+            future.result()
+    assert flight.stats()['in_flight'] == 0
+
+
+def test_nothing_is_remembered_after_the_call():
+    flight = SingleFlight()
+    assert flight.do('k', lambda: 1) == 1
+    assert flight.do('k', lambda: 2) == 2
+    assert flight.do('other', lambda: 3) == 3
+    assert flight.stats() == {'upstream_calls': 3, 'coalesced_calls': 0, 'in_flight': 0}
@@ -0,0 +1,91 @@
+import pytest
+from config import Config
+from text_extractor import TextExtractor
+
+PAGES = [f'Page {number} covers caching and queues' for number in range(1, 21)]
+
+
+@pytest.fixture
+def extractor():
+    extractors = []
+
+    def make(**options):
+        options.setdefault('workers', 1)
+        extractor = TextExtractor(**options)
+        extractors.append(extractor)
+        return extractor
+
+    yield make
+    for extractor in extractors:
+        if extractor._pool is not None:
+            extractor._pool.shutdown(wait=True)
+
+
+def test_pdf_reads_every_page(extractor, make_pdf):
+    progress = []
+    result = extractor(max_pages=50, max_chars=10000).extract(
+        make_pdf(PAGES[:3]), progress=lambda done, total: progress.append((done, total)))
+
+    assert result['text'] == '\n'.join(PAGES[:3])
+    assert (result['pages'], result['pages_read']) == (3, 3)
+    assert not result['truncated'] and not result['parallel']
+    assert progress == [(1, 3), (2, 3), (3, 3)]
+
+
+def test_pdf_stops_at_max_chars(extractor, make_pdf):
+    result = extractor(max_pages=50, max_chars=100).extract(make_pdf(PAGES))
+
+    # Each page adds 33 characters, so the fourth passes the cap
+    assert result['pages'] == 20 and result['pages_read'] == 4
+    assert result['truncated']
+    assert result['text'] == '\n'.join(PAGES[:4])[:100]
+
+
+def test_pdf_stops_at_max_pages(extractor, make_pdf):
+    result = extractor(max_pages=5, max_chars=10000).extract(make_pdf(PAGES))
+
+    assert result['pages_read'] == 5 and result['truncated']
+    assert result['text'] == '\n'.join(PAGES[:5])
+
+
+def test_long_pdf_fans_out_to_process_pool(extractor, make_pdf, monkeypatch):
+    monkeypatch.setattr(Config, 'PDF_PAGES_PER_TASK', 3)
+    path = make_pdf(PAGES)
+    parallel = extractor(max_pages=50, max_chars=10000, workers=2, parallel_min_pages=10)
+
+    result = parallel.extract(path)
+    assert result['parallel'] and parallel._pool is not None
+    assert result['text'] == '\n'.join(PAGES)
+    assert result['pages_read'] == 20 and not result['truncated']
+
+    # Stopping early gives the pages in order, with at most one range per
+    # worker read ahead of them
+    submitted = []
+    submit = parallel._pool.submit
+    monkeypatch.setattr(parallel._pool, 'submit',
+                        lambda fn, *args: submitted.append(args[1:]) or submit(fn, *args))
+    parallel.max_chars = 200
+    result = parallel.extract(path)
+    assert result['parallel'] and result['pages_read'] == 7
+    assert submitted == [(0, 3), (3, 6), (6, 9), (9, 12), (12, 15)]
+    assert result['text'] == '\n'.join(PAGES[:7])[:200]
+
+
+def test_short_pdf_stays_in_process(extractor, make_pdf):
+    sequential = extractor(max_pages=50, max_chars=10000, workers=2, parallel_min_pages=10)
+    result = sequential.extract(make_pdf(PAGES[:9]))
+    assert not result['parallel'] and sequential._pool is None
+
+
+def test_unreadable_pdf_gives_empty_text(extractor, tmp_path):
+    path = tmp_path / 'broken.pdf'
+    path.write_bytes(b'not a pdf')
+    result = extractor().extract(str(path))
+    assert result['text'] == '' and result['pages'] is None
+
+
+def test_plain_text_is_capped(extractor, tmp_path):
+    path = tmp_path / 'job.txt'
+    path.write_text('x' * 50, encoding='utf-8')
+    result = extractor(max_chars=20).extract(str(path))
+    assert result['text'] == 'x' * 20 and result['truncated']
@@ -0,0 +1,59 @@
+import hashlib
+import io
+import os
+from werkzeug.datastructures import FileStorage
+from upload_store import UploadStore
+
+
+def file_storage(content, filename):
+    return FileStorage(io.BytesIO(content), filename=filename)
+
+
+def test_identical_content_shares_one_file(tmp_path):
+    store = UploadStore(str(tmp_path / 'resumes'))
+    digest, path = store.save(file_storage(b'Ada Lovelace', 'ada.PDF'))
+    again, again_path = store.save(file_storage(b'Ada Lovelace', 'copy of ada.pdf'))
+
+    assert digest == again == hashlib.sha256(b'Ada Lovelace').hexdigest()
+    assert path == again_path == os.path.join(store.folder, digest + '.pdf')
+    assert os.listdir(store.folder) == [digest + '.pdf']
+    with open(path, 'rb') as f:
+        assert f.read() == b'Ada Lovelace'
+
+
+def test_same_name_different_content_kept_apart(tmp_path):
+    store = UploadStore(str(tmp_path))
+    first = store.save(file_storage(b'first', 'resume.pdf'))
+    second = store.save(file_storage(b'second', 'resume.pdf'))
+
+    assert first[1] != second[1]
+    assert sorted(os.listdir(tmp_path)) == sorted([first[0] + '.pdf', second[0] + '.pdf'])
+
+
+def test_large_upload_is_hashed_in_chunks(tmp_path):
+    content = os.urandom(200 * 1024)
+    digest, path = UploadStore(str(tmp_path)).save(file_storage(content, '../../etc/cv.docx'))
+
+    assert digest == hashlib.sha256(content).hexdigest()
+    assert os.path.dirname(path) == str(tmp_path) and path.endswith('.docx')
+
+
+def test_extraction_round_trip(tmp_path):
+    store = UploadStore(str(tmp_path))
+    digest, _ = store.save(file_storage(b'cv', 'cv.txt'))
+    assert store.get_extraction(digest) is None
+
+    result = {'text': 'Grace Hopper\nCOBOL', 'pages': 2, 'pages_read': 2, 'truncated': False, 'seconds': 0.1}
+    store.save_extraction(digest, result)
+    assert store.get_extraction(digest) == result
+    assert not [name for name in os.listdir(tmp_path) if name.startswith('.tmp-')]
+
+
+def test_partial_extraction_is_ignored(tmp_path):
+    store = UploadStore(str(tmp_path))
+    # Stats are written last, so text alone means the write didn't finish
+    (tmp_path / 'abc.extracted.txt').write_text('half', encoding='utf-8')
+    assert store.get_extraction('abc') is None
+
+    (tmp_path / 'abc.extraction.json').write_text('{not json', encoding='utf-8')
+    assert store.get_extraction('abc') is None
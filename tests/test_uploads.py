@@ -0,0 +1,76 @@
+import io
+import pytest
+from flask import session
+import app as app_module
+
+RESUME_PAGES = ['Ada Lovelace', 'Skills: Python, SQL', 'Experience: 5 years']
+
+
+def upload(client, **files):
+    data = {name: (io.BytesIO(content), filename) for name, (filename, content) in files.items()}
+    response = client.post('/upload', data=data, content_type='multipart/form-data',
+                           headers={'Accept': 'application/json'})
+    assert response.status_code == 202
+    return response.get_json()['documents']
+
+
+def finished_status(client, document_id):
+    app_module.upload_jobs.wait(document_id, timeout=10)
+    return client.get(f'/api/document-status/{document_id}').get_json()
+
+
+def test_upload_is_extracted_in_the_background(make_client, make_pdf):
+    client = make_client()
+    with open(make_pdf(RESUME_PAGES), 'rb') as f:
+        resume = f.read()
+    documents = upload(client, resume=('resume.pdf', resume),
+                       job_description=('jd.txt', b'Backend engineer, Python and SQL'))
+
+    status = finished_status(client, documents['resume'])
+    assert status['status'] == 'done' and status['progress'] == 1
+    assert (status['pages'], status['pages_read'], status['truncated']) == (3, 3, False)
+    assert status['characters'] == len('\n'.join(RESUME_PAGES))
+    assert status['cached'] is False
+
+    status = finished_status(client, documents['job_description'])
+    assert status['status'] == 'done' and status['characters'] == 32
+
+    with client.session_transaction() as session:
+        assert session['resume_document_id'] == documents['resume']
+        assert 'resume_text' not in session
+
+
+def test_same_content_reuses_the_extraction(make_client):
+    client = make_client()
+    first = upload(client, job_description=('jd.txt', b'Data engineer'))['job_description']
+    finished_status(client, first)
+    # Without a resume speculation the finished job itself is reused
+    assert upload(client, job_description=('other.txt', b'Data engineer'))['job_description'] == first
+
+    # Resumes start their own job, which finds the cached text
+    resume = upload(client, resume=('cv.txt', b'Grace Hopper, COBOL'))['resume']
+    assert finished_status(client, resume)['cached'] is False
+    again = upload(client, resume=('cv-copy.txt', b'Grace Hopper, COBOL'))['resume']
+    assert again != resume
+    assert finished_status(client, again)['cached'] is True
+
+
+def test_unreadable_upload_fails(make_client):
+    client = make_client()
+    document_id = upload(client, job_description=('jd.txt', b''))['job_description']
+
+    status = finished_status(client, document_id)
+    assert status == {'status': 'failed', 'progress': 0,
+                      'message': 'No text could be read from this document'}
+    with client.application.test_request_context():
+        session['job_description_document_id'] = document_id
+        assert app_module.uploaded_texts(timeout=1) == {'resume_text': '', 'job_description': ''}
+
+
+def test_status_is_private_to_the_session(make_client):
+    client = make_client()
+    document_id = upload(client, job_description=('jd.txt', b'Site reliability engineer'))['job_description']
+    finished_status(client, document_id)
+
+    assert make_client().get(f'/api/document-status/{document_id}').status_code == 404
+    assert client.get('/api/document-status/99999').status_code == 404
@@ -0,0 +1,229 @@
+import collections
+import threading
+import time
+import zipfile
+from xml.etree import ElementTree
+from config import Config
+from metrics import PDF_EXTRACTION_SECONDS, PDF_PAGES, DOCX_EXTRACTION_SECONDS
+import tracing
+
+# WordprocessingML elements that carry text or break it up
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+DOCX_BODY = W + 'body'
+DOCX_TEXT = W + 't'
+DOCX_PARAGRAPH = W + 'p'
+DOCX_BREAKS = {W + 'tab': '\t', W + 'br': '\n', W + 'cr': '\n'}
+
+
+def _page_text(page):
+    try:
+        return page.extract_text() or ''
+    except Exception as e:  # one malformed page shouldn't lose the rest
+        print(f"Error extracting PDF page text: {e}")
+        return ''
+
+
+def _extract_pages(filepath, start, stop):
+    """Text of pages [start, stop) of a PDF; runs in a worker process"""
+    import PyPDF2
+    with open(filepath, 'rb') as file:
+        reader = PyPDF2.PdfReader(file)
+        return [_page_text(reader.pages[index]) for index in range(start, stop)]
+
+
+class _CountingReader:
+    """File wrapper reporting the bytes read so far to a progress callback"""
+
+    def __init__(self, file, total, progress):
+        self.file = file
+        self.total = total
+        self.progress = progress
+        self.done = 0
+
+    def read(self, size=-1):
+        data = self.file.read(size)
+        self.done += len(data)
+        if self.progress is not None:
+            self.progress(min(self.done, self.total), self.total)
+        return data
+
+
+class TextExtractor:
+    """Text of uploaded resumes and job descriptions.
+
+    PDF pages are streamed through a generator and extraction stops once
+    ``max_chars`` of text or ``max_pages`` pages have been read, since the
+    prompts only keep the start of a document. PDFs with at least
+    ``parallel_min_pages`` pages have their page ranges read by a process
+    pool, a few ranges ahead of the pages being consumed.
+
+    DOCX files are read by streaming ``word/document.xml`` out of the
+    archive through an incremental parser that drops each paragraph once
+    its text is taken, so memory stays flat however long the document is.
+    """
+
+    def __init__(self, max_pages=None, max_chars=None, workers=None, parallel_min_pages=None):
+        self.max_pages = max_pages or Config.DOCUMENT_MAX_PAGES
+        self.max_chars = max_chars or Config.DOCUMENT_MAX_CHARS
+        self.workers = workers or Config.PDF_WORKERS
+        self.parallel_min_pages = parallel_min_pages or Config.PDF_PARALLEL_MIN_PAGES
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    def _get_pool(self):
+        with self._pool_lock:
+            if self._pool is None:
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+                # Spawned rather than forked: the app process runs request
+                # threads and the LLM client's event loop
+                self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context('spawn'))
+            return self._pool
+
+    def extract(self, filepath, progress=None):
+        """Text and extraction stats for a saved upload, chosen by extension.
+
+        ``progress(done, total)`` is called as pages are read.
+        """
+        if filepath.lower().endswith('.pdf'):
+            return self.extract_pdf(filepath, progress)
+        if filepath.lower().endswith('.docx'):
+            return self.extract_docx(filepath, progress)
+        return self.extract_plain(filepath)
+
+    def extract_plain(self, filepath):
+        start = time.perf_counter()
+        with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
+            text = f.read(self.max_chars + 1)
+        return self._result(text, None, None, start)
+
+    def _parallel(self, page_count):
+        return self.workers > 1 and min(page_count, self.max_pages) >= self.parallel_min_pages
+
+    def iter_pdf_pages(self, reader, filepath):
+        """Text of each page of an open PdfReader, up to max_pages"""
+        page_count = min(len(reader.pages), self.max_pages)
+        if not self._parallel(page_count):
+            for index in range(page_count):
+                yield _page_text(reader.pages[index])
+            return
+
+        # At most one range per worker is in flight, so stopping early
+        # wastes little work
+        pool = self._get_pool()
+        step = Config.PDF_PAGES_PER_TASK
+        ranges = iter(range(0, page_count, step))
+        pending = collections.deque()
+
+        def submit_next():
+            first = next(ranges, None)
+            if first is not None:
+                pending.append(pool.submit(_extract_pages, filepath, first, min(first + step, page_count)))
+
+        for _ in range(self.workers):
+            submit_next()
+        try:
+            while pending:
+                texts = pending.popleft().result()
+                submit_next()
+                yield from texts
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def extract_pdf(self, filepath, progress=None):
+        """Text of a PDF with page counts, timing and whether it was cut short"""
+        import PyPDF2  # slow to import; only needed once a PDF is uploaded
+        start = time.perf_counter()
+        pages = []
+        size = 0
+        total = None
+        with tracing.span('extract_pdf') as span:
+            try:
+                with open(filepath, 'rb') as file:
+                    reader = PyPDF2.PdfReader(file)
+                    total = len(reader.pages)
+                    to_read = min(total, self.max_pages)
+                    page_iter = self.iter_pdf_pages(reader, filepath)
+                    for text in page_iter:
+                        pages.append(text)
+                        size += len(text) + 1
+                        if progress is not None:
+                            progress(len(pages), to_read)
+                        if size > self.max_chars:
+                            break
+                    page_iter.close()
+            except Exception as e:
+                print(f"Error extracting PDF text: {e}")
+            result = self._result('\n'.join(pages), total, len(pages), start)
+            result['parallel'] = self._parallel(total or 0)
+            if span is not None:
+                span.set(pages=total, pages_read=len(pages), truncated=result['truncated'],
+                         parallel=result['parallel'])
+        PDF_EXTRACTION_SECONDS.observe(result['seconds'])
+        PDF_PAGES.observe(len(pages))
+        return result
+
+    def iter_docx_paragraphs(self, stream):
+        """Text of each paragraph in a document.xml stream"""
+        body = body_depth = None
+        depth = 0
+        parts = []
+        for event, elem in ElementTree.iterparse(stream, events=('start', 'end')):
+            if event == 'start':
+                depth += 1
+                if elem.tag == DOCX_BODY:
+                    body, body_depth = elem, depth
+                continue
+            depth -= 1
+            if elem.tag == DOCX_TEXT:
+                parts.append(elem.text or '')
+            elif elem.tag in DOCX_BREAKS:
+                parts.append(DOCX_BREAKS[elem.tag])
+            elif elem.tag == DOCX_PARAGRAPH:
+                yield ''.join(parts)
+                parts = []
+                elem.clear()
+            # Finished paragraphs and tables are detached from the body, so
+            # the tree never holds more than the current one
+            if depth == body_depth:
+                elem.clear()
+                body.remove(elem)
+
+    def extract_docx(self, filepath, progress=None):
+        """Text of a DOCX file with timing and whether it was cut short"""
+        start = time.perf_counter()
+        paragraphs = []
+        size = 0
+        with tracing.span('extract_docx') as span:
+            try:
+                with zipfile.ZipFile(filepath) as archive:
+                    info = archive.getinfo('word/document.xml')
+                    with archive.open(info) as xml:
+                        paragraph_iter = self.iter_docx_paragraphs(
+                            _CountingReader(xml, info.file_size, progress))
+                        for text in paragraph_iter:
+                            paragraphs.append(text)
+                            size += len(text) + 1
+                            if size > self.max_chars:
+                                break
+                        paragraph_iter.close()
+            except (zipfile.BadZipFile, KeyError, ElementTree.ParseError, OSError) as e:
+                print(f"Error extracting DOCX text: {e}")
+            result = self._result('\n'.join(paragraphs), None, None, start)
+            result['paragraphs'] = len(paragraphs)
+            if span is not None:
+                span.set(paragraphs=len(paragraphs), truncated=result['truncated'])
+        DOCX_EXTRACTION_SECONDS.observe(result['seconds'])
+        return result
+
+    def _result(self, text, pages, pages_read, start):
+        truncated = len(text) > self.max_chars or (pages or 0) > (pages_read or 0)
+        return {
+            'text': text[:self.max_chars],
+            'pages': pages,
+            'pages_read': pages_read,
+            'truncated': truncated,
+            'seconds': round(time.perf_counter() - start, 4)
+        }
@@ -0,0 +1,224 @@
+import contextvars
+import functools
+import json
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime
+from config import Config
+
+# Innermost open span of the sampled trace running in this context, if any
+_current_span = contextvars.ContextVar('current_span', default=None)
+
+
+class Span:
+    """One timed step of a request, with the steps it contains"""
+
+    __slots__ = ('name', 'attrs', 'start', 'end', 'children', 'trace')
+
+    def __init__(self, name, trace, attrs=None):
+        self.name = name
+        self.trace = trace
+        self.attrs = attrs or {}
+        self.start = time.perf_counter()
+        self.end = None
+        self.children = []
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def to_dict(self, origin):
+        end = self.end if self.end is not None else time.perf_counter()
+        data = {
+            'name': self.name,
+            'offset_ms': round((self.start - origin) * 1000, 3),
+            'duration_ms': round((end - self.start) * 1000, 3)
+        }
+        if self.attrs:
+            data['attrs'] = self.attrs
+        if self.children:
+            data['children'] = [child.to_dict(origin) for child in list(self.children)]
+        return data
+
+
+class Trace:
+    def __init__(self, name, attrs=None):
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.started_at = datetime.now().isoformat(timespec='milliseconds')
+        self.root = Span(name, self, attrs)
+        self.deferred = False
+
+    def to_dict(self):
+        root = self.root.to_dict(self.root.start)
+        return {
+            'trace_id': self.trace_id,
+            'name': self.root.name,
+            'started_at': self.started_at,
+            'duration_ms': root['duration_ms'],
+            'attrs': root.get('attrs', {}),
+            'spans': root.get('children', [])
+        }
+
+
+class TraceStore:
+    """Finished traces: the most recent ones in memory, and optionally all
+    of them appended to a JSON lines file."""
+
+    def __init__(self, size=None, path=None):
+        self.traces = deque(maxlen=size or Config.TRACE_BUFFER_SIZE)
+        self.path = Config.TRACE_FILE if path is None else path
+        self._lock = threading.Lock()
+
+    def add(self, trace):
+        data = trace.to_dict()
+        with self._lock:
+            self.traces.append(data)
+            if self.path:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(data, separators=(',', ':'), default=str) + '\n')
+
+    def recent(self, limit=50):
+        with self._lock:
+            return list(self.traces)[-limit:][::-1]
+
+    def get(self, trace_id):
+        with self._lock:
+            return next((trace for trace in self.traces if trace['trace_id'] == trace_id), None)
+
+
+store = TraceStore()
+
+
+def start_trace(name, force=False, **attrs):
+    """Begin a trace in the current context if sampled; returns (trace, token)"""
+    if not force and random.random() >= Config.TRACE_SAMPLE_RATE:
+        return None, None
+    trace = Trace(name, attrs)
+    return trace, _current_span.set(trace.root)
+
+
+def finish_trace(trace, token=None, **attrs):
+    """End a trace started with start_trace and store it"""
+    if token is not None:
+        _current_span.reset(token)
+    if trace is None or trace.deferred:
+        return
+    trace.root.set(**attrs)
+    trace.root.end = time.perf_counter()
+    store.add(trace)
+
+
+def current_trace():
+    span = _current_span.get()
+    return span.trace if span is not None else None
+
+
+def start_span(name, **attrs):
+    """Open a child of the current span; returns (span, token), or (None, None)
+    when the request isn't sampled"""
+    parent = _current_span.get()
+    if parent is None:
+        return None, None
+    child = Span(name, parent.trace, attrs)
+    parent.children.append(child)
+    return child, _current_span.set(child)
+
+
+def end_span(child, token, **attrs):
+    if child is None:
+        return
+    child.end = time.perf_counter()
+    child.set(**attrs)
+    _current_span.reset(token)
+
+
+def record_span(name, start, end=None, **attrs):
+    """Add an already finished step, timed with time.perf_counter(), to the
+    current span. For work that can't be wrapped in one block, such as a
+    generator that yields while it runs."""
+    parent = _current_span.get()
+    if parent is None:
+        return
+    child = Span(name, parent.trace, attrs)
+    child.start = start
+    child.end = time.perf_counter() if end is None else end
+    parent.children.append(child)
+
+
+class span:
+    """Context manager timing a block as a child of the current span.
+
+    Costs one context variable lookup when the request isn't sampled.
+    """
+
+    __slots__ = ('name', 'attrs', 'span', 'token')
+
+    def __init__(self, name, **attrs):
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        self.span, self.token = start_span(self.name, **self.attrs)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            end_span(self.span, self.token, error=exc_type.__name__)
+        else:
+            end_span(self.span, self.token)
+        return False
+
+
+def traced(name=None):
+    """Decorator recording each call of a function as a span"""
+    def decorate(fn):
+        span_name = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _current_span.get() is None:
+                return fn(*args, **kwargs)
+            with span(span_name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def defer(body):
+    """Keep the current trace open while a streamed response body is produced.
+
+    Returns an iterator over ``body`` that records its spans under the
+    request's trace and finishes the trace once the body is done.
+    """
+    trace = current_trace()
+    if trace is None:
+        return body
+    trace.deferred = True
+
+    def run():
+        iterator = iter(body)
+        try:
+            while True:
+                token = _current_span.set(trace.root)
+                try:
+                    chunk = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    _current_span.reset(token)
+                yield chunk
+        finally:
+            # A body closed early may still do work as it unwinds
+            close = getattr(iterator, 'close', None)
+            if close is not None:
+                token = _current_span.set(trace.root)
+                try:
+                    close()
+                finally:
+                    _current_span.reset(token)
+            trace.deferred = False
+            finish_trace(trace, streamed=True)
+
+    return run()
@@ -0,0 +1,75 @@
+import hashlib
+import json
+import os
+import tempfile
+from werkzeug.utils import secure_filename
+
+CHUNK_SIZE = 64 * 1024
+
+
+def _write_atomic(path, data, mode='w'):
+    """Write a file under a temporary name and rename it into place"""
+    directory = os.path.dirname(path)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, mode, **({} if 'b' in mode else {'encoding': 'utf-8'})) as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+class UploadStore:
+    """Uploaded documents stored by the SHA-256 of their content.
+
+    Each upload lands at ``<folder>/<digest>.<ext>``, so identical uploads
+    share one file and different uploads with the same name no longer
+    overwrite each other. Work derived from a document is cached next to
+    it, keyed on the same digest: ``<digest>.extracted.txt`` holds the
+    extracted text and ``<digest>.extraction.json`` the extraction stats.
+    """
+
+    def __init__(self, folder):
+        self.folder = folder
+
+    def save(self, file):
+        """Store an uploaded FileStorage; returns (digest, path)"""
+        os.makedirs(self.folder, exist_ok=True)
+        extension = os.path.splitext(secure_filename(file.filename or ''))[1].lower()
+        digest = hashlib.sha256()
+        fd, temp_path = tempfile.mkstemp(dir=self.folder, prefix='.upload-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in iter(lambda: file.stream.read(CHUNK_SIZE), b''):
+                    digest.update(chunk)
+                    f.write(chunk)
+            path = os.path.join(self.folder, digest.hexdigest() + extension)
+            # Same content gives the same name, so replacing is harmless
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+        return digest.hexdigest(), path
+
+    def _sidecar(self, digest, suffix):
+        return os.path.join(self.folder, digest + suffix)
+
+    def get_extraction(self, digest):
+        """Cached text extraction result of a document, or None"""
+        try:
+            with open(self._sidecar(digest, '.extraction.json'), encoding='utf-8') as f:
+                result = json.load(f)
+            with open(self._sidecar(digest, '.extracted.txt'), encoding='utf-8') as f:
+                result['text'] = f.read()
+        except (OSError, ValueError):
+            return None
+        return result
+
+    def save_extraction(self, digest, result):
+        # Text first, so the stats only appear once the text is complete
+        _write_atomic(self._sidecar(digest, '.extracted.txt'), result['text'])
+        stats = {key: value for key, value in result.items() if key != 'text'}
+        _write_atomic(self._sidecar(digest, '.extraction.json'), json.dumps(stats))
+